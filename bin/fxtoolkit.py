@@ -28,7 +28,6 @@ from obya import evaluate
 from obya import reports
 from obya import email
 from obya.db import setup
-from obya.db.table import data
 from obya.db.table import pair
 from obya.ingest import files
 from obya.ingest import api
@@ -53,13 +52,17 @@ def main():
     # Get data from API data source
     if args.mode == 'api':
         secondsago = args.days * 86400
-        api.ingest(secondsago, verbose=args.verbose)
+        api.ingest(
+            secondsago, verbose=args.verbose, concurrency=args.concurrency,
+            incremental=args.incremental)
         sys.exit()
 
     # Ingest data
     if args.mode == 'ingest':
-        df_ = files.ingest(args.filename)
-        data.insert(args.pair, df_)
+        files.stream(
+            args.filename, args.pair, chunksize=args.chunksize,
+            callback=(_progress if bool(args.verbose) is True else None),
+            timeframe=args.timeframe)
         sys.exit()
 
     # Setup database
@@ -72,13 +75,15 @@ def main():
         if bool(args.pair) is True:
             report = reports.report(args.pair, args.timeframe, days=args.days)
         else:
-            report = reports.reports(args.timeframe, days=args.days)
+            report = reports.reports(
+                args.timeframe, days=args.days, batch=args.batch)
         print(report)
         sys.exit()
 
     # Email data
     if args.mode == 'email':
-        report = reports.reports(args.timeframe, days=args.days)
+        report = reports.reports(
+            args.timeframe, days=args.days, batch=args.batch)
         now = int(time.time())
         subject = 'Obya FX Report - {}'.format(
             datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M'))
@@ -89,5 +94,23 @@ def main():
     parser.print_help()
 
 
+def _progress(progress):
+    """Print the progress of file ingestion.
+
+    Args:
+        progress: files.Progress object
+
+    Returns:
+        None
+
+    """
+    # Print
+    print(
+        'Ingested {} rows, {:.1f}% of file, {:.0f} rows/s'.format(
+            progress.rows,
+            100 * progress.position / max(1, progress.size),
+            progress.rate))
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""API ingestion daemon script.
+
+Fetches API data as each bar closes and evaluates the pairs with new bars
+
+"""
+
+# Standard libraries
+import sys
+import os
+
+# Try to create a working PYTHONPATH
+_BIN_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+_ROOT_DIRECTORY = os.path.abspath(os.path.join(_BIN_DIRECTORY, os.pardir))
+_EXPECTED = '{0}obya{0}bin'.format(os.sep)
+if _BIN_DIRECTORY.endswith(_EXPECTED) is True:
+    sys.path.append(_ROOT_DIRECTORY)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application libraries
+from obya import log
+from obya.daemon.agent import AgentCLI
+from obya.daemon.ingest import AgentIngest
+from obya import Config
+from obya import OBYA_INGESTD_NAME
+
+
+def main():
+    """Start the ingestion daemon."""
+    # Initialize key variables
+    config = Config()
+
+    # Get agent
+    agent = AgentIngest(OBYA_INGESTD_NAME, config=config)
+
+    # Do control
+    cli = AgentCLI()
+    cli.control(agent)
+
+
+if __name__ == '__main__':
+    log.env()
+    main()
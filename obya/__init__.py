@@ -4,6 +4,7 @@ from collections import namedtuple
 # Constants
 OBYA_WEBD_NAME = 'obya_webd'
 OBYA_WEBD_PROXY = 'obya_wsgid'
+OBYA_INGESTD_NAME = 'obya_ingestd'
 FOLDER_WEB_STATIC = 'theme/static'
 FOLDER_WEB_TEMPLATE = 'theme/templates'
 OBYA_WEB_SITE_PREFIX = '/obya'
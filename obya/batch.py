@@ -0,0 +1,364 @@
+"""Application module to evaluate the data of many pairs at once."""
+
+# PIP3 imports
+import pandas as pd
+import numpy as np
+
+# Application imports
+from obya import evaluate
+from obya import oscillator
+
+
+class Batch():
+    """Class to evaluate the DataFrames of many pairs at once.
+
+    The DataFrames are right aligned into a (pairs x time x OHLCV) array so
+    that the most recent rows of every pair share the same position. Pairs
+    with less data are padded with NaNs at the start. All calculations are
+    done on rows relative to the first row of each pair, so the results
+    are identical to evaluating each pair on its own.
+
+    """
+
+    def __init__(self, dataframes):
+        """Initialize the class.
+
+        Args:
+            dataframes: Dict of short term DataFrames keyed by pair
+
+        Returns:
+            None
+
+        """
+        # Initalize key variables
+        self._dataframes = {}
+        self._fallbacks = {}
+        columns = 'open high low close volume'.split()
+
+        # Only data sorted by unique timestamp with consecutive integer
+        # indexes can be aligned by position
+        for pair, _df in sorted(dataframes.items()):
+            if isinstance(_df, pd.DataFrame) is False or _df.empty is True:
+                continue
+            if _aligned(_df) is True:
+                self._dataframes[pair] = _df
+            else:
+                self._fallbacks[pair] = _df
+        self.pairs = list(self._dataframes.keys())
+
+        # Create the array
+        size = max([len(_) for _ in self._dataframes.values()] + [0])
+        self._size = size
+        self._starts = np.array(
+            [size - len(_) for _ in self._dataframes.values()], dtype=int)
+        self._values = np.full((len(self.pairs), size, len(columns)), np.nan)
+        for row, _df in enumerate(self._dataframes.values()):
+            self._values[row, self._starts[row]:, :] = _df[columns].values
+
+    def evaluate(self, periods, k_period=35, d_period=5):
+        """Evaluate the data of all pairs.
+
+        Args:
+            periods: Number of periods per long term timeframe
+            k_period: Periods for calculating Stochastic slow indicator
+            d_period: Moving Average periods for smoothing Stochastic to create
+                the fast indicator
+
+        Returns:
+            result: Dict of DataFrames identical to those of
+                evaluate.evaluate() keyed by pair
+
+        """
+        # Initialize key variables
+        result = {}
+
+        # Evaluate pairs that can't be aligned on their own
+        for pair, _df in self._fallbacks.items():
+            result[pair] = evaluate.evaluate(
+                _df, periods, k_period=k_period, d_period=d_period)
+
+        # Evaluate the rest together
+        if bool(self.pairs) is True:
+            short = self._short(k_period=k_period, d_period=d_period)
+            long = self._long(
+                periods, short['matches'], k_period=k_period,
+                d_period=d_period)
+
+            # Count the short term matches in the 'periods' rows ending at
+            # each row
+            cumulative = np.cumsum(short['matches'], axis=1)
+            counts = cumulative.copy()
+            counts[:, periods:] -= cumulative[:, :-periods]
+
+            # Create the DataFrames
+            selected = short['matches'] & long['matches']
+            for row, pair in enumerate(self.pairs):
+                result[pair] = self._dataframe(
+                    row,
+                    np.nonzero(selected[row])[0],
+                    {
+                        'k_l': long['k'][row],
+                        'd_l': long['d'][row],
+                        'k_s': short['k'][row],
+                        'd_s': short['d'][row],
+                        'sequential': short['sequential'][row],
+                        'counts': counts[row]
+                    },
+                    long['summary'][row]
+                )
+
+        # Return
+        return result
+
+    def _short(self, k_period=35, d_period=5, below=10, above=90):
+        """Evaluate the short term data of all pairs.
+
+        Args:
+            k_period: Periods for calculating Stochastic slow indicator
+            d_period: Moving Average periods for smoothing Stochastic to create
+                the fast indicator
+            below: Below limit
+            above: Above limit
+
+        Returns:
+            result: Dict of arrays
+
+        """
+        # Get the stochastics. evaluate.stoch() drops the first
+        # 'k_period + d_period' rows
+        stochastic = oscillator.stochastic(
+            self._values[:, :, 1],
+            self._values[:, :, 2],
+            self._values[:, :, 3],
+            periods=[(k_period, d_period)])[(k_period, d_period)]
+        starts = self._starts + k_period + d_period
+        valid = self._positions() >= starts[:, None]
+
+        # Find the rows beyond the limits. evaluate.sequential() treats
+        # stochastic values of zero as False
+        above_k = stochastic.k >= above
+        above_d = stochastic.d >= above
+        below_k = stochastic.k <= below
+        below_d = stochastic.d <= below
+        runs = {
+            'above_k': _sequential(above_k, starts),
+            'above_d': _sequential(above_d, starts),
+            'below_k': _sequential(below_k & (stochastic.k != 0), starts),
+            'below_d': _sequential(below_d & (stochastic.d != 0), starts)
+        }
+
+        # Use the lowest sequential value of the fast and slow stochastics
+        _above = _minimum(above_k, runs['above_k'], above_d, runs['above_d'])
+        _below = _minimum(below_k, runs['below_k'], below_d, runs['below_d'])
+
+        # Return
+        result = {
+            'k': stochastic.k,
+            'd': stochastic.d,
+            'matches': valid & (above_k | above_d | below_k | below_d),
+            'sequential': np.where(above_k | above_d, _above, _below)
+        }
+        return result
+
+    def _long(self, periods, short, k_period=35, d_period=5, limit=4):
+        """Evaluate the summarized long term data of all pairs.
+
+        Args:
+            periods: Number of periods per long term timeframe
+            short: Array of short term matches
+            k_period: Periods for calculating Stochastic slow indicator
+            d_period: Moving Average periods for smoothing Stochastic to create
+                the fast indicator
+            limit: Stochastic difference limit for long term matches
+
+        Returns:
+            result: Dict of arrays
+
+        """
+        # Initialize key variables
+        shape = (len(self.pairs), self._size)
+        k_values = np.full(shape, np.nan)
+        d_values = np.full(shape, np.nan)
+        matches = np.zeros(shape, dtype=bool)
+        positions = self._positions()
+        pointers = np.where(short, positions, -1)
+
+        # Summarize every row the same way as evaluate.summary()
+        shift = periods - 1
+        _summary = np.full(self._values.shape, np.nan)
+        _summary[:, shift:, 0] = self._values[:, :self._size - shift, 0]
+        _summary[:, :, 1] = oscillator.rolling(
+            self._values[:, :, 1], periods, maximum=True)
+        _summary[:, :, 2] = oscillator.rolling(
+            self._values[:, :, 2], periods, maximum=False)
+        _summary[:, :, 3] = self._values[:, :, 3]
+        _summary[:, :, 4] = oscillator.total(self._values[:, :, 4], periods)
+        valid = positions >= (self._starts[:, None] + shift)
+
+        # Evaluate each alignment of the summary the same way as the
+        # evaluate.Incremental class
+        for residue in range(periods):
+            subset = _summary[:, residue::periods, :]
+            stochastic = oscillator.stochastic(
+                subset[:, :, 1],
+                subset[:, :, 2],
+                subset[:, :, 3],
+                periods=[(k_period, d_period)])[(k_period, d_period)]
+
+            # evaluate.stoch() drops the first 'k_period + d_period' rows
+            _valid = valid[:, residue::periods]
+            _valid = _valid & (
+                np.cumsum(_valid, axis=1) > k_period + d_period)
+
+            # Long term rows are found if there is a short term match
+            # with the same alignment after them
+            latest = pointers[:, residue::periods].max(axis=1)
+            k_values[:, residue::periods] = stochastic.k
+            d_values[:, residue::periods] = stochastic.d
+            matches[:, residue::periods] = _valid & (
+                np.abs(stochastic.d - stochastic.k) < limit) & (
+                    positions[:, residue::periods] <= latest[:, None])
+
+        # Return
+        result = {
+            'k': k_values,
+            'd': d_values,
+            'matches': matches,
+            'summary': _summary
+        }
+        return result
+
+    def _dataframe(self, row, positions, values, _summary):
+        """Create the evaluated DataFrame of a pair.
+
+        Args:
+            row: Row of the pair in the array
+            positions: Positions in the array of rows to include
+            values: Dict of evaluated arrays keyed by column name
+            _summary: Array of summarized values of the pair
+
+        Returns:
+            result: DataFrame
+
+        """
+        # Initialize key variables
+        _df = self._dataframes[self.pairs[row]]
+        rows = positions - self._starts[row]
+        summarized = 'open high low close volume'.split()
+        data = {}
+
+        # Add the original columns, replacing values with summarized ones
+        for column in _df.columns.tolist():
+            if column in summarized:
+                data[column] = _summary[positions, summarized.index(column)]
+            elif _df[column].dtype.kind in 'biuf':
+                data[column] = _df[column].values[rows].astype(np.float64)
+            else:
+                data[column] = _df[column].values[rows]
+
+        # Add the evaluated columns in the order of evaluate.evaluate()
+        data['k_l'] = values['k_l'][positions]
+        data['d_l'] = values['d_l'][positions]
+        data['Δ_l'] = data['k_l'] - data['d_l']
+        data['k_s'] = values['k_s'][positions]
+        data['d_s'] = values['d_s'][positions]
+        data['Δ_s'] = data['k_s'] - data['d_s']
+        data['sequential'] = values['sequential'][positions].astype(
+            np.float64)
+        data['counts'] = values['counts'][positions].astype(np.float64)
+
+        # Return
+        result = pd.DataFrame(data, index=_df.index[rows])
+        return result
+
+    def _positions(self):
+        """Get the positions of all rows in the array.
+
+        Args:
+            None
+
+        Returns:
+            result: Array of positions
+
+        """
+        # Return
+        result = np.broadcast_to(
+            np.arange(self._size), (len(self.pairs), self._size))
+        return result
+
+
+def _aligned(_df):
+    """Determine whether a DataFrame can be aligned by position.
+
+    Args:
+        _df: DataFrame
+
+    Returns:
+        result: True if timestamps are unique and sorted and indexes are
+            consecutive integers
+
+    """
+    # Initialize key variables
+    index = _df.index.values
+    timestamps = _df['timestamp'].values
+
+    # Return
+    result = bool(
+        _df.index.dtype.kind in 'iu' and
+        np.all(np.diff(index) == 1) and
+        np.all(np.diff(timestamps) > 0)
+    )
+    return result
+
+
+def _sequential(occurences, starts):
+    """Count sequential occurences along the rows of an array.
+
+    The same as evaluate.sequential(), but counting starts again at the
+    start position of each row.
+
+    Args:
+        occurences: 2D array of True / False values
+        starts: Array of start positions for each row
+
+    Returns:
+        result: 2D array of sequential occurences
+
+    """
+    # Initalize key variables
+    positions = np.broadcast_to(
+        np.arange(occurences.shape[1]), occurences.shape)
+
+    # Flag the start of each run of identical values
+    flags = np.ones(occurences.shape, dtype=bool)
+    flags[:, 1:] = occurences[:, 1:] != occurences[:, :-1]
+    flags |= positions == starts[:, None]
+
+    # Subtract the position of the start of each run from the positions
+    result = positions - np.maximum.accumulate(
+        np.where(flags, positions, 0), axis=1) + 1
+    return result
+
+
+def _minimum(fast, fast_runs, slow, slow_runs):
+    """Get the lowest sequential value of the fast and slow stochastics.
+
+    The same as evaluate._min_sequential(). Rows that only match one of the
+    stochastics use its sequential value.
+
+    Args:
+        fast: 2D array of fast stochastic matches
+        fast_runs: 2D array of fast stochastic sequential values
+        slow: 2D array of slow stochastic matches
+        slow_runs: 2D array of slow stochastic sequential values
+
+    Returns:
+        result: 2D array of sequential values
+
+    """
+    # Return
+    result = np.where(
+        fast & slow,
+        np.minimum(fast_runs, slow_runs),
+        np.where(fast, fast_runs, slow_runs))
+    return result
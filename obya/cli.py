@@ -108,6 +108,26 @@ def _api(subparsers, width=80, days=365):
             width=width)
     )
 
+    # Process concurrency flag
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        required=False,
+        default=4,
+        help=textwrap.fill(
+            'Maximum number of concurrent API requests. Default: 4',
+            width=width)
+    )
+
+    # Process incremental flag
+    parser.add_argument(
+        '--incremental',
+        help=textwrap.fill(
+            'Only fetch the bars after the latest bar of each pair in the '
+            'database. Pairs without data are backfilled --days.',
+            width=width),
+        action='store_true')
+
     # Process verbose flag
     parser.add_argument(
         '--verbose',
@@ -154,6 +174,13 @@ Number of days to include in the report. Data is always processed from the \
 first day of available data. Default: {}'''.format(duration), width=width)
     )
 
+    # Process batch flag
+    parser.add_argument(
+        '--batch',
+        help=textwrap.fill(
+            'Evaluate all pairs at once in a single process.', width=width),
+        action='store_true')
+
 
 def _evaluate(subparsers, width=80, days=365):
     """Process "evaluate" CLI commands.
@@ -202,6 +229,13 @@ Number of days to include in the report. Data is always processed from the \
 first day of available data. Default: {}'''.format(days), width=width)
     )
 
+    # Process batch flag
+    parser.add_argument(
+        '--batch',
+        help=textwrap.fill(
+            'Evaluate all pairs at once in a single process.', width=width),
+        action='store_true')
+
 
 def _ingest(subparsers, width=80):
     """Process "ingest" CLI commands.
@@ -239,6 +273,32 @@ def _ingest(subparsers, width=80):
             'Pair to ingest.', width=width)
     )
 
+    # Process timeframe flag
+    parser.add_argument(
+        '--timeframe',
+        type=int,
+        required=False,
+        help=textwrap.fill(
+            'Timeframe of the data. Default: The median difference between '
+            'the timestamps of the first chunk of rows.', width=width)
+    )
+
+    # Process chunksize flag
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=100000,
+        help=textwrap.fill(
+            'Number of rows to read and insert at a time. Default: 100000',
+            width=width)
+    )
+
+    # Process verbose flag
+    parser.add_argument(
+        '--verbose',
+        help='Verbose progress reporting.',
+        action='store_true')
+
 
 def _setup(subparsers, width=80):
     """Process "setup" CLI commands.
@@ -204,6 +204,22 @@ class Config():
         result = self._base_yaml_configuration.get('db_pool_size', 10)
         return result
 
+    @property
+    def db_insert_chunksize(self):
+        """Get db_insert_chunksize.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Process configuration
+        result = self._base_yaml_configuration.get(
+            'db_insert_chunksize', 10000)
+        return result
+
     @property
     def db_max_overflow(self):
         """Get db_max_overflow.
@@ -415,6 +431,36 @@ class Config():
         value = self._daemon_file(agent_name, 'pid')
         return value
 
+    @property
+    def resample_base(self):
+        """Get resample_base.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Process configuration
+        result = self._base_yaml_configuration.get('resample_base')
+        return result
+
+    @property
+    def resample_origin(self):
+        """Get resample_origin.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Process configuration
+        result = self._base_yaml_configuration.get('resample_origin', 345600)
+        return result
+
     @property
     def smtp_pass(self):
         """Get smtp_pass.
@@ -447,6 +493,76 @@ class Config():
         result = '{}'.format(_result)
         return result
 
+    @property
+    def store(self):
+        """Get store.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Process configuration
+        result = bool(self._base_yaml_configuration.get('store', False))
+        return result
+
+    @property
+    def store_directory(self):
+        """Determine the store_directory.
+
+        Args:
+            None
+
+        Returns:
+            value: configured store_directory
+
+        """
+        # Initialize key variables
+        _result = self._base_yaml_configuration.get(
+            'store_directory', '{}{}store'.format(
+                self.daemon_directory, os.sep))
+
+        # Expand linux ~ notation for home directories if provided.
+        value = os.path.expanduser(_result)
+
+        # Create directory if it doesn't exist
+        _mkdir(value)
+
+        # Return
+        return value
+
+    @property
+    def store_refresh(self):
+        """Get store_refresh.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Process configuration
+        result = self._base_yaml_configuration.get('store_refresh', 60)
+        return result
+
+    @property
+    def web_cache_ttl(self):
+        """Get web_cache_ttl.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Process configuration
+        result = self._base_yaml_configuration.get('web_cache_ttl', 300)
+        return result
+
     def _daemon_file(self, agent_name, suffix):
         """Get the pidfile name for an agent.
 
@@ -0,0 +1,156 @@
+"""Application module of the API ingestion agent.
+
+Description:
+
+    This module:
+        1) Fetches the bars of all pairs from the API after each bar closes
+        2) Refreshes the local store of the pairs that received new bars
+        3) Evaluates only the pairs that received new bars
+
+"""
+# Standard libraries
+import time
+
+# Application libraries
+from obya import log
+from obya import Config
+from obya import reports
+from obya.daemon.agent import Agent
+from obya.db.table import data
+from obya.ingest import api
+from obya.ingest import backfill
+
+
+class AgentIngest(Agent):
+    """Agent that ingests API data as each bar closes.
+
+    The API session, its connections, the database connection pool and the
+    pool of worker processes are created once and reused by every poll, so
+    none of them pay the startup costs of running bin/fxtoolkit.py.
+
+    """
+
+    def __init__(self, parent, timeframe=14400, days=730, report_days=182,
+                 concurrency=4, delay=30, base_url=None, config=None):
+        """Initialize the class.
+
+        Args:
+            parent: Name of parent daemon
+            timeframe: Timeframe of data
+            days: Days of data to backfill for pairs without data
+            report_days: Age in days of the reported evaluations. The same
+                as the default of the email command
+            concurrency: Maximum number of concurrent API requests
+            delay: Seconds to wait after each bar closes before polling,
+                giving the API time to publish the bar
+            base_url: URL of the API. Defaults to that of the configured
+                api_hostname
+            config: Config object
+
+        Returns:
+            None
+
+        """
+        # Apply inheritance
+        Agent.__init__(
+            self, parent, config=Config() if config is None else config)
+
+        # Initialize key variables
+        self.timeframe = timeframe
+        self._days = days
+        self._report_days = report_days
+        self._concurrency = concurrency
+        self._delay = delay
+        self._base_url = base_url
+        self._backfill = None
+        self._polled = False
+
+    def query(self):
+        """Poll the API once the current bar closes.
+
+        The first poll happens immediately to catch up on bars missed while
+        the agent wasn't running.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Wait for the bar to close
+        if self._polled is True:
+            time.sleep(self.wait())
+        self._polled = True
+
+        # Keep polling if the API, database or evaluation fail
+        try:
+            updated = self.poll()
+
+            # Evaluate pairs with new bars
+            if bool(updated) is True:
+                report = reports.reports(
+                    self.timeframe, days=self._report_days, pairs_=updated)
+                if bool(report) is True:
+                    log.log2info(1026, report)
+        except Exception as error:
+            log_message = (
+                'Unable to ingest and evaluate API data. Error: {}'.format(
+                    error))
+            log.log2warning(1025, log_message)
+
+    def poll(self):
+        """Fetch the bars of all pairs after their latest stored bar.
+
+        Args:
+            None
+
+        Returns:
+            result: List of pairs that received new bars
+
+        """
+        # Initialize key variables
+        pairs = self.config.pairs
+        stop = int(time.time())
+        start = stop - (self._days * 86400)
+
+        # Connect once and reuse the session
+        if self._backfill is None:
+            self._backfill = backfill.Backfill(
+                api.API(base_url=self._base_url, maxsize=self._concurrency),
+                timeframe=self.timeframe,
+                concurrency=self._concurrency)
+
+        # Fetch the missing bars of all pairs together
+        before = data.latest(pairs, self.timeframe)
+        self._backfill.run(
+            pairs, start, stop,
+            starts=backfill.starts(before, start, self.timeframe))
+        after = data.latest(pairs, self.timeframe)
+
+        # Refresh the local store shared with other processes
+        result = [_ for _ in pairs if after.get(_) != before.get(_)]
+        data.synchronize(result, self.timeframe)
+
+        # Return
+        return result
+
+    def wait(self, now=None):
+        """Get the seconds until the next poll.
+
+        Polls are aligned to the close of bars of the timeframe.
+
+        Args:
+            now: UTC timestamp to wait from. Defaults to the current time
+
+        Returns:
+            result: Seconds to wait
+
+        """
+        # Initialize key variables
+        now = time.time() if now is None else now
+
+        # Return
+        close = (int(now - self._delay) // self.timeframe + 1) * self.timeframe
+        result = close + self._delay - now
+        return result
@@ -0,0 +1,230 @@
+"""Application module to store Data table rows in local columnar files.
+
+Each (pair, timeframe) has its own .npy file of the 2D float64 array of
+data.COLUMNS sorted by timestamp. Files are memory-mapped when read, so
+loading them doesn't copy any data, and are replaced atomically when
+written, so readers never see partial files.
+
+Processes such as the web API workers map the same files, so they share
+one copy of each array in the page cache. Each file is refreshed by one
+process at a time while holding its lock.
+
+"""
+
+# Standard imports
+from contextlib import contextmanager
+import fcntl
+import os
+import time
+
+# PIP libraries
+import numpy as np
+
+# Application imports
+from obya import files
+
+
+class Store():
+    """Class to read and write the files of the store.
+
+    The modification time of each file is when it was last synchronized
+    with the database.
+
+    """
+
+    def __init__(self, directory, refresh=60, width=6):
+        """Initialize the class.
+
+        Args:
+            directory: Directory in which to save files
+            refresh: Seconds after which files are synchronized with the
+                database again
+            width: Number of columns of the arrays
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.directory = directory
+        self._refresh = refresh
+        self._width = width
+        self._mapped = {}
+
+        # Create the directory
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, idx_pair, timeframe):
+        """Read the array of a pair.
+
+        Args:
+            idx_pair: Pair.idx value
+            timeframe: Timeframe of data
+
+        Returns:
+            result: Read only memory-mapped 2D array. None if not stored
+
+        """
+        # Initialize key variables
+        filepath = self._filepath(idx_pair, timeframe)
+        try:
+            status = os.stat(filepath)
+        except OSError:
+            return None
+        inode = (status.st_dev, status.st_ino)
+
+        # Reuse the mapping of the file if it wasn't replaced. The inode of
+        # a mapped file can't be reused by a new one
+        (_inode, result) = self._mapped.get(filepath, (None, None))
+        if _inode == inode:
+            return result
+
+        # Map the file
+        try:
+            result = np.load(filepath, mmap_mode='r')
+        except (OSError, ValueError):
+            result = None
+        if result is not None and result.ndim != 2:
+            result = None
+        if result is not None:
+            self._mapped[filepath] = (inode, result)
+        return result
+
+    def fresh(self, idx_pair, timeframe):
+        """Determine whether the array of a pair was recently synchronized.
+
+        Args:
+            idx_pair: Pair.idx value
+            timeframe: Timeframe of data
+
+        Returns:
+            result: True if fresh
+
+        """
+        # Return
+        try:
+            modified = os.path.getmtime(self._filepath(idx_pair, timeframe))
+        except OSError:
+            return False
+        result = bool(time.time() - modified < self._refresh)
+        return result
+
+    def append(self, idx_pair, timeframe, values_):
+        """Add rows after the last stored row of a pair.
+
+        Args:
+            idx_pair: Pair.idx value
+            timeframe: Timeframe of data
+            values_: 2D array of rows sorted by timestamp. Rows that aren't
+                newer than the last stored row are ignored
+
+        Returns:
+            result: Read only memory-mapped 2D array of all stored rows
+
+        """
+        # Initialize key variables
+        filepath = self._filepath(idx_pair, timeframe)
+        values_ = np.asarray(values_, dtype=np.float64).reshape(
+            -1, self._width)
+        stored = self.load(idx_pair, timeframe)
+
+        # Only write files that change
+        if stored is not None and bool(stored.shape[0]) is True:
+            values_ = values_[values_[:, 0] > stored[-1, 0]]
+        if stored is not None and bool(values_.shape[0]) is False:
+            os.utime(filepath)
+            return stored
+        if stored is not None:
+            values_ = np.concatenate([stored, values_])
+
+        # Write the file atomically
+        with files.atomic(filepath) as f_handle:
+            np.save(f_handle, values_)
+
+        # Return
+        result = self.load(idx_pair, timeframe)
+        return result
+
+    @contextmanager
+    def lock(self, idx_pair, timeframe):
+        """Lock the array of a pair so only one process refreshes it.
+
+        Args:
+            idx_pair: Pair.idx value
+            timeframe: Timeframe of data
+
+        Returns:
+            None
+
+        """
+        # Wait for other processes to release the lock
+        with open('{}.lock'.format(
+                self._filepath(idx_pair, timeframe)), 'a') as f_handle:
+            fcntl.flock(f_handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f_handle, fcntl.LOCK_UN)
+
+    def invalidate(self, idx_pair, timeframe, timestamps):
+        """Update the store after rows of a pair are inserted into the
+        database.
+
+        Arrays are synchronized with the database on their next read. They
+        are deleted if the rows are older than the last stored row and
+        missing from the array, as only newer rows are appended.
+
+        Args:
+            idx_pair: Pair.idx value
+            timeframe: Timeframe of data
+            timestamps: Array of timestamps of the inserted rows
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        filepath = self._filepath(idx_pair, timeframe)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+
+        # Hold the lock so a concurrent refresh can't replace the file with
+        # one read before the rows were inserted
+        with self.lock(idx_pair, timeframe):
+            stored = self.load(idx_pair, timeframe)
+            if stored is None:
+                return
+
+            # Find older rows that aren't stored
+            missing = False
+            if bool(stored.shape[0]) is True:
+                older = timestamps[timestamps <= stored[-1, 0]]
+                positions = np.searchsorted(stored[:, 0], older)
+                missing = bool(
+                    np.any(positions >= stored.shape[0]) or
+                    np.any(stored[np.minimum(
+                        positions, stored.shape[0] - 1), 0] != older))
+            del stored
+
+            try:
+                if missing is True:
+                    os.remove(filepath)
+                else:
+                    os.utime(filepath, (0, 0))
+            except OSError:
+                pass
+
+    def _filepath(self, idx_pair, timeframe):
+        """Get the file of the array of a pair.
+
+        Args:
+            idx_pair: Pair.idx value
+            timeframe: Timeframe of data
+
+        Returns:
+            result: File path
+
+        """
+        # Return
+        result = os.path.join(
+            self.directory, '{}_{}.npy'.format(int(idx_pair), int(timeframe)))
+        return result
@@ -1,40 +1,53 @@
 """Application module to maniupate the Data database table."""
 
-import time
 from datetime import timezone
+from itertools import chain
 import datetime
+import numpy as np
 import pandas as pd
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
+from sqlalchemy import insert as _insert
 
 # Import project libraries
+from obya import Config
 from obya.db import db
+from obya.db.store import Store
 from obya.db.models import Data as _Data
 from obya.db.table import pair
 
+# Columns of the arrays returned by values()
+COLUMNS = 'timestamp open high low close volume'.split()
 
-def insert(pair_, df_):
+# Weekday abbreviations starting on Monday
+WEEKDAYS = np.array('Mon Tue Wed Thu Fri Sat Sun'.split())
+
+# Local store of the process. False if the store is disabled
+_STORE = None
+
+
+def insert(pair_, df_, timeframe=None, chunksize=None):
     """Create a Data table entries.
 
+    Rows with timestamps that already exist in the table are ignored.
+
     Args:
         pair_: pair
         df_: pd.Dataframe to insert
+        timeframe: Timeframe of data. Defaults to the median difference
+            between the timestamps of the DataFrame
+        chunksize: Number of rows inserted per statement. Defaults to the
+            db_insert_chunksize configuration value
 
     Returns:
         None
 
     """
-    # Initialize key variables
-    rows = []
-    lookups = []
-    items = []
-
     # Get limits of query, convert to integer values as sqlalchemy doesn't
     # like pandas type ints
-    timeframe = int(
-        (df_['timestamp'][1:] - df_['timestamp'].shift()[1:]).median()
-    )
-    start = int(df_['timestamp'].min())
-    stop = int(df_['timestamp'].max())
+    if timeframe is None:
+        timeframe = int(
+            (df_['timestamp'][1:] - df_['timestamp'].shift()[1:]).median()
+        )
 
     # Get the index for the pair
     idx_pair = pair.exists(pair_)
@@ -42,41 +55,65 @@ def insert(pair_, df_):
         pair.insert(pair_)
         idx_pair = pair.exists(pair_)
 
-    # Get name from database
-    with db.db_query(1004) as session:
-        items = session.query(_Data.timestamp).filter(
-            and_(
-                _Data.timeframe == timeframe,
-                _Data.idx_pair == idx_pair,
-                _Data.timestamp >= start,
-                _Data.timestamp <= stop
-            )
-        )
+    # Insert
+    bulk(idx_pair, timeframe, df_[COLUMNS].values, chunksize=chunksize)
 
-    # Populate lookup list
-    for item in items:
-        lookups.append(int(item.timestamp))
-
-    # Poplulate data to be inserted into the database
-    for _, row in df_.iterrows():
-        if int(row['timestamp']) in lookups:
-            continue
-        rows.append(
-            _Data(
-                timeframe=timeframe,
-                idx_pair=idx_pair,
-                timestamp=int(row['timestamp']),
-                open=float(row['open']),
-                high=float(row['high']),
-                low=float(row['low']),
-                close=float(row['close']),
-                volume=int(row['volume'])
-            )
-        )
 
-    # Insert
-    with db.db_modify(1007) as session:
-        session.add_all(rows)
+def bulk(idx_pair, timeframe, values_, chunksize=None):
+    """Insert an array of COLUMNS into the Data table.
+
+    Rows are inserted with multi-row INSERT statements that ignore rows
+    with timestamps that already exist in the table.
+
+    Args:
+        idx_pair: Pair.idx value
+        timeframe: Timeframe of data
+        values_: 2D array of COLUMNS
+        chunksize: Number of rows inserted per statement. Defaults to the
+            db_insert_chunksize configuration value
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    values_ = np.asarray(values_, dtype=np.float64).reshape(-1, len(COLUMNS))
+    if bool(chunksize) is False:
+        chunksize = Config().db_insert_chunksize
+
+    # Only insert the first row of each timestamp
+    (_, rows) = np.unique(values_[:, 0], return_index=True)
+    values_ = values_[np.sort(rows)]
+
+    # Insert one transaction per chunk
+    for pointer in range(0, len(values_), chunksize):
+        chunk = values_[pointer:pointer + chunksize]
+        records = [
+            {
+                'idx_pair': int(idx_pair),
+                'timeframe': int(timeframe),
+                'timestamp': timestamp,
+                'open': open_,
+                'high': high,
+                'low': low,
+                'close': close,
+                'volume': volume
+            } for (timestamp, open_, high, low, close, volume) in zip(
+                chunk[:, 0].astype(np.int64).tolist(),
+                chunk[:, 1].tolist(),
+                chunk[:, 2].tolist(),
+                chunk[:, 3].tolist(),
+                chunk[:, 4].tolist(),
+                chunk[:, 5].astype(np.int64).tolist())
+        ]
+        with db.db_modify(1007) as session:
+            session.execute(
+                _statement(session.get_bind().dialect.name), records)
+
+    # Synchronize the local store with the new rows
+    store_ = _store()
+    if store_ is not None:
+        store_.invalidate(idx_pair, timeframe, values_[:, 0])
 
 
 def dataframe(pair_, timeframe, secondsago=None):
@@ -92,49 +129,388 @@ def dataframe(pair_, timeframe, secondsago=None):
 
     """
     # Initialize key variables
+    start = _start(secondsago)
+
+    # Get the index for the pair
+    idx_pair = pair.exists(pair_)
+
+    # Read through the local store if enabled
+    store_ = _store()
+    if store_ is not None and bool(idx_pair) is True:
+        values_ = _stored(store_, idx_pair, timeframe, start)
+    else:
+        values_ = _fetch(
+            select(
+                _Data.timestamp,
+                _Data.open,
+                _Data.high,
+                _Data.low,
+                _Data.close,
+                _Data.volume,
+                ).where(
+                    and_(
+                        _Data.timeframe == timeframe,
+                        _Data.idx_pair == idx_pair,
+                        _Data.timestamp >= start
+                    )
+                ),
+            1006,
+            len(COLUMNS))
+
+    # Get the data
+    df_ = frame(values_)
+    return df_
+
+
+def dataframes(pairs_, timeframe, secondsago=None):
+    """Get the data of many pairs with a single query.
+
+    Args:
+        pairs_: List of pairs
+        timeframe: Timeframe of data
+        secondsago: Number of seconds in the past for valid data
+
+    Returns:
+        result: Dict of pd.Dataframes keyed by pair. The same as those
+            returned by dataframe()
+
+    """
+    # Initialize key variables
+    arrays = values(pairs_, timeframe, secondsago=secondsago)
+    empty = np.empty((0, len(COLUMNS)))
+
+    # Return
+    result = {_: frame(arrays.get(_, empty)) for _ in pairs_}
+    return result
+
+
+def values(pairs_, timeframe, secondsago=None):
+    """Get the data of many pairs as arrays with a single query.
+
+    Args:
+        pairs_: List of pairs
+        timeframe: Timeframe of data
+        secondsago: Number of seconds in the past for valid data
+
+    Returns:
+        result: Dict of 2D float64 arrays of COLUMNS sorted by timestamp,
+            keyed by pair. Pairs without data are excluded
+
+    """
+    # Initialize key variables
+    result = {}
+    start = _start(secondsago)
+    indexes = pair.indexes(pairs_)
+    lookup = {}
+    for item in pairs_:
+        if item.lower() in indexes:
+            lookup[indexes[item.lower()]] = item
+
+    # Get the data of all pairs in one query
+    if bool(lookup) is True:
+        array = _fetch(
+            select(
+                _Data.idx_pair,
+                _Data.timestamp,
+                _Data.open,
+                _Data.high,
+                _Data.low,
+                _Data.close,
+                _Data.volume,
+                ).where(
+                    and_(
+                        _Data.timeframe == timeframe,
+                        _Data.idx_pair.in_(list(lookup.keys())),
+                        _Data.timestamp >= start
+                    )
+                ).order_by(_Data.idx_pair, _Data.timestamp),
+            1019,
+            len(COLUMNS) + 1)
+    else:
+        array = np.empty((0, len(COLUMNS) + 1))
+
+    # Split the rows by pair
+    boundaries = np.flatnonzero(np.diff(array[:, 0])) + 1
+    for chunk in np.split(array, boundaries):
+        if bool(chunk.size) is True:
+            result[lookup[int(chunk[0, 0])]] = np.ascontiguousarray(
+                chunk[:, 1:])
+    return result
+
+
+def latest(pairs_, timeframe):
+    """Get the latest timestamp of many pairs with a single query.
+
+    Args:
+        pairs_: List of pairs
+        timeframe: Timeframe of data
+
+    Returns:
+        result: Dict of latest timestamps keyed by pair. Pairs without data
+            are excluded
+
+    """
+    # Initialize key variables
+    result = {}
     rows = []
-    columns = 'timestamp date open high low close volume'
-    df_ = None
-    start = 0
+    indexes = pair.indexes(pairs_)
+    lookup = {}
+    for item in pairs_:
+        if item.lower() in indexes:
+            lookup[indexes[item.lower()]] = item
+
+    # Get the latest timestamp of each pair
+    if bool(lookup) is True:
+        with db.db_query(1029) as session:
+            rows = session.query(
+                _Data.idx_pair,
+                func.max(_Data.timestamp).label('timestamp')
+                ).filter(
+                    and_(
+                        _Data.timeframe == timeframe,
+                        _Data.idx_pair.in_(list(lookup.keys()))
+                    )
+                ).group_by(_Data.idx_pair)
+
+    # Return
+    for row in rows:
+        result[lookup[row.idx_pair]] = int(row.timestamp)
+    return result
+
+
+def synchronize(pairs_, timeframe):
+    """Append the new rows of many pairs to the local store.
+
+    This allows a single process, such as the ingestion daemon, to refresh
+    the store for all the processes that read it.
+
+    Args:
+        pairs_: List of pairs
+        timeframe: Timeframe of data
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    store_ = _store()
+    if store_ is None:
+        return
 
+    # Refresh the store
+    indexes = pair.indexes(pairs_)
+    for item in pairs_:
+        idx_pair = indexes.get(item.lower())
+        if bool(idx_pair) is True:
+            _stored(store_, idx_pair, timeframe, 0)
+
+
+def frame(values_):
+    """Create a DataFrame from an array of COLUMNS.
+
+    Args:
+        values_: 2D array of COLUMNS
+
+    Returns:
+        result: pd.Dataframe. Use dates() to create human readable dates
+            from the 'timestamp' column when needed
+
+    """
+    # Initialize key variables
+    values_ = np.asarray(values_, dtype=np.float64).reshape(-1, len(COLUMNS))
+
+    # Return
+    result = pd.DataFrame({
+        'timestamp': values_[:, 0].astype(np.int64),
+        'open': values_[:, 1],
+        'high': values_[:, 2],
+        'low': values_[:, 3],
+        'close': values_[:, 4],
+        'volume': values_[:, 5]
+    })
+    return result
+
+
+def dates(timestamps):
+    """Format timestamps as "%Y-%m-%d %H:%M %a" UTC date strings.
+
+    Args:
+        timestamps: Array of integer timestamps
+
+    Returns:
+        result: Array of date strings
+
+    """
+    # Initialize key variables
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    minutes = timestamps.astype('datetime64[s]').astype('datetime64[m]')
+
+    # January 1, 1970 was a Thursday
+    weekdays = WEEKDAYS[(timestamps // 86400 + 3) % 7]
+    dates = np.char.replace(np.datetime_as_string(minutes), 'T', ' ')
+
+    # Return
+    result = np.char.add(np.char.add(dates, ' '), weekdays).astype(object)
+    return result
+
+
+def _fetch(statement, error_code, width, chunksize=100000):
+    """Read the result of a query into a float64 array.
+
+    Rows are read from the database cursor in chunks and copied straight
+    into arrays, without creating SQLAlchemy row objects.
+
+    Args:
+        statement: SQLAlchemy Select object of numeric columns
+        error_code: Error code to use in messages
+        width: Number of columns selected
+        chunksize: Number of rows to read at a time
+
+    Returns:
+        result: 2D array of rows
+
+    """
+    # Initialize key variables
+    arrays = []
+
+    # Read the rows
+    with db.db_query(error_code) as session:
+        cursor = session.connection().execute(statement).cursor
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if bool(rows) is False:
+                break
+            arrays.append(
+                np.fromiter(
+                    chain.from_iterable(rows),
+                    dtype=np.float64,
+                    count=len(rows) * width))
+
+    # Return
+    if bool(arrays) is True:
+        result = np.concatenate(arrays).reshape(-1, width)
+    else:
+        result = np.empty((0, width))
+    return result
+
+
+def _stored(store_, idx_pair, timeframe, start):
+    """Get the data of a pair from the local store.
+
+    Only the rows newer than the last stored row are read from the
+    database, and only if the store wasn't recently synchronized.
+
+    Args:
+        store_: Store object
+        idx_pair: Pair.idx value
+        timeframe: Timeframe of data
+        start: Starting timestamp
+
+    Returns:
+        result: Read only memory-mapped 2D array of COLUMNS
+
+    """
+    # Initialize key variables
+    result = store_.load(idx_pair, timeframe)
+
+    # Append new rows from the database. Processes waiting for the lock
+    # use the rows appended by the process that held it
+    if result is None or store_.fresh(idx_pair, timeframe) is False:
+        with store_.lock(idx_pair, timeframe):
+            result = store_.load(idx_pair, timeframe)
+            if result is None or store_.fresh(idx_pair, timeframe) is False:
+                if result is not None and bool(result.shape[0]) is True:
+                    last = int(result[-1, 0])
+                else:
+                    last = -1
+                result = store_.append(
+                    idx_pair,
+                    timeframe,
+                    _fetch(
+                        select(
+                            _Data.timestamp,
+                            _Data.open,
+                            _Data.high,
+                            _Data.low,
+                            _Data.close,
+                            _Data.volume,
+                            ).where(
+                                and_(
+                                    _Data.timeframe == timeframe,
+                                    _Data.idx_pair == idx_pair,
+                                    _Data.timestamp > last
+                                )
+                            ).order_by(_Data.timestamp),
+                        1006,
+                        len(COLUMNS)))
+
+    # Return
+    result = result[np.searchsorted(result[:, 0], start):]
+    return result
+
+
+def _store():
+    """Get the local store of the process.
+
+    Args:
+        None
+
+    Returns:
+        result: Store object. None if the store is disabled
+
+    """
+    # Initialize key variables
+    global _STORE
+
+    # Create the store once
+    if _STORE is None:
+        config = Config()
+        if config.store is True:
+            _STORE = Store(
+                config.store_directory,
+                refresh=config.store_refresh,
+                width=len(COLUMNS))
+        else:
+            _STORE = False
+    result = _STORE or None
+    return result
+
+
+def _statement(dialect):
+    """Create an INSERT statement that ignores duplicate Data table rows.
+
+    Args:
+        dialect: Name of the SQLAlchemy dialect of the database
+
+    Returns:
+        result: SQLAlchemy Insert object
+
+    """
+    # Return
+    if dialect == 'mysql':
+        result = _insert(_Data.__table__).prefix_with('IGNORE')
+    elif dialect == 'sqlite':
+        result = _insert(_Data.__table__).prefix_with('OR IGNORE')
+    else:
+        result = _insert(_Data.__table__)
+    return result
+
+
+def _start(secondsago=None):
+    """Get the starting timestamp of data.
+
+    Args:
+        secondsago: Number of seconds in the past for valid data
+
+    Returns:
+        result: Starting timestamp. Zero if secondsago isn't valid
+
+    """
     # Get starting time
     if bool(secondsago) is True and isinstance(secondsago, (int, float)):
         # Get current UTC timestamp
         now = datetime.datetime.now().replace(tzinfo=timezone.utc).timestamp()
-        start = now - abs(secondsago)
+        result = now - abs(secondsago)
     else:
-        start = 0
-
-    # Get the index for the pair
-    idx_pair = pair.exists(pair_)
-
-    # Get name from database
-    with db.db_query(1006) as session:
-        rows = session.query(
-            _Data.timestamp,
-            _Data.open,
-            _Data.high,
-            _Data.low,
-            _Data.close,
-            _Data.volume,
-            ).filter(
-                and_(
-                    _Data.timeframe == timeframe,
-                    _Data.idx_pair == idx_pair,
-                    _Data.timestamp >= start
-                )
-            )
-
-    # Populate lookup list
-    if bool(rows) is True:
-        df_ = pd.DataFrame(
-            [(row.timestamp,
-              time.strftime('%Y-%m-%d %H:%M %a', time.gmtime(row.timestamp)),
-              row.open,
-              row.high,
-              row.low,
-              row.close,
-              row.volume
-              ) for row in rows],
-            columns=columns.split())
-    return df_
+        result = 0
+    return result
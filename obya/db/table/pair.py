@@ -55,6 +55,34 @@ def exists(pair):
     return result
 
 
+def indexes(pairs_):
+    """Get the Pair.idx values of many pairs with a single query.
+
+    Args:
+        pairs_: List of pair names
+
+    Returns:
+        result: Dict of Pair.idx values keyed by pair name. Pairs that don't
+            exist are excluded
+
+    """
+    # Initialize key variables
+    result = {}
+    rows = []
+    names = [_.lower().encode() for _ in pairs_]
+
+    # Get name from database
+    if bool(names) is True:
+        with db.db_query(1018) as session:
+            rows = session.query(_Pair.idx, _Pair.pair).filter(
+                _Pair.pair.in_(names))
+
+    # Return
+    for row in rows:
+        result[row.pair.decode()] = row.idx
+    return result
+
+
 def insert(item):
     """Create a Pair table entry.
 
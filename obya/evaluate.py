@@ -3,13 +3,17 @@
 # Standard imports
 from datetime import timezone
 import datetime
-from itertools import groupby
 
 # PIP3 imports
-import ta
 import pandas as pd
 import numpy as np
 
+# Application imports
+from obya import oscillator
+
+# Default age in seconds of the entries kept by recent()
+RECENT = 5184000 / 2
+
 
 class Either():
     """Class to identify dataframe stochastic values beyond a limit."""
@@ -220,6 +224,183 @@ class Evaluate():
         return result
 
 
+class Incremental():
+    """Class to incrementally evaluate long term data up to a timestamp.
+
+    Summarizing a DataFrame truncated at row 'p' only creates rows at
+    positions congruent to 'p' modulo 'periods', and the value of each row
+    doesn't depend on where the DataFrame was truncated. The summary and
+    stochastic for each of the 'periods' possible alignments are therefore
+    calculated once, and then read as the cutoff timestamp moves.
+
+    """
+
+    def __init__(self, _df, periods, k_period=35, d_period=5, limit=4):
+        """Initialize the class.
+
+        Args:
+            _df: Short term DataFrame to analyse
+            periods: Number of periods per long term timeframe
+            k_period: Periods for calculating Stochastic slow indicator
+            d_period: Moving Average periods for smoothing Stochastic to create
+                the fast indicator
+            limit: Stochastic difference limit for long term matches
+
+        Returns:
+            None
+
+        """
+        # Initalize key variables
+        df_ = _df.copy()
+        self._periods = periods
+        self._timestamps = df_['timestamp'].values
+        self._matches = {}
+        self._positions = {}
+        self._pointers = {}
+
+        # Only data sorted by timestamp with unique indexes can be truncated
+        # by position instead of by filtering
+        self.valid = bool(
+            df_['timestamp'].is_monotonic_increasing and df_.index.is_unique)
+        if self.valid is False:
+            return
+
+        # Summarize every row once. Row 'n' of the result is row
+        # 'n + periods - 1' of the original DataFrame
+        crawl = summary(df_, periods=periods, crawling=True)
+
+        # Evaluate each alignment of the summary
+        for residue in range(periods):
+            offset = (residue - (periods - 1)) % periods
+            subset = crawl.iloc[offset::periods]
+            if subset.empty is True:
+                matches = crawl.iloc[0:0]
+            else:
+                matches = Evaluate(
+                    subset, k_period=k_period, d_period=d_period).difference(
+                        limit=limit)
+            self._matches[residue] = matches
+            self._positions[residue] = df_.index.get_indexer(matches.index)
+
+    def evaluate(self, timestamp):
+        """Get long term matches up to a timestamp not previously returned.
+
+        Args:
+            timestamp: Cutoff timestamp
+
+        Returns:
+            result: DataFrame of matches
+
+        """
+        # Get the position of the last row at or before the timestamp
+        pointer = int(
+            np.searchsorted(self._timestamps, timestamp, side='right')) - 1
+        residue = pointer % self._periods
+        matches = self._matches[residue]
+        last = self._pointers.get(residue, -1)
+
+        # Return nothing if all entries have been returned before
+        if pointer <= last:
+            return matches.iloc[0:0]
+
+        # Get rows between the last pointer and the current one
+        positions = self._positions[residue]
+        start = np.searchsorted(positions, last, side='right')
+        stop = np.searchsorted(positions, pointer, side='right')
+        self._pointers[residue] = pointer
+        result = matches.iloc[start:stop]
+        return result
+
+
+class Accumulator():
+    """Class to accumulate DataFrame rows with unique indexes.
+
+    Rows are copied into columns preallocated to a maximum size, and the
+    columns are only converted to a DataFrame once all rows are added.
+
+    """
+
+    def __init__(self, columns, size):
+        """Initialize the class.
+
+        Args:
+            columns: Dict of column dtypes keyed by column name
+            size: Maximum number of rows to accumulate
+
+        Returns:
+            None
+
+        """
+        # Initalize key variables
+        self._found = set()
+        self._count = 0
+        self._index = np.empty(size, dtype=object)
+        self._values = {}
+
+        # Numeric columns are stored as floats. Others, including pandas
+        # extension types such as tz-aware dates, are stored as objects
+        for column, dtype in columns.items():
+            if bool(
+                    pd.api.types.is_numeric_dtype(dtype) or
+                    pd.api.types.is_bool_dtype(dtype)) is True:
+                self._values[column] = np.empty(size, dtype=np.float64)
+            else:
+                self._values[column] = np.empty(size, dtype=object)
+
+    def add(self, _df):
+        """Add DataFrame rows whose indexes haven't been added before.
+
+        Args:
+            _df: DataFrame
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        pointers = []
+
+        # Find rows with new indexes
+        for pointer, index in enumerate(_df.index.tolist()):
+            if index not in self._found:
+                self._found.add(index)
+                pointers.append(pointer)
+
+        # Copy the rows
+        if bool(pointers) is True:
+            start = self._count
+            stop = start + len(pointers)
+            self._index[start:stop] = _df.index.values[pointers]
+            for column, values in self._values.items():
+                if values.dtype == np.float64:
+                    values[start:stop] = _df[column].to_numpy(
+                        dtype=np.float64, na_value=np.nan)[pointers]
+                else:
+                    values[start:stop] = _df[column].to_numpy(
+                        dtype=object)[pointers]
+            self._count = stop
+
+    def dataframe(self):
+        """Create DataFrame of accumulated rows.
+
+        Args:
+            None
+
+        Returns:
+            result: DataFrame
+
+        """
+        # Return
+        result = pd.DataFrame(
+            {
+                column: values[:self._count]
+                for column, values in self._values.items()
+            },
+            index=pd.Index(self._index[:self._count].tolist())
+        )
+        return result
+
+
 def evaluate(_df, periods, k_period=35, d_period=5):
     """Evaluate data.
 
@@ -269,7 +450,8 @@ def evaluate(_df, periods, k_period=35, d_period=5):
     # Add the frequency column
     result = frequency(result, s_term, periods=periods)
 
-    # Convert all columns to floats as rolling NaNs create object type columns
+    # Convert all columns to floats as the counts and sequential columns are
+    # integers
     result = result.astype(
         {
             'open': np.float64,
@@ -307,10 +489,12 @@ def ls_evaluate(_df, periods, k_period=35, d_period=5):
     """
     # Initialize key variables
     df_ = _df.copy()
-    lt_index = []
 
-    # Create a DataFrame in which we will place matches
-    l_term = pd.DataFrame()
+    # Create an accumulator in which we will place matches. There can't be
+    # more matches than rows in the DataFrame.
+    columns = df_.dtypes.to_dict()
+    columns.update({'k': np.float64, 'd': np.float64})
+    accumulator = Accumulator(columns, len(df_))
 
     # Evaluate DataFrame
     s_term = Evaluate(df_, k_period=k_period, d_period=d_period).either()
@@ -318,27 +502,31 @@ def ls_evaluate(_df, periods, k_period=35, d_period=5):
     # Get a list of timestamps
     timestamps = s_term['timestamp'].tolist()
 
-    for timestamp in timestamps:
-        # Get values upto the current timestamp
-        temp_data = df_[df_['timestamp'] <= timestamp]
+    # Summarize and evaluate the long term data once
+    incremental = Incremental(
+        df_, periods, k_period=k_period, d_period=d_period, limit=4)
 
-        # Get long term values
-        # Evaluate DataFrame by summarizing (ie. `periods` number of periods)
-        temp_summ = summary(temp_data, periods=periods)
-        temp_long = Evaluate(
-            temp_summ, k_period=k_period, d_period=d_period).difference(
-                limit=4)
-        temp_indx = temp_long.index.tolist()
+    for timestamp in timestamps:
+        if incremental.valid is True:
+            # Get long term values upto the current timestamp
+            temp_long = incremental.evaluate(timestamp)
+        else:
+            # Get values upto the current timestamp
+            temp_data = df_[df_['timestamp'] <= timestamp]
 
-        # Save found entry
-        for index in temp_indx:
-            if index not in lt_index:
-                l_term = l_term.append(pd.DataFrame(temp_long.loc[index]).T)
+            # Get long term values
+            # Evaluate DataFrame by summarizing (ie. `periods` number of
+            # periods)
+            temp_summ = summary(temp_data, periods=periods)
+            temp_long = Evaluate(
+                temp_summ, k_period=k_period, d_period=d_period).difference(
+                    limit=4)
 
-        # Save the indexes found
-        lt_index.extend(temp_indx)
+        # Save found entries
+        accumulator.add(temp_long)
 
     # Return
+    l_term = accumulator.dataframe()
     return(s_term, l_term)
 
 
@@ -393,29 +581,54 @@ def _evaluate(_df, periods, k_period=35, d_period=5):
 def summary(_df, periods=5, crawling=False):
     """Create a DataFrame summarizing past events.
 
+    Each row summarizes the 'periods' rows ending with it. The 'low',
+    'high' and 'volume' columns are the minimum, maximum and total of those
+    rows, 'open' is the first of them and the other columns are unchanged.
+
     Args:
         _df: pd.DataFrame
         periods: Number of previous periods to include in summarization
-        crawling:
+        crawling: Summarize every row if True, else only every 'periods'
+            row counting back from the last one
 
     Returns:
         result: Modified DataFrame
 
     """
     # Initialize key variables
-    df_ = _df.copy()
-    df_['low'] = df_['low'].rolling(periods).min()
-    df_['high'] = df_['high'].rolling(periods).max()
-    df_['volume'] = df_['volume'].rolling(periods).sum()
-    df_['open'] = df_['open'].shift(periods - 1)
-
-    # Trim NaNs
-    result = df_[periods - 1:]
-
-    # Get every `period` row and reverse sort the index to
-    # mimic the original ordering
-    if bool(crawling) is False:
-        result = result[::-periods].iloc[::-1]
+    size = len(_df)
+    low = _df['low'].values.astype(np.float64)
+    high = _df['high'].values.astype(np.float64)
+    volume = _df['volume'].values.astype(np.float64)
+    open_ = _df['open'].values.astype(np.float64)
+
+    if bool(crawling) is True:
+        # Summarize every row with sliding windows, trimming the first rows
+        # that don't have enough rows before them
+        ends = np.arange(periods - 1, size)
+        result = _df.iloc[periods - 1:].copy()
+        result['low'] = oscillator.rolling(
+            low, periods, maximum=False)[periods - 1:]
+        result['high'] = oscillator.rolling(
+            high, periods, maximum=True)[periods - 1:]
+        result['volume'] = oscillator.total(volume, periods)[periods - 1:]
+    else:
+        # Only summarize the blocks of 'periods' rows ending with the last
+        # row. Leftover rows at the start are ignored
+        blocks = size // periods
+        starts = np.arange(size - blocks * periods, size, periods)
+        ends = starts + periods - 1
+        result = _df.iloc[ends].copy()
+        if bool(blocks) is True:
+            result['low'] = np.minimum.reduceat(low, starts)
+            result['high'] = np.maximum.reduceat(high, starts)
+            result['volume'] = np.add.reduceat(volume, starts)
+        else:
+            for column in ['low', 'high', 'volume']:
+                result[column] = np.empty(0)
+
+    # Return
+    result['open'] = open_[ends - periods + 1]
     return result
 
 
@@ -429,6 +642,7 @@ def frequency(long_, short_, periods=28, no_zeros=True):
         long_: DataFrame on long time horizon
         short_: DataFrame on short time horizon
         periods: Number of short periods to create a long period
+        no_zeros: Remove rows with zero counts if True
 
     Returns:
         result: DataFrame with count column added
@@ -436,23 +650,17 @@ def frequency(long_, short_, periods=28, no_zeros=True):
     """
     # Initialize key variables
     long = long_.copy()
-    short = short_.copy()
-    counts = {}
-
-    # Count the occurences
-    for _, pointer in enumerate(sorted(long.index.tolist())):
-        indexes = list(range(pointer, pointer - periods, - 1))
-        count = 0
-        for index in sorted(short.index.tolist()):
-            if index in indexes:
-                count += 1
-        counts[pointer] = count
-
-    # Add ocurrences to DataFrame
-    if bool(counts) is True:
-        long['counts'] = counts.values()
-    else:
-        long['counts'] = [0] * len(long)
+    pointers = np.unique(long.index.values)
+    indexes = np.sort(short_.index.values)
+
+    # Count the occurences of short indexes in the 'periods' indexes ending
+    # at each long index
+    counts = np.searchsorted(
+        indexes, pointers, side='right') - np.searchsorted(
+            indexes, pointers - periods, side='right')
+
+    # Add ocurrences to DataFrame in sorted index order
+    long['counts'] = counts
 
     # Remove entries where the count is zero
     if no_zeros is True:
@@ -479,22 +687,21 @@ def stoch(_df, k_period=35, d_period=5):
     df_ = _df.copy()
 
     # Get oscillator
-    oscillator = ta.momentum.StochasticOscillator(
-        high=df_['high'],
-        low=df_['low'],
-        close=df_['close'],
-        n=k_period,
-        d_n=d_period
+    oscillators = oscillator.stochastic(
+        df_['high'].values,
+        df_['low'].values,
+        df_['close'].values,
+        periods=[(k_period, d_period)]
         )
 
     # Add columns to DataFrame
-    df_['k'] = oscillator.stoch()
-    df_['d'] = oscillator.stoch_signal()
+    df_['k'] = oscillators[(k_period, d_period)].k
+    df_['d'] = oscillators[(k_period, d_period)].d
     result = df_[k_period + d_period:]
     return result
 
 
-def recent(_df, secondsago=5184000/2):
+def recent(_df, secondsago=RECENT):
     """Get only the most recent entries in a DataFrame.
 
     Args:
@@ -522,28 +729,29 @@ def recent(_df, secondsago=5184000/2):
 
 
 def sequential(series):
-    """Return a list of occurences in a series.
+    """Return an array of sequential occurences in a series.
+
+    Each value is the number of consecutive entries, up to and including
+    itself, that have the same True / False value.
 
     Args:
         series: pd.series of True / False values
 
     Returns:
-        result: List of sequential occurences
+        result: np.array of sequential occurences aligned to the series
 
     """
     # Initalize key variables
-    result = []
-
-    # Create list of occurences
-    occurences = [int(bool(_) is True) for _ in series.tolist()]
-    duplicate_count = [
-        sum(1 for _ in group) for _, group in groupby(occurences)]
+    occurences = np.asarray(series).astype(bool)
+    positions = np.arange(len(occurences))
 
-    # Create sequential count
-    for count in duplicate_count:
-        result.extend(range(1, count))
-        result.append(count)
+    # Flag the start of each run of identical values
+    starts = np.ones(len(occurences), dtype=bool)
+    starts[1:] = occurences[1:] != occurences[:-1]
 
+    # Subtract the position of the start of each run from the positions
+    result = positions - np.maximum.accumulate(
+        np.where(starts, positions, 0)) + 1
     return result
 
 
@@ -0,0 +1,53 @@
+"""Application module to manage files."""
+
+# Standard imports
+from contextlib import contextmanager
+import os
+import stat
+import tempfile
+
+# The umask of the process. It can only be read by changing it, so it is
+# read once when the module is imported
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic(filepath, mode='wb'):
+    """Write a file so readers only ever see a complete version of it.
+
+    Data is written to a temporary file in the same directory, which then
+    replaces the file. The temporary file is deleted if writing fails.
+
+    The file keeps its permissions. New files get the default permissions
+    of the umask, as if they were created with open().
+
+    Args:
+        filepath: File to write
+        mode: Mode in which to open the file
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    try:
+        permissions = stat.S_IMODE(os.stat(filepath).st_mode)
+    except OSError:
+        permissions = 0o666 & ~_UMASK
+    (descriptor, temporary) = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(filepath)))
+
+    # Write to the temporary file then replace the old one. Temporary files
+    # are only readable by their owner
+    try:
+        with os.fdopen(descriptor, mode) as f_handle:
+            yield f_handle
+            os.fchmod(f_handle.fileno(), permissions)
+        os.replace(temporary, filepath)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
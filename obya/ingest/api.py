@@ -1,39 +1,102 @@
 """Application API module."""
 
 import json
+import os
+import threading
 from collections import namedtuple
-import pytz
 import datetime
 import time
 import re
+import numpy as np
 import pandas as pd
 
 # PIP imports
 import urllib3
 
+# Optional PIP imports
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Application imports
 from obya import Config
+from obya import files
+from obya import log
+from obya.ingest import backfill
 from obya.db.table import data
 
+# Milliseconds since the epoch in bar dates like "/Date(1602486000000)/"
+BARDATE = re.compile(r'\((\d+)\)')
+
+# HTTP statuses of requests for markets that don't exist
+INVALID_MARKET = (400, 404)
+
+# Named tuples
+Metrics = namedtuple(
+    'Metrics', 'requests failures retries logins latency_mean latency_max')
+Response = namedtuple('Response', 'status data')
+
 
 class API():
-    """Class to get API data."""
+    """Class to get API data.
+
+    Connections are kept alive and shared by all threads using the object.
+    Requests that fail because the session expired log in again and are
+    retried once.
 
-    def __init__(self):
+    """
+
+    def __init__(self, base_url=None, maxsize=10, markets=None, timeout=30,
+                 retries=2):
         """Initialize the class.
 
         Args:
-            None
+            base_url: URL of the API. Defaults to that of the configured
+                api_hostname
+            maxsize: Number of connections to keep open for reuse. This
+                should be at least the number of threads using the object.
+                Threads wait for a free connection rather than opening more
+            markets: File in which to cache market IDs. Defaults to a file
+                in the daemon_directory. Only cached in memory if False
+            timeout: Seconds to wait for the API to respond
+            retries: Number of retries of requests that fail to connect or
+                that the API is temporarily unable to answer
 
         Returns:
             None
 
         """
         # Initialize key variables
-        self._http = urllib3.PoolManager()
+        self._http = urllib3.PoolManager(
+            maxsize=maxsize,
+            block=True,
+            timeout=urllib3.Timeout(connect=min(10, timeout), read=timeout),
+            retries=urllib3.Retry(
+                total=retries,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=['GET', 'POST'],
+                raise_on_status=False))
         self._config = Config()
-        self._base_url = 'https://{}/TradingAPI'.format(
-            self._config.api_hostname)
+        self._retry_total = retries
+        self._lock = threading.Lock()
+        self._session_lock = threading.Lock()
+        self._requests = 0
+        self._failures = 0
+        self._retries = 0
+        self._logins = 0
+        self._latency_total = 0
+        self._latency_max = 0
+        if bool(base_url) is True:
+            self._base_url = base_url.rstrip('/')
+        else:
+            self._base_url = 'https://{}/TradingAPI'.format(
+                self._config.api_hostname)
+        if markets is None:
+            markets = os.path.join(
+                self._config.daemon_directory, 'markets.json')
+        self.markets = Markets(markets, self._base_url)
 
         # Get the session key
         self.session_key = self._login()
@@ -45,9 +108,12 @@ class API():
             None
 
         Returns:
-            None
+            session: Session key. None if the login failed
 
         """
+        # Initialize key variables
+        session = None
+
         # Get data
         body = {
             'Password': self._config.api_password,
@@ -58,13 +124,23 @@ class API():
         }
         url = '{}/session'.format(self._base_url)
 
-        _api = self._http.request(
+        _api = self._request(
             'POST', url,
             body=json.dumps(body),
             headers={'Content-Type': 'application/json'}
         )
-        result = json.loads(_api.data.decode())
-        session = result['Session']
+        if _api is not None and _api.status == 200:
+            try:
+                session = _loads(_api.data).get('Session')
+            except (ValueError, AttributeError):
+                pass
+
+        # Update metrics
+        with self._lock:
+            self._logins += 1
+        if session is None:
+            log_message = 'Unable to login to the API at {}'.format(url)
+            log.log2warning(1027, log_message)
         return session
 
     def get(self, uri):
@@ -74,30 +150,134 @@ class API():
             uri: URI to query
 
         Returns:
-            result: Data from API
+            result: Data from API. None if the request failed
+
+        """
+        # Return
+        result = self._get(uri).data
+        return result
+
+    def metrics(self):
+        """Get the request metrics.
+
+        Args:
+            None
+
+        Returns:
+            result: Metrics object. Latencies are in seconds
+
+        """
+        # Return
+        with self._lock:
+            result = Metrics(
+                requests=self._requests,
+                failures=self._failures,
+                retries=self._retries,
+                logins=self._logins,
+                latency_mean=self._latency_total / max(1, self._requests),
+                latency_max=self._latency_max)
+        return result
+
+    def _get(self, uri):
+        """Get data and the HTTP status of the response from the API.
+
+        Args:
+            uri: URI to query
+
+        Returns:
+            result: Response object. The status is None if the request
+                failed without a response, the data None if it failed
 
         """
         # Initialize key variables
-        result = None
+        data_ = None
 
         # Get URI to query
         url = '{}/{}'.format(self._base_url, uri.lstrip('/'))
 
-        # Get data
-        try:
-            _api = self._http.request(
+        # Get data. Login again once if the session has expired
+        for attempt in range(2):
+            session = self.session_key
+            _api = self._request(
                 'GET', url,
                 headers={
-                    'Session': self.session_key,
+                    'Session': str(session),
                     'UserName': self._config.api_username
                 }
             )
-        except:
-            return result
+            if _api is None or _api.status != 401 or bool(attempt) is True:
+                break
+            self._relogin(session)
 
         # Return result
-        if _api.status == 200:
-            result = json.loads(_api.data.decode())
+        if _api is not None and _api.status == 200:
+            try:
+                data_ = _loads(_api.data)
+            except ValueError as error:
+                log_message = 'Invalid API response from {}. Error: {}'.format(
+                    url, error)
+                log.log2warning(1028, log_message)
+        elif _api is not None:
+            log_message = 'API request to {} failed with status {}'.format(
+                url, _api.status)
+            log.log2warning(1030, log_message)
+        result = Response(
+            status=None if _api is None else _api.status, data=data_)
+        return result
+
+    def _relogin(self, session):
+        """Login again unless another thread already has.
+
+        Args:
+            session: Session key that expired
+
+        Returns:
+            None
+
+        """
+        # Login
+        with self._session_lock:
+            if session == self.session_key:
+                self.session_key = self._login()
+
+    def _request(self, method, url, **kwargs):
+        """Make an HTTP request and record its metrics.
+
+        Args:
+            method: HTTP method
+            url: URL to request
+            kwargs: Keyword arguments of urllib3.PoolManager.request
+
+        Returns:
+            result: urllib3.HTTPResponse. None if the request failed
+
+        """
+        # Initialize key variables
+        result = None
+        retries = 0
+        start = time.time()
+
+        # Get data
+        try:
+            result = self._http.request(method, url, **kwargs)
+        except urllib3.exceptions.HTTPError as error:
+            if isinstance(error, urllib3.exceptions.MaxRetryError) is True:
+                retries = self._retry_total
+            log_message = 'API request to {} failed. Error: {}'.format(
+                url, error)
+            log.log2warning(1031, log_message)
+        else:
+            if result.retries is not None:
+                retries = len(result.retries.history)
+        latency = time.time() - start
+
+        # Update metrics
+        with self._lock:
+            self._requests += 1
+            self._failures += int(result is None or result.status != 200)
+            self._retries += retries
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
         return result
 
     def latest(self, pair, timeframe, limit=20):
@@ -150,7 +330,7 @@ class API():
         id_ = self._market_id(pair)
 
         # Return if not found
-        if id_ is False:
+        if id_ is None:
             return result
 
         # Get result
@@ -158,20 +338,44 @@ class API():
 /market/{}/barhistorybetween?interval={}&span={}\
 &fromTimestampUTC={}&toTimestampUTC={}\
 '''.format(id_, meta.interval, meta.span, start, stop)
-        _result = self.get(uri)
-        if bool(_result) is True:
-            result = _convert(_result)
+        response = self._get(uri)
+        if bool(response.data) is True:
+            result = _convert(response.data)
             result = _utc(result)
+        elif response.status in INVALID_MARKET:
+            # Look up the market ID again next time in case it changed.
+            # It is kept after other failures as they may be temporary
+            self.markets.remove(pair)
         return result
 
     def _market_id(self, pair):
         """Get market ID for FX pair.
 
+        Market IDs are searched for once and cached.
+
+        Args:
+            pair: Pair to identify
+
+        Returns:
+            result: Market ID. None if not found
+
+        """
+        # Use the cached value
+        result = self.markets.get(pair)
+        if result is None:
+            result = self._search(pair)
+            if result is not None:
+                self.markets.add(pair, result)
+        return result
+
+    def _search(self, pair):
+        """Search for the market ID of an FX pair.
+
         Args:
             pair: Pair to identify
 
         Returns:
-            result: Market ID
+            result: Market ID. None if not found
 
         """
         # Initialize key variables
@@ -186,7 +390,7 @@ class API():
 market/search?SearchByMarketName=TRUE&Query={}&MaxResults=10'''.format(query)
 
         # Get data
-        results = self.get(uri)
+        results = self.get(uri) or {}
         markets = results.get('Markets')
         if bool(markets) is True:
             for market in markets:
@@ -196,6 +400,97 @@ market/search?SearchByMarketName=TRUE&Query={}&MaxResults=10'''.format(query)
         return result
 
 
+class Markets():
+    """Class to cache market IDs in a file."""
+
+    def __init__(self, filepath, url):
+        """Initialize the class.
+
+        Args:
+            filepath: File in which to cache market IDs. Not saved if None
+            url: URL of the API the market IDs are from
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._filepath = filepath
+        self._url = url
+        self._lock = threading.Lock()
+        self._cache = {}
+
+        # Read the market IDs of all APIs
+        if bool(filepath) is True and os.path.isfile(filepath) is True:
+            try:
+                with open(filepath, 'r') as f_handle:
+                    self._cache = json.load(f_handle)
+            except (ValueError, OSError):
+                self._cache = {}
+        self._cache.setdefault(url, {})
+
+    def get(self, pair):
+        """Get the cached market ID of a pair.
+
+        Args:
+            pair: Pair
+
+        Returns:
+            result: Market ID. None if not cached
+
+        """
+        # Return
+        with self._lock:
+            result = self._cache[self._url].get(pair.upper())
+        return result
+
+    def add(self, pair, id_):
+        """Cache the market ID of a pair.
+
+        Args:
+            pair: Pair
+            id_: Market ID
+
+        Returns:
+            None
+
+        """
+        # Update
+        with self._lock:
+            self._cache[self._url][pair.upper()] = id_
+            self._save()
+
+    def remove(self, pair):
+        """Remove the market ID of a pair from the cache.
+
+        Args:
+            pair: Pair
+
+        Returns:
+            None
+
+        """
+        # Update
+        with self._lock:
+            if self._cache[self._url].pop(pair.upper(), None) is not None:
+                self._save()
+
+    def _save(self):
+        """Save the cache atomically.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Write the file atomically
+        if bool(self._filepath) is True:
+            with files.atomic(self._filepath, mode='w') as f_handle:
+                json.dump(self._cache, f_handle)
+
+
 def _interval_span(timeframe):
     """Get interval and span for lookup.
 
@@ -233,109 +528,183 @@ def _interval_span(timeframe):
 def _convert(data_):
     """Convert data to be compatible with database.
 
+    Each column is read from the price bars straight into a NumPy array.
+
     Args:
         data_: Historical data returned from API
 
     Returns:
-        result: List of dicts
+        result: DataFrame
 
     """
-    # Initialize key variables
-    result = []
-
     # Create a DataFrame from the list of dicts in the result
     items = data_.get('PriceBars')
     if bool(items) is True:
-        for item in items:
-            result.append(
-                {
-                    'open': item['Open'],
-                    'high': item['High'],
-                    'low': item['Low'],
-                    'close': item['Close'],
-                    'volume': 0,
-                    'timestamp': int(int(
-                        re.match(
-                            r'^.*?\((\d+)\).*?$',
-                            item['BarDate']).group(1)
-                    ) / 1000)
-                }
-            )
-        result = pd.DataFrame(result)
+        count = len(items)
+        result = pd.DataFrame(
+            {
+                column: np.fromiter(
+                    (_[key] for _ in items), dtype=np.float64, count=count)
+                for column, key in [
+                    ('open', 'Open'), ('high', 'High'), ('low', 'Low'),
+                    ('close', 'Close')]
+            }
+        )
+        result['volume'] = 0
+        result['timestamp'] = _timestamps([_['BarDate'] for _ in items])
+    else:
+        # Create an empty DataFrame. There are no bars after the latest one
+        result = pd.DataFrame(
+            {_: np.empty(0, dtype=np.float64) for _ in data.COLUMNS})
+    return result
+
+
+def _timestamps(dates):
+    """Convert the BarDates of bars to timestamps.
+
+    Args:
+        dates: List of BarDates
+
+    Returns:
+        result: Array of timestamps
+
+    """
+    # Search all dates at once
+    found = BARDATE.findall(' '.join(dates))
+    if len(found) == len(dates):
+        result = np.array(found, dtype=np.int64) // 1000
+    else:
+        result = pd.Series(dates).str.extract(
+            BARDATE, expand=False).astype(np.int64).values // 1000
+    return result
+
+
+def _loads(payload):
+    """Decode a JSON response body.
+
+    orjson is used if it is installed.
+
+    Args:
+        payload: Bytes of the body
+
+    Returns:
+        result: Decoded data
+
+    """
+    # Return
+    if orjson is None:
+        result = json.loads(payload)
     else:
-        # Create an empty DataFrame
-        result = pd.DataFrame()
+        result = orjson.loads(payload)
     return result
 
 
 def _utc(df_, timezone=None):
     """Convert DataFrame to have UTC timestamps.
 
+    Timestamps are replaced by those of their local time in the timezone
+    as if it were UTC.
+
     Args:
         df_: DataFrame
         timezone: Timezone from which to convert timestamps
 
     Returns:
-        result: List of dicts
+        result: DataFrame
 
     """
     # Initialize key variables
     result = df_.copy()
     if bool(timezone) is False:
         timezone = 'Europe/London'
-    tz_ = pytz.timezone(timezone)
 
     # Convert
-    timestamps = result['timestamp'].tolist()
-    result['timestamp'] = [
-        datetime.datetime.fromtimestamp(_, tz_).replace(
-            tzinfo=datetime.timezone.utc).timestamp() for _ in timestamps]
+    local = pd.to_datetime(
+        result['timestamp'].values, unit='s', utc=True).tz_convert(
+            timezone).tz_localize(None)
+    result['timestamp'] = local.values.astype(
+        'datetime64[s]').astype(np.int64).astype(np.float64)
     return result
 
 
-def ingest(secondsago, verbose=False):
+def ingest(secondsago, verbose=False, concurrency=4, base_url=None,
+           incremental=False):
     """Ingest data from the API into the database.
 
+    Windows of data for all pairs are fetched concurrently. The progress is
+    saved so that an interrupted backfill resumes where it stopped.
+
     Args:
         secondsago: Amount of time to backfill
         verbose: Verbose output if true
+        concurrency: Maximum number of concurrent API requests
+        base_url: URL of the API. Defaults to that of the configured
+            api_hostname
+        incremental: Only fetch the bars after the latest bar in the
+            database if True. Pairs without data are backfilled secondsago
 
     Returns:
-        None
+        result: backfill.Summary object
 
     """
     # Initalize key variables
     timeframe = 14400
-    batch = 3000
     config = Config()
-    timestamps = []
+    filepath = os.path.join(
+        config.daemon_directory, 'backfill_{}.json'.format(timeframe))
+    starts = {}
 
     # Calculate start, start
     stop = int(datetime.datetime.now().replace(
         tzinfo=datetime.timezone.utc).timestamp())
     start = stop - secondsago
 
-    # Get start and stop times
-    items = list(range(start, stop, timeframe * batch))
-    items.append(stop)
-    for index, value in enumerate(items[:-1]):
-        timestamps.append({'start': value, 'stop': items[index + 1]})
-
-    # Get a list of pairs
-    pairs = config.pairs
+    # Start from the latest bar of each pair
+    if bool(incremental) is True:
+        filepath = None
+        starts = backfill.starts(
+            data.latest(config.pairs, timeframe), start, timeframe)
 
     # Ingest data
-    _api = API()
-    for pair in pairs:
-        # Reporting
-        if bool(verbose) is True:
-            print('Processing {}'.format(pair))
-
-        # Process data
-        for timestamp in timestamps:
-            df_ = _api.historical(
-                pair,
-                timeframe,
-                start=timestamp['start'],
-                stop=timestamp['stop'])
-            data.insert(pair, df_)
+    _api = API(base_url=base_url, maxsize=concurrency)
+    result = backfill.Backfill(
+        _api, timeframe=timeframe, concurrency=concurrency,
+        filepath=filepath).run(
+            config.pairs, start, stop, starts=starts,
+            callback=_progress if bool(verbose) is True else None)
+
+    # Reporting
+    if bool(verbose) is True:
+        metrics = _api.metrics()
+        print('''\
+Fetched {} of {} windows ({} already fetched, {} failed), {} rows in \
+{:.1f}s'''.format(
+            result.fetched, result.windows, result.skipped, result.failed,
+            result.rows, result.seconds))
+        print('''\
+Made {} API requests ({} failed, {} retries, {} logins), latency mean \
+{:.3f}s max {:.3f}s'''.format(
+            metrics.requests, metrics.failures, metrics.retries,
+            metrics.logins, metrics.latency_mean, metrics.latency_max))
+    return result
+
+
+def _progress(window, rows):
+    """Print the progress of ingestion.
+
+    Args:
+        window: backfill.Window object
+        rows: Number of rows fetched, None if the fetch failed
+
+    Returns:
+        None
+
+    """
+    # Print
+    print('Processing {} from {} to {}: {}'.format(
+        window.pair,
+        datetime.datetime.utcfromtimestamp(window.start).strftime(
+            '%Y-%m-%d %H:%M'),
+        datetime.datetime.utcfromtimestamp(window.stop).strftime(
+            '%Y-%m-%d %H:%M'),
+        'failed' if rows is None else '{} rows'.format(rows)))
@@ -0,0 +1,311 @@
+"""Application module to backfill API data into the database concurrently."""
+
+# Standard imports
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Application imports
+from obya import files
+from obya import log
+from obya.db.table import data
+
+# Named tuples
+Window = namedtuple('Window', 'pair start stop key')
+Summary = namedtuple('Summary', 'windows skipped fetched failed rows seconds')
+
+
+class Backfill():
+    """Class to fetch windows of API data concurrently and insert them.
+
+    Windows are fetched by a pool of threads. Each window is inserted into
+    the database as soon as it arrives while the others are still being
+    fetched. Failed fetches are retried with exponential backoff.
+
+    """
+
+    def __init__(self, api_, timeframe=14400, batch=3000, concurrency=4,
+                 retries=3, backoff=1, filepath=None):
+        """Initialize the class.
+
+        Args:
+            api_: api.API object
+            timeframe: Timeframe of data
+            batch: Maximum number of bars per window
+            concurrency: Maximum number of concurrent fetches
+            retries: Number of retries of failed fetches
+            backoff: Seconds to wait before the first retry. This doubles
+                with each retry
+            filepath: File in which to save the progress of the backfill so
+                that it can be resumed if interrupted. Not saved if None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._api = api_
+        self.timeframe = timeframe
+        self._batch = batch
+        self._concurrency = max(1, concurrency)
+        self._retries = retries
+        self._backoff = backoff
+        self._state = State(filepath, timeframe)
+
+    def windows(self, pairs, start, stop, starts=None):
+        """Get the windows of data to fetch.
+
+        Windows are aligned to multiples of their duration so that they are
+        the same each time a backfill is resumed.
+
+        Args:
+            pairs: List of pairs
+            start: UTC timestamp start
+            stop: UTC timestamp stop
+            starts: Dict of UTC timestamp starts keyed by pair. These
+                override start for the pairs they contain
+
+        Returns:
+            result: List of Window objects
+
+        """
+        # Initialize key variables
+        result = []
+        duration = self.timeframe * self._batch
+        starts = starts or {}
+
+        # Return
+        for pair in pairs:
+            _start = starts.get(pair, start)
+            for key in range((_start // duration) * duration, stop, duration):
+                result.append(
+                    Window(
+                        pair=pair,
+                        start=max(_start, key),
+                        stop=min(stop, key + duration),
+                        key=key))
+        return result
+
+    def run(self, pairs, start, stop, starts=None, callback=None):
+        """Backfill data.
+
+        Args:
+            pairs: List of pairs
+            start: UTC timestamp start
+            stop: UTC timestamp stop
+            starts: Dict of UTC timestamp starts keyed by pair. These
+                override start for the pairs they contain
+            callback: Function called with each Window and the number of rows
+                fetched, or None if the fetch failed
+
+        Returns:
+            result: Summary object
+
+        """
+        # Initialize key variables
+        began = time.time()
+        windows = self.windows(pairs, start, stop, starts=starts)
+        pending = [_ for _ in windows if self._state.done(_) is False]
+        skipped = len(windows) - len(pending)
+        fetched = 0
+        failed = 0
+        rows = 0
+        futures = {}
+
+        # Limit the fetched windows waiting to be inserted
+        pending.reverse()
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor:
+            while bool(pending) is True or bool(futures) is True:
+                while bool(pending) is True and (
+                        len(futures) < self._concurrency * 2):
+                    window = pending.pop()
+                    futures[executor.submit(self._fetch, window)] = window
+
+                # Insert windows as they arrive
+                (done, _) = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window = futures.pop(future)
+                    df_ = future.result()
+                    if df_ is None:
+                        failed += 1
+                    else:
+                        if df_.empty is False:
+                            data.insert(
+                                window.pair, df_, timeframe=self.timeframe)
+                        self._state.add(window)
+                        fetched += 1
+                        rows += len(df_)
+                    if callback is not None:
+                        callback(window, None if df_ is None else len(df_))
+
+        # Start afresh next time if everything was fetched
+        if bool(failed) is False:
+            self._state.clear()
+
+        # Return
+        result = Summary(
+            windows=len(windows),
+            skipped=skipped,
+            fetched=fetched,
+            failed=failed,
+            rows=rows,
+            seconds=time.time() - began)
+        return result
+
+    def _fetch(self, window):
+        """Fetch a window of data, retrying if it fails.
+
+        Args:
+            window: Window object
+
+        Returns:
+            result: DataFrame or None if the fetch failed
+
+        """
+        # Initialize key variables
+        result = None
+
+        for attempt in range(self._retries + 1):
+            if bool(attempt) is True:
+                time.sleep(self._backoff * 2 ** (attempt - 1))
+            try:
+                result = self._api.historical(
+                    window.pair,
+                    self.timeframe,
+                    start=window.start,
+                    stop=window.stop)
+            except Exception as error:
+                log_message = (
+                    'Unable to fetch {} data from {} to {}. Error: {}'.format(
+                        window.pair, window.start, window.stop, error))
+                log.log2warning(1023, log_message)
+            if result is not None:
+                break
+        return result
+
+
+def starts(latest, start, timeframe):
+    """Get the starts of incremental backfills of pairs.
+
+    The latest bar of each pair is fetched again as stored timestamps are
+    offset from those of the API by api._utc().
+
+    Args:
+        latest: Dict of the latest stored timestamps keyed by pair
+        start: UTC timestamp start of pairs without data
+        timeframe: Timeframe of data
+
+    Returns:
+        result: Dict of UTC timestamp starts keyed by pair
+
+    """
+    # Return
+    result = {
+        pair: max(start, timestamp - timeframe)
+        for pair, timestamp in latest.items()}
+    return result
+
+
+class State():
+    """Class to save the progress of a backfill to a file."""
+
+    def __init__(self, filepath, timeframe):
+        """Initialize the class.
+
+        Args:
+            filepath: File in which to save the progress. Not saved if None
+            timeframe: Timeframe of data
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._filepath = filepath
+        self._timeframe = timeframe
+        self._completed = {}
+
+        # Read the progress of the previous backfill
+        if bool(filepath) is True and os.path.isfile(filepath) is True:
+            try:
+                with open(filepath, 'r') as f_handle:
+                    state = json.load(f_handle)
+            except (ValueError, OSError) as error:
+                log_message = (
+                    'Ignoring unreadable backfill progress file {}. '
+                    'Error: {}'.format(filepath, error))
+                log.log2warning(1024, log_message)
+                state = {}
+            if state.get('timeframe') == timeframe:
+                self._completed = state.get('completed', {})
+
+    def done(self, window):
+        """Determine whether a window was already fetched.
+
+        Args:
+            window: Window object
+
+        Returns:
+            result: True if fetched
+
+        """
+        # Return
+        span = self._completed.get(window.pair, {}).get(str(window.key))
+        result = bool(
+            span is not None and
+            span[0] <= window.start and
+            span[1] >= window.stop)
+        return result
+
+    def add(self, window):
+        """Record that a window was fetched.
+
+        Args:
+            window: Window object
+
+        Returns:
+            None
+
+        """
+        # Update
+        self._completed.setdefault(window.pair, {})[str(window.key)] = [
+            window.start, window.stop]
+        self._save()
+
+    def clear(self):
+        """Delete the progress.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Delete
+        self._completed = {}
+        if bool(self._filepath) is True and os.path.isfile(
+                self._filepath) is True:
+            os.remove(self._filepath)
+
+    def _save(self):
+        """Save the progress atomically.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Return if not saving
+        if bool(self._filepath) is False:
+            return
+
+        # Write the file atomically
+        with files.atomic(self._filepath, mode='w') as f_handle:
+            json.dump(
+                {'timeframe': self._timeframe, 'completed': self._completed},
+                f_handle)
@@ -1,7 +1,22 @@
 """Application ingest module."""
 
+# Standard imports
+import time
+from collections import namedtuple
+
+# PIP3 imports
+import numpy as np
 import pandas as pd
 
+# Application imports
+from obya.db.table import data
+
+# Columns of the files
+COLUMNS = 'day time open high low close volume'.split()
+
+# Named tuples
+Progress = namedtuple('Progress', 'rows position size seconds rate')
+
 
 def ingest(filepath):
     """Ingest data.
@@ -14,21 +29,95 @@ def ingest(filepath):
 
     """
     # Initialize key variables
-    columns = 'day time open high low close volume'
-    df_ = pd.read_csv(filepath, names=columns.split())
+    df_ = pd.read_csv(filepath, names=COLUMNS, dtype=_dtypes())
 
-    # Create the timestamp column
-    df_['timestamp'] = pd.to_datetime(
-        df_['day'] + ':' + df_['time'],
-        format='%Y.%m.%d:%H:%M',
-        utc=True
-        ).astype('int64')//1e9
-
-    # Drop unwanted columns
-    df_ = df_.drop(columns=['time', 'day'])
+    # Return
+    df_ = _convert(df_)
     return df_
 
 
+def chunks(filepath, chunksize=100000):
+    """Ingest data in chunks of rows.
+
+    Args:
+        filepath: File path to read
+        chunksize: Number of rows per chunk
+
+    Yields:
+        df_: Dataframe of the same format as ingest() for each chunk
+
+    """
+    # Read the file
+    with pd.read_csv(
+            filepath, names=COLUMNS, dtype=_dtypes(),
+            chunksize=chunksize) as reader:
+        for df_ in reader:
+            yield _convert(df_)
+
+
+def stream(filepath, pair_, chunksize=100000, callback=None,
+           timeframe=None, insert_chunksize=None):
+    """Insert the data of a file into the database one chunk at a time.
+
+    Only one chunk is in memory at a time, regardless of the size of the
+    file.
+
+    Args:
+        filepath: File path to read
+        pair_: Pair of the data
+        chunksize: Number of rows read from the file per chunk
+        callback: Function called with a Progress object after each chunk
+        timeframe: Timeframe of the data. Defaults to the median difference
+            between the timestamps of the first chunk
+        insert_chunksize: Number of rows inserted per statement. Defaults
+            to the db_insert_chunksize configuration value
+
+    Returns:
+        result: Number of rows read
+
+    """
+    # Initialize key variables
+    result = 0
+    start = time.time()
+
+    with open(filepath, 'rb') as handle:
+        size = handle.seek(0, 2)
+        handle.seek(0)
+
+        # Read the file
+        with pd.read_csv(
+                handle, names=COLUMNS, dtype=_dtypes(),
+                chunksize=chunksize) as reader:
+            for df_ in reader:
+                df_ = _convert(df_)
+
+                # Use the timeframe of the first chunk for all of them as
+                # the last chunk may only have a single row
+                if timeframe is None:
+                    if len(df_) < 2:
+                        raise ValueError(
+                            'Cannot determine the timeframe of {} from a '
+                            'single row. Provide the timeframe or a larger '
+                            'chunksize.'.format(filepath))
+                    timeframe = int(df_['timestamp'].diff().median())
+                data.insert(
+                    pair_, df_, timeframe=timeframe,
+                    chunksize=insert_chunksize)
+                result += len(df_)
+
+                # Report progress
+                if callback is not None:
+                    seconds = time.time() - start
+                    callback(
+                        Progress(
+                            rows=result,
+                            position=handle.tell(),
+                            size=size,
+                            seconds=seconds,
+                            rate=result / max(seconds, 1e-9)))
+    return result
+
+
 def date(_df):
     """Add date column to DataFrame.
 
@@ -45,3 +134,103 @@ def date(_df):
     # Create the timestamp column
     df_['date'] = pd.to_datetime(df_['timestamp'], unit='s', utc=True)
     return df_
+
+
+def _convert(_df):
+    """Convert the day and time columns of file data to a timestamp.
+
+    Args:
+        _df: Dataframe of file data
+
+    Returns:
+        df_: Dataframe with a timestamp column instead
+
+    """
+    # Create the timestamp column
+    df_ = _df.copy()
+    df_['timestamp'] = _timestamps(df_['day'], df_['time'])
+
+    # Drop unwanted columns
+    df_ = df_.drop(columns=['time', 'day'])
+    return df_
+
+
+def _timestamps(days, times):
+    """Convert "%Y.%m.%d" days and "%H:%M" times to UTC timestamps.
+
+    Digits are read directly from fixed width byte strings. Values in other
+    formats are parsed with pd.to_datetime.
+
+    Args:
+        days: pd.Series of days
+        times: pd.Series of times
+
+    Returns:
+        result: Array of float timestamps
+
+    """
+    # Initialize key variables. Use one extra byte to detect longer values
+    digits = np.concatenate(
+        [days.values.astype('S11').view(np.uint8).reshape(-1, 11),
+         times.values.astype('S6').view(np.uint8).reshape(-1, 6)],
+        axis=1).astype(np.int64) - ord('0')
+    numbers = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15]
+
+    # Get the values of each field
+    years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[
+        :, 2] * 10 + digits[:, 3]
+    months = digits[:, 5] * 10 + digits[:, 6]
+    _days = digits[:, 8] * 10 + digits[:, 9]
+    hours = digits[:, 11] * 10 + digits[:, 12]
+    minutes = digits[:, 14] * 10 + digits[:, 15]
+
+    # Convert to days since the epoch
+    with np.errstate(invalid='ignore'):
+        month = (years - 1970).astype('datetime64[Y]') + (
+            months - 1).astype('timedelta64[M]')
+        epoch = month.astype('datetime64[D]') + (
+            _days - 1).astype('timedelta64[D]')
+
+    # Parse values that aren't valid fixed width values with pandas
+    fixed = bool(
+        np.all((digits[:, numbers] >= 0) & (digits[:, numbers] <= 9)) and
+        np.all(digits[:, [4, 7]] == ord('.') - ord('0')) and
+        np.all(digits[:, 13] == ord(':') - ord('0')) and
+        np.all(digits[:, [10, 16]] == -ord('0')) and
+        np.all((months >= 1) & (months <= 12) & (_days >= 1)) and
+        np.all(epoch.astype('datetime64[M]') == month) and
+        np.all((hours < 24) & (minutes < 60))
+    )
+    if fixed is True:
+        result = (
+            epoch.astype(np.int64) * 86400 + hours * 3600 + minutes * 60
+        ).astype(np.float64)
+    else:
+        result = pd.to_datetime(
+            days + ':' + times,
+            format='%Y.%m.%d:%H:%M',
+            utc=True
+            ).astype('int64').values // 1e9
+    return result
+
+
+def _dtypes():
+    """Get the column data types of files.
+
+    Args:
+        None
+
+    Returns:
+        result: Dict of data types keyed by column
+
+    """
+    # Return
+    result = {
+        'day': str,
+        'time': str,
+        'open': np.float64,
+        'high': np.float64,
+        'low': np.float64,
+        'close': np.float64
+    }
+    return result
@@ -0,0 +1,300 @@
+"""Application stochastic oscillator module."""
+
+# Standard imports
+from collections import namedtuple
+
+# PIP3 imports
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Optional PIP3 imports
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Named tuples
+Stochastic = namedtuple('Stochastic', 'k d')
+
+
+def stochastic(high, low, close, periods=((35, 5),)):
+    """Calculate stochastic oscillators for many periods in one pass.
+
+    The rolling minimum and maximum, and therefore the fast stochastic, is
+    calculated once for each unique k_period.
+
+    Values are calculated along the last axis of the arrays.
+
+    Args:
+        high: Array of high values
+        low: Array of low values
+        close: Array of close values
+        periods: List of (k_period, d_period) tuples. k_period is the number
+            of periods for calculating the stochastic, d_period the number
+            of periods of its moving average
+
+    Returns:
+        result: Dict of Stochastic objects keyed by (k_period, d_period).
+            Values are NaN until there is enough data to calculate them.
+
+    """
+    # Initialize key variables
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    fasts = {}
+    result = {}
+
+    for k_period, d_period in periods:
+        # Calculate the fast stochastic once per k_period
+        if k_period not in fasts:
+            lowest = rolling(low, k_period, maximum=False)
+            highest = rolling(high, k_period, maximum=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fasts[k_period] = 100 * (close - lowest) / (highest - lowest)
+
+        # Smooth it to create the slow stochastic
+        fast = fasts[k_period]
+        result[(k_period, d_period)] = Stochastic(
+            k=fast, d=mean(fast, d_period))
+
+    # Return
+    return result
+
+
+def rolling(values, window, maximum=True):
+    """Calculate the rolling maximum or minimum along the last axis.
+
+    Uses a numba compiled monotonic deque if numba is installed, otherwise
+    a numpy sliding window.
+
+    Args:
+        values: Array of float64 values
+        window: Number of values in the window
+        maximum: Calculate the maximum if True, else the minimum
+
+    Returns:
+        result: Array of values. The first 'window - 1' values and those of
+            windows containing NaNs are NaN.
+
+    """
+    # Return
+    values = np.asarray(values, dtype=np.float64)
+    if numba is None:
+        result = _window(values, window, maximum)
+    elif values.ndim == 1:
+        result = _deque_numba(values, window, maximum)
+    else:
+        rows = values.reshape(-1, values.shape[-1])
+        result = np.empty(rows.shape)
+        for pointer, row in enumerate(rows):
+            result[pointer] = _deque_numba(
+                np.ascontiguousarray(row), window, maximum)
+        result = result.reshape(values.shape)
+    return result
+
+
+def mean(values, window):
+    """Calculate the rolling mean along the last axis.
+
+    Args:
+        values: Array of float64 values
+        window: Number of values in the window
+
+    Returns:
+        result: Array of values. The first 'window - 1' values and those of
+            windows containing NaNs are NaN.
+
+    """
+    # Return
+    result = _rows(values, window, True)
+    return result
+
+
+def total(values, window):
+    """Calculate the rolling sum along the last axis.
+
+    Args:
+        values: Array of float64 values
+        window: Number of values in the window
+
+    Returns:
+        result: Array of values. The first 'window - 1' values and those of
+            windows containing NaNs are NaN.
+
+    """
+    # Return
+    result = _rows(values, window, False)
+    return result
+
+
+def _rows(values, window, average):
+    """Calculate the running sum or mean of each row of an array.
+
+    Uses a numba compiled running sum if numba is installed.
+
+    Args:
+        values: Array of float64 values
+        window: Number of values in the window
+        average: Calculate the mean if True, else the sum
+
+    Returns:
+        result: Array of values
+
+    """
+    # Initialize key variables
+    values = np.asarray(values, dtype=np.float64)
+    running = _running if numba is None else _running_numba
+    if values.ndim == 1:
+        return running(values, window, average)
+
+    # Process each row
+    rows = values.reshape(-1, values.shape[-1])
+    result = np.empty(rows.shape)
+    for pointer, row in enumerate(rows):
+        result[pointer] = running(np.ascontiguousarray(row), window, average)
+    result = result.reshape(values.shape)
+    return result
+
+
+def _window(values, window, maximum):
+    """Calculate the rolling maximum or minimum with a sliding window.
+
+    Args:
+        values: Array of float64 values
+        window: Number of values in the window
+        maximum: Calculate the maximum if True, else the minimum
+
+    Returns:
+        result: Array of values
+
+    """
+    # Initialize key variables
+    result = np.full(values.shape, np.nan)
+
+    # Process
+    if values.shape[-1] >= window:
+        windows = sliding_window_view(values, window, axis=-1)
+        if bool(maximum) is True:
+            result[..., window - 1:] = windows.max(axis=-1)
+        else:
+            result[..., window - 1:] = windows.min(axis=-1)
+    return result
+
+
+def _deque(values, window, maximum):
+    """Calculate the rolling maximum or minimum with a monotonic deque.
+
+    The deque holds the positions of values that could still become the
+    extreme value of a window, so each value is added and removed once.
+
+    Args:
+        values: Array of float64 values
+        window: Number of values in the window
+        maximum: Calculate the maximum if True, else the minimum
+
+    Returns:
+        result: Array of values
+
+    """
+    # Initialize key variables
+    size = len(values)
+    result = np.full(size, np.nan)
+    deque = np.empty(size, dtype=np.int64)
+    head = 0
+    tail = 0
+    last_nan = -1
+
+    for pointer in range(size):
+        value = values[pointer]
+
+        # Windows with NaNs are NaN
+        if np.isnan(value):
+            last_nan = pointer
+        else:
+            # Drop values that can no longer be the extreme value
+            while tail > head:
+                previous = values[deque[tail - 1]]
+                if maximum and previous > value:
+                    break
+                if not maximum and previous < value:
+                    break
+                tail -= 1
+            deque[tail] = pointer
+            tail += 1
+
+        # Drop values that have left the window
+        while tail > head and deque[head] <= pointer - window:
+            head += 1
+
+        # Update
+        if pointer >= window - 1 and last_nan <= pointer - window:
+            result[pointer] = values[deque[head]]
+    return result
+
+
+def _running(values, window, average):
+    """Calculate the rolling sum or mean with a running sum.
+
+    Each value is added to the sum when it enters the window and subtracted
+    when it leaves, in the same order as the rolling windows of pandas, so
+    results are identical to those of pandas and ta.
+
+    Args:
+        values: Array of float64 values
+        window: Number of values in the window
+        average: Calculate the mean if True, else the sum
+
+    Returns:
+        result: Array of values
+
+    """
+    # Initialize key variables
+    size = len(values)
+    result = np.full(size, np.nan)
+    total_ = 0.0
+    count = 0
+    negatives = 0
+
+    for pointer in range(size):
+        # Add the value entering the window. NaNs aren't counted
+        value = values[pointer]
+        if not np.isnan(value):
+            total_ += value
+            count += 1
+            if value < 0:
+                negatives += 1
+
+        # Subtract the value leaving the window
+        if pointer >= window:
+            value = values[pointer - window]
+            if not np.isnan(value):
+                total_ -= value
+                count -= 1
+                if value < 0:
+                    negatives -= 1
+
+        # Windows with NaNs are NaN
+        if count < window:
+            continue
+        if not average:
+            result[pointer] = total_
+            continue
+
+        # Means of values with the same sign keep it despite rounding
+        _mean = total_ / count
+        if negatives == 0 and _mean < 0:
+            _mean = 0.0
+        elif negatives == count and _mean > 0:
+            _mean = 0.0
+        result[pointer] = _mean
+    return result
+
+
+# Compile the deque and running sum if numba is installed
+if numba is None:
+    _deque_numba = None
+    _running_numba = None
+else:
+    _deque_numba = numba.njit(cache=True)(_deque)
+    _running_numba = numba.njit(cache=True)(_running)
@@ -1,7 +1,7 @@
 """Application module to manage email formatting."""
 
 import datetime
-from multiprocessing import cpu_count, get_context
+from collections import namedtuple
 from operator import itemgetter
 
 import numpy as np
@@ -11,14 +11,21 @@ import pandas as pd
 from obya.db.table import pair
 from obya.db.table import data
 from obya import evaluate
+from obya import resample
+from obya import workers
+from obya import batch as _batch
 
 
-def reports(timeframe, days=None, width=60):
+def reports(timeframe, days=None, width=60, batch=False, pairs_=None):
     """Create reports.
 
     Args:
         timeframe: Timeframe
         days: Age of report in days
+        width: Width of the separator between pair reports
+        batch: Evaluate all pairs at once in this process if True, else
+            evaluate each pair in the shared pool of worker processes
+        pairs_: Pairs to evaluate. Defaults to all pairs in the database
 
     Returns:
         result: String report
@@ -26,21 +33,15 @@ def reports(timeframe, days=None, width=60):
     """
     # Initialize key variables
     output = []
-    arguments = []
     reporting = []
-    cpus = max(1, cpu_count() - 2)
-
-    # Create argument list for report
-    pairs = pair.pairs()
-    for item in pairs:
-        arguments.append(
-            (item, timeframe, days)
-        )
+    pairs = pair.pairs() if pairs_ is None else pairs_
 
-    # Multiprocess the results
-    with get_context('spawn').Pool(processes=cpus) as pool:
-        reporting = pool.starmap(_report, arguments)
-    pool.join()
+    if bool(batch) is True:
+        # Evaluate all pairs at once
+        reporting = _reports(pairs, timeframe, days=days)
+    else:
+        # Multiprocess the results
+        reporting = _shared_reports(pairs, timeframe, days=days)
 
     # Process non-blank reports
     reporting = [_ for _ in reporting if bool(_) is True]
@@ -71,6 +72,94 @@ def report(_pair, timeframe, days=None):
     return result
 
 
+def _reports(pairs, timeframe, days=None):
+    """Create reports for all pairs at once.
+
+    Args:
+        pairs: Pairs to evaluate
+        timeframe: Timeframe
+        days: Age of report in days
+
+    Returns:
+        result: List of reports
+
+    """
+    # Initialize key variables
+    meta = _parameters(timeframe, days=days)
+    result = []
+
+    # Get data
+    dataframes = resample.dataframes(
+        pairs, timeframe, secondsago=meta.secondsago)
+
+    # Evaluate and create reports
+    evaluations = _batch.Batch(dataframes).evaluate(
+        meta.summary, k_period=meta.k_period, d_period=meta.d_period)
+    for item, result_ in sorted(evaluations.items()):
+        result.append(_result(result_, item, timeframe, meta))
+    return result
+
+
+def _shared_reports(pairs, timeframe, days=None):
+    """Create reports for all pairs in the shared pool of worker processes.
+
+    The data of all pairs is read with a single query and placed in shared
+    memory. Workers only receive the location of their pair's rows.
+
+    Args:
+        pairs: Pairs to evaluate
+        timeframe: Timeframe
+        days: Age of report in days
+
+    Returns:
+        result: List of reports
+
+    """
+    # Initialize key variables
+    meta = _parameters(timeframe, days=days)
+    arguments = []
+    arrays = []
+    result = []
+    stop = 0
+
+    # Get data
+    values = resample.values(pairs, timeframe, secondsago=meta.secondsago)
+    for item in pairs:
+        if item in values:
+            start = stop
+            stop += len(values[item])
+            arrays.append(values[item])
+            arguments.append((item, timeframe, days, start, stop))
+
+    # Evaluate each pair's rows
+    if bool(arrays) is True:
+        with workers.share(np.concatenate(arrays)) as shared:
+            arguments = [_ + (shared,) for _ in arguments]
+            result = workers.shared().starmap(_shared_report, arguments)
+    return result
+
+
+def _shared_report(_pair, timeframe, days, start, stop, shared):
+    """Create report from rows of data in shared memory.
+
+    Args:
+        _pair: Pair to Evaluate
+        timeframe: Timeframe
+        days: Age of report in days
+        start: First row of the pair's data
+        stop: Row after the last row of the pair's data
+        shared: workers.Shared object of the data of all pairs
+
+    Returns:
+        result: Dict of pair and report. Empty if there is nothing to report
+
+    """
+    # Return
+    df_ = data.frame(workers.read(shared, start=start, stop=stop))
+    result = _report(_pair, timeframe, days=days, dataframe=df_)
+    return result
+
+
 def _report(_pair, timeframe, days=None, dataframe=None):
     """Create reports.
 
@@ -84,10 +173,73 @@ def _report(_pair, timeframe, days=None, dataframe=None):
 
     """
     # Initialize key variables
+    meta = _parameters(timeframe, days=days)
+    result = {}
+
+    # Process data
+    if isinstance(dataframe, pd.DataFrame) is False:
+        df_ = resample.dataframe(
+            _pair, timeframe, secondsago=meta.secondsago)
+    else:
+        df_ = dataframe.copy()
+
+    if df_.empty is False:
+        result_ = evaluate.evaluate(
+            df_, meta.summary, k_period=meta.k_period, d_period=meta.d_period)
+        result = _result(result_, _pair, timeframe, meta)
+
+    # Return
+    return result
+
+
+def _result(_df, _pair, timeframe, meta):
+    """Create report from an evaluated DataFrame.
+
+    Args:
+        _df: DataFrame created by evaluate.evaluate()
+        _pair: Pair corresponding to DataFrame
+        timeframe: Timeframe
+        meta: Meta object created by _parameters()
+
+    Returns:
+        result: Dict of pair and report. Empty if there is nothing to report
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Drop all rows that are older than days
+    result_ = evaluate.recent(
+        _df, secondsago=(meta.secondsago - meta.offset))
+
+    # Create report
+    if result_.empty is False:
+        result = {
+            'pair': _pair,
+            'report': formatter(result_, _pair, timeframe=timeframe)
+        }
+
+    # Return
+    return result
+
+
+def _parameters(timeframe, days=None):
+    """Get the evaluation parameters of reports.
+
+    Args:
+        timeframe: Timeframe
+        days: Age of report in days
+
+    Returns:
+        result: Meta object
+
+    """
+    # Initialize key variables
+    Meta = namedtuple(
+        'Meta', 'k_period d_period summary secondsago offset')
     k_period = 35
     d_period = 5
     summary = 29
-    result = {}
 
     # Account for giving enough extra time for calculating the stochastic
     # for the summarized timeframe.
@@ -101,27 +253,13 @@ def _report(_pair, timeframe, days=None, dataframe=None):
         # for the summarized timeframe.
         secondsago = (days * 86400) + offset
 
-    # Process data
-    if isinstance(dataframe, pd.DataFrame) is False:
-        df_ = data.dataframe(_pair, timeframe, secondsago=secondsago)
-    else:
-        df_ = dataframe.copy()
-
-    if df_.empty is False:
-        result_ = evaluate.evaluate(
-            df_, summary, k_period=k_period, d_period=d_period)
-
-        # Drop all rows that are older than days
-        result_ = evaluate.recent(result_, secondsago=(secondsago - offset))
-
-        # Create report
-        if result_.empty is False:
-            result = {
-                'pair': _pair,
-                'report': formatter(result_, _pair, timeframe=timeframe)
-            }
-
     # Return
+    result = Meta(
+        k_period=k_period,
+        d_period=d_period,
+        summary=summary,
+        secondsago=secondsago,
+        offset=offset)
     return result
 
 
@@ -186,6 +324,8 @@ def formatter(_df, _pair, timeframe=14400):
         df_ = df_.sort_values(by=['timestamp'], ascending=False)
 
         # Drop unwanted columns. Reset index to 'date'
+        if 'date' not in df_.columns:
+            df_['date'] = data.dates(df_['timestamp'].values)
         df_ = df_.drop(columns=drops.split())
         df_.set_index('date', inplace=True)
 
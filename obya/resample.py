@@ -0,0 +1,346 @@
+"""Application module to derive higher timeframes from stored base bars.
+
+Timeframes that are multiples of the resample_base configuration value
+are aggregated from the bars of the base timeframe instead of being read
+from the database. Bars start at multiples of the timeframe after the
+resample_origin configuration value, so it sets the start of sessions.
+The default origin of 345600 is Monday 1970-01-05 00:00 UTC, so daily bars
+start at midnight UTC and weekly bars on Mondays.
+
+Aggregated bars are the same as the stored bars of other timeframes, so
+the latest bar may not be complete yet.
+
+"""
+
+# Standard imports
+from collections import OrderedDict, namedtuple
+import threading
+
+# PIP libraries
+import numpy as np
+
+# Application imports
+from obya.db.table import data
+from obya import Config
+
+# Maximum number of resampled arrays cached by each process
+SIZE = 256
+
+# Resampled arrays cached by the process
+_CACHE = OrderedDict()
+_LOCK = threading.Lock()
+
+# Named tuples
+Snapshot = namedtuple('Snapshot', 'dataframe latest')
+
+
+def dataframe(pair_, timeframe, secondsago=None, base=None, origin=None):
+    """Get the data of a pair.
+
+    Args:
+        pair_: pair
+        timeframe: Timeframe of data
+        secondsago: Number of seconds in the past for valid data
+        base: Base timeframe. Defaults to the resample_base configuration
+            value
+        origin: UTC timestamp of the start of a bar. Defaults to the
+            resample_origin configuration value
+
+    Returns:
+        result: pd.Dataframe. The same as that returned by data.dataframe()
+
+    """
+    # Return
+    result = snapshot(
+        pair_, timeframe, secondsago=secondsago, base=base,
+        origin=origin).dataframe
+    return result
+
+
+def snapshot(pair_, timeframe, secondsago=None, base=None, origin=None):
+    """Get the data of a pair and the latest timestamp it was read with.
+
+    Data may be read through the local store, which can be older than the
+    database, so the latest timestamp identifies the version of the data.
+
+    Args:
+        pair_: pair
+        timeframe: Timeframe of data
+        secondsago: Number of seconds in the past for valid data
+        base: Base timeframe. Defaults to the resample_base configuration
+            value
+        origin: UTC timestamp of the start of a bar. Defaults to the
+            resample_origin configuration value
+
+    Returns:
+        result: Snapshot object. The latest timestamp of the stored bars
+            read, as returned by latest(), is None if none were read
+
+    """
+    # Initialize key variables
+    (base, origin) = _settings(base, origin)
+
+    # Read stored timeframes
+    if resampled(timeframe, base) is False:
+        result = _snapshot(
+            data.dataframe(pair_, timeframe, secondsago=secondsago))
+        return result
+
+    # Return
+    df_ = data.dataframe(pair_, base, secondsago=secondsago)
+    result = _snapshot(
+        data.frame(
+            _resample(
+                (pair_.lower(), timeframe, base, origin),
+                df_[data.COLUMNS].values,
+                timeframe,
+                origin,
+                data._start(secondsago))),
+        stored=df_)
+    return result
+
+
+def dataframes(pairs_, timeframe, secondsago=None, base=None, origin=None):
+    """Get the data of many pairs.
+
+    Args:
+        pairs_: List of pairs
+        timeframe: Timeframe of data
+        secondsago: Number of seconds in the past for valid data
+        base: Base timeframe. Defaults to the resample_base configuration
+            value
+        origin: UTC timestamp of the start of a bar. Defaults to the
+            resample_origin configuration value
+
+    Returns:
+        result: Dict of pd.Dataframes keyed by pair. The same as those
+            returned by data.dataframes()
+
+    """
+    # Initialize key variables
+    arrays = values(
+        pairs_, timeframe, secondsago=secondsago, base=base, origin=origin)
+    empty = np.empty((0, len(data.COLUMNS)))
+
+    # Return
+    result = {_: data.frame(arrays.get(_, empty)) for _ in pairs_}
+    return result
+
+
+def values(pairs_, timeframe, secondsago=None, base=None, origin=None):
+    """Get the data of many pairs as arrays.
+
+    Args:
+        pairs_: List of pairs
+        timeframe: Timeframe of data
+        secondsago: Number of seconds in the past for valid data
+        base: Base timeframe. Defaults to the resample_base configuration
+            value
+        origin: UTC timestamp of the start of a bar. Defaults to the
+            resample_origin configuration value
+
+    Returns:
+        result: Dict of 2D float64 arrays of data.COLUMNS sorted by
+            timestamp, keyed by pair. The same as those returned by
+            data.values()
+
+    """
+    # Initialize key variables
+    (base, origin) = _settings(base, origin)
+
+    # Read stored timeframes
+    if resampled(timeframe, base) is False:
+        result = data.values(pairs_, timeframe, secondsago=secondsago)
+        return result
+
+    # Return
+    arrays = data.values(pairs_, base, secondsago=secondsago)
+    start = data._start(secondsago)
+    result = {
+        item: _resample(
+            (item.lower(), timeframe, base, origin),
+            array, timeframe, origin, start)
+        for item, array in arrays.items()}
+    return result
+
+
+def latest(pairs_, timeframe, base=None):
+    """Get the latest timestamp of the stored bars of many pairs.
+
+    This changes whenever the resampled bars of a pair change.
+
+    Args:
+        pairs_: List of pairs
+        timeframe: Timeframe of data
+        base: Base timeframe. Defaults to the resample_base configuration
+            value
+
+    Returns:
+        result: Dict of latest timestamps keyed by pair. The same as that
+            returned by data.latest()
+
+    """
+    # Initialize key variables
+    (base, _) = _settings(base, 0)
+
+    # Return
+    if resampled(timeframe, base) is True:
+        timeframe = base
+    result = data.latest(pairs_, timeframe)
+    return result
+
+
+def resampled(timeframe, base):
+    """Determine whether a timeframe is derived from base bars.
+
+    Args:
+        timeframe: Timeframe of data
+        base: Base timeframe. None if nothing is derived
+
+    Returns:
+        result: True if derived
+
+    """
+    # Return
+    result = bool(
+        bool(base) is True and
+        timeframe != base and
+        timeframe % base == 0)
+    return result
+
+
+def aggregate(values_, timeframe, origin=0):
+    """Aggregate bars into bars of a higher timeframe.
+
+    Args:
+        values_: 2D array of data.COLUMNS
+        timeframe: Timeframe of the aggregated bars
+        origin: UTC timestamp of the start of an aggregated bar
+
+    Returns:
+        result: 2D float64 array of data.COLUMNS sorted by timestamp. The
+            timestamp of each bar is its start. Bars without data are
+            excluded
+
+    """
+    # Initialize key variables
+    values_ = np.asarray(values_, dtype=np.float64).reshape(
+        -1, len(data.COLUMNS))
+    if bool(values_.shape[0]) is False:
+        return np.empty((0, len(data.COLUMNS)))
+    if bool(np.all(values_[1:, 0] >= values_[:-1, 0])) is False:
+        values_ = values_[np.argsort(values_[:, 0], kind='stable')]
+
+    # Find the rows starting and ending each bar
+    buckets = np.floor_divide(values_[:, 0] - origin, timeframe)
+    starts = np.flatnonzero(
+        np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    stops = np.append(starts[1:], values_.shape[0]) - 1
+
+    # Return
+    result = np.empty((starts.size, len(data.COLUMNS)))
+    result[:, 0] = buckets[starts] * timeframe + origin
+    result[:, 1] = values_[starts, 1]
+    result[:, 2] = np.maximum.reduceat(values_[:, 2], starts)
+    result[:, 3] = np.minimum.reduceat(values_[:, 3], starts)
+    result[:, 4] = values_[stops, 4]
+    result[:, 5] = np.add.reduceat(values_[:, 5], starts)
+    return result
+
+
+def _resample(key, values_, timeframe, origin, start):
+    """Aggregate bars, reusing the result of previous identical requests.
+
+    Args:
+        key: Tuple identifying the aggregated bars
+        values_: 2D array of data.COLUMNS sorted by timestamp
+        timeframe: Timeframe of the aggregated bars
+        origin: UTC timestamp of the start of an aggregated bar
+        start: Starting timestamp of the base bars. Aggregated bars that
+            start earlier are excluded as they may not be complete. The
+            latest bar is included even if it isn't complete yet
+
+    Returns:
+        result: 2D float64 array of data.COLUMNS. Don't modify it as it is
+            cached
+
+    """
+    # Initialize key variables
+    values_ = np.asarray(values_, dtype=np.float64).reshape(
+        -1, len(data.COLUMNS))
+
+    # Base bars are never updated, so they are identified by their count
+    # and the timestamps of the first and last one
+    if bool(values_.shape[0]) is True:
+        version = (values_.shape[0], values_[0, 0], values_[-1, 0])
+    else:
+        version = (0,)
+
+    # Use the cached bars
+    with _LOCK:
+        (_version, bars) = _CACHE.get(key, (None, None))
+        if _version == version:
+            _CACHE.move_to_end(key)
+
+    # Aggregate, caching the bars and deleting the least recently used
+    if _version != version:
+        bars = aggregate(values_, timeframe, origin=origin)
+        bars.flags.writeable = False
+        with _LOCK:
+            _CACHE[key] = (version, bars)
+            _CACHE.move_to_end(key)
+            while len(_CACHE) > SIZE:
+                _CACHE.popitem(last=False)
+
+    # Return. Bars are only cached before excluding those before start, as
+    # the same base bars can be read with different starts
+    result = bars[np.searchsorted(bars[:, 0], start):]
+    return result
+
+
+def _snapshot(df_, stored=None):
+    """Create a Snapshot of data.
+
+    Args:
+        df_: pd.Dataframe of the data
+        stored: pd.Dataframe of the stored bars it was created from.
+            Defaults to df_
+
+    Returns:
+        result: Snapshot object
+
+    """
+    # Initialize key variables
+    stored = df_ if stored is None else stored
+
+    # Return
+    if stored.empty is True:
+        latest_ = None
+    else:
+        latest_ = int(stored['timestamp'].values[-1])
+    result = Snapshot(dataframe=df_, latest=latest_)
+    return result
+
+
+def _settings(base, origin):
+    """Get the resampling settings.
+
+    Args:
+        base: Base timeframe. Defaults to the resample_base configuration
+            value if None
+        origin: UTC timestamp of the start of a bar. Defaults to the
+            resample_origin configuration value if None
+
+    Returns:
+        result: Tuple of (base, origin)
+
+    """
+    # Read the configuration only when needed
+    if base is None or origin is None:
+        config = Config()
+        base = config.resample_base if base is None else base
+        origin = config.resample_origin if origin is None else origin
+
+    # Return
+    result = (base, origin)
+    return result
@@ -3,19 +3,27 @@
 from obya import OBYA_API_SITE_PREFIX
 
 
-def stoch(pair, periods=None):
+def stoch(pair, periods=None, columns=False):
     """Return URL for showing chart pages.
 
     Args:
         pair: Pair to be viewed
         periods: Number of periods for summarization
+        columns: Get the data as a dict of columns instead of a list of rows
 
     Returns:
         result: URL
 
     """
+    # Initialize key variables
+    arguments = []
+    if bool(periods) and isinstance(periods, int):
+        arguments.append('periods={}'.format(periods))
+    if bool(columns) is True:
+        arguments.append('format=columns')
+
     # Return
     result = '{}/stoch/{}'.format(OBYA_API_SITE_PREFIX, pair)
-    if bool(periods) and isinstance(periods, int):
-        result = '{}?periods={}'.format(result, periods)
+    if bool(arguments) is True:
+        result = '{}?{}'.format(result, '&'.join(arguments))
     return result
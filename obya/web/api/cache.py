@@ -0,0 +1,190 @@
+"""Application module to cache web API responses."""
+
+# Standard imports
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+# Application imports
+from obya import files
+
+# Named tuples
+Stats = namedtuple('Stats', 'pid hits misses entries')
+
+
+class Cache():
+    """Class to cache responses in files shared by all worker processes.
+
+    Each response is saved with the version of the data it was created
+    from. Responses are stale once the version changes or they are older
+    than the time to live. The least recently used responses are deleted
+    when there are too many of them.
+
+    """
+
+    def __init__(self, directory, ttl=300, size=256):
+        """Initialize the class.
+
+        Args:
+            directory: Directory in which to save responses
+            ttl: Seconds for which responses are valid
+            size: Maximum number of responses to keep
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.directory = directory
+        self._ttl = ttl
+        self._size = size
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        # Create the directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key, version):
+        """Get a response.
+
+        Args:
+            key: Tuple identifying the response
+            version: Version of the data the response must be created from
+
+        Returns:
+            result: Bytes of the response. None if not cached or stale
+
+        """
+        # Initialize key variables
+        result = None
+        filepath = self._filepath(key)
+
+        # Read the response
+        try:
+            with open(filepath, 'rb') as f_handle:
+                meta = json.loads(f_handle.readline())
+                if bool(
+                        meta.get('version') == version and
+                        meta.get('created', 0) + self._ttl > time.time()):
+                    result = f_handle.read()
+        except (OSError, ValueError):
+            pass
+
+        # Mark the response as recently used
+        if result is not None:
+            try:
+                os.utime(filepath)
+            except OSError:
+                pass
+
+        # Update stats
+        with self._lock:
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return result
+
+    def set(self, key, version, payload):
+        """Save a response.
+
+        Args:
+            key: Tuple identifying the response
+            version: Version of the data the response was created from
+            payload: Bytes of the response
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        meta = json.dumps({'version': version, 'created': time.time()})
+
+        # Write the file atomically
+        with files.atomic(self._filepath(key)) as f_handle:
+            f_handle.write(meta.encode())
+            f_handle.write(b'\n')
+            f_handle.write(payload)
+
+        # Delete the least recently used responses
+        self._evict()
+
+    def stats(self):
+        """Get the cache statistics of this process.
+
+        Args:
+            None
+
+        Returns:
+            result: Stats object
+
+        """
+        # Return
+        with self._lock:
+            result = Stats(
+                pid=os.getpid(),
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._entries()))
+        return result
+
+    def _evict(self):
+        """Delete the least recently used responses over the size limit.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Find the oldest responses
+        entries = []
+        for filepath in self._entries():
+            try:
+                entries.append((os.path.getmtime(filepath), filepath))
+            except OSError:
+                continue
+
+        # Delete them
+        for _, filepath in sorted(entries)[:max(0, len(entries) - self._size)]:
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+
+    def _entries(self):
+        """Get the files of the cached responses.
+
+        Args:
+            None
+
+        Returns:
+            result: List of file paths
+
+        """
+        # Return
+        result = [
+            os.path.join(self.directory, _)
+            for _ in os.listdir(self.directory) if _.endswith('.response')]
+        return result
+
+    def _filepath(self, key):
+        """Get the file of a response.
+
+        Args:
+            key: Tuple identifying the response
+
+        Returns:
+            result: File path
+
+        """
+        # Return
+        result = os.path.join(
+            self.directory, '{}.response'.format(
+                hashlib.sha1(repr(key).encode()).hexdigest()))
+        return result
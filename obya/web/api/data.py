@@ -1,20 +1,41 @@
 """Application routes - API data."""
 
+# Standard imports
+import json
+import os
+
 # PIP libraries
-from flask import Blueprint, request, jsonify
+import numpy as np
+from flask import Blueprint, Response, request, jsonify
+
+# Optional PIP libraries
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Application imports
-from obya.db.table import data
+from obya.web.api.cache import Cache
 from obya import evaluate
+from obya import resample
+from obya import Config
 
 # Define the various global variables
 OBYA_API = Blueprint('OBYA_API', __name__)
 
+# Response cache of the process
+_CACHE = None
+
 
 @OBYA_API.route('/stoch/<pair_>')
 def stoch(pair_):
     """Provide data from the Data table.
 
+    The data is a list of {'k', 'd', 'date'} rows by default, or a single
+    {'date': [...], 'k': [...], 'd': [...]} dict of columns if the 'format'
+    argument is 'columns'. Responses are cached until the pair gets a new
+    bar.
+
     Args:
         pair_: Currency pair
 
@@ -22,43 +43,220 @@ def stoch(pair_):
         None
 
     """
-    # Return
+    # Initialize key variables
     pair = pair_.lower()
-    timeframe = 14400
-    results = []
-    rounding = 2
-
     periods_ = request.args.get('periods')
     if bool(periods_) is True:
         periods = int(periods_)
     else:
-        periods = periods_
+        periods = None
     timeframe = int(request.args.get('timeframe', 14400))
+    columnar = bool(request.args.get('format') == 'columns')
+    key = (pair, timeframe, periods, columnar)
+
+    # Use the cached response if the pair has no new data. Responses are
+    # saved with the version of the data they were created from, which may
+    # be older than the database if it was read through the local store
+    payload = _cache().get(key, resample.latest([pair], timeframe).get(pair))
+    if payload is None:
+        (payload, version) = _payload(pair, timeframe, periods, columnar)
+        _cache().set(key, version, payload)
+
+    # Return
+    return Response(payload, mimetype='application/json')
+
+
+@OBYA_API.route('/cache')
+def cache_stats():
+    """Provide the response cache statistics of the worker process.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Return
+    return jsonify(_cache().stats()._asdict())
 
-    # Get data
-    df_ = data.dataframe(pair, timeframe)
+
+def _payload(pair, timeframe, periods, columnar):
+    """Create the response of stoch().
+
+    Args:
+        pair: Currency pair
+        timeframe: Timeframe
+        periods: Number of periods for summarization. None if not
+            summarizing
+        columnar: Create a dict of columns if True, else a list of rows
+
+    Returns:
+        result: Tuple of JSON bytes and the latest timestamp of the data
+            they were created from
+
+    """
+    # Initialize key variables
+    timestamps = np.array([], dtype=np.int64)
+    k_values = np.array([], dtype=np.float64)
+    d_values = np.array([], dtype=np.float64)
+    rounding = 2
+
+    # Get only the data needed for the recent entries
+    snapshot = resample.snapshot(
+        pair, timeframe, secondsago=lookback(timeframe, periods=periods))
+    df_ = snapshot.dataframe
     if df_.empty is False:
         if bool(periods) is True:
             result_ = evaluate.summary(df_, periods=periods)
             result_ = evaluate.stoch(result_)
             result_ = evaluate.recent(result_)
-            k_values = result_['k'].values.tolist()
-            d_values = result_['d'].values.tolist()
-            timestamps = result_['timestamp'].values.tolist()
         else:
             result_ = evaluate.stoch(df_)
             result_ = evaluate.recent(result_)
-            k_values = result_['k'].values.tolist()
-            d_values = result_['d'].values.tolist()
-            timestamps = result_['timestamp'].values.tolist()
-
-        # Get data to plot
-        for pointer, timestamp in enumerate(timestamps):
-            results.append(
-                {
-                    'k': round(k_values[pointer], rounding),
-                    'd': round(d_values[pointer], rounding),
-                    'date': timestamp
-                }
-            )
-    return jsonify(results)
+        if result_.empty is False:
+            k_values = result_['k'].values
+            d_values = result_['d'].values
+            timestamps = result_['timestamp'].values
+
+    # Get data to plot
+    if columnar is True:
+        payload = columns(timestamps, k_values, d_values, rounding=rounding)
+    else:
+        payload = jsonify(
+            rows(timestamps, k_values, d_values, rounding=rounding)
+            ).get_data()
+    result = (payload, snapshot.latest)
+    return result
+
+
+def lookback(timeframe, periods=None, k_period=35, d_period=5,
+             secondsago=evaluate.RECENT):
+    """Get the age of the data needed to chart recent stochastic values.
+
+    Each recent entry needs the 'k_period + d_period' entries before it,
+    and each summarized entry is made from 'periods' rows of data.
+
+    Args:
+        timeframe: Timeframe
+        periods: Number of periods for summarization. None if not
+            summarizing
+        k_period: Periods for calculating Stochastic slow indicator
+        d_period: Moving Average periods for smoothing Stochastic to create
+            the fast indicator
+        secondsago: Age of the recent entries
+
+    Returns:
+        result: Age in seconds of the oldest row of data needed
+
+    """
+    # Initialize key variables
+    rows = (k_period + d_period + 1) * (periods or 1)
+
+    # Markets close on weekends and holidays, so the rows span more time.
+    # Allow for two closed days per five open and an extra week of holidays
+    result = int(secondsago + rows * timeframe * 7 / 5 + 7 * 86400)
+    return result
+
+
+def _cache():
+    """Get the response cache of the process.
+
+    Args:
+        None
+
+    Returns:
+        result: cache.Cache object
+
+    """
+    # Initialize key variables
+    global _CACHE
+
+    # Create the cache once
+    if _CACHE is None:
+        config = Config()
+        _CACHE = Cache(
+            os.path.join(config.daemon_directory, 'cache', 'stoch'),
+            ttl=config.web_cache_ttl)
+    result = _CACHE
+    return result
+
+
+def rows(timestamps, k_values, d_values, rounding=2):
+    """Create a list of rows of stochastic values.
+
+    Args:
+        timestamps: Array of timestamps
+        k_values: Array of stochastic K values
+        d_values: Array of stochastic D values
+        rounding: Number of decimal places of values
+
+    Returns:
+        result: List of {'k', 'd', 'date'} dicts
+
+    """
+    # Return
+    result = [
+        {
+            'k': round(k_, rounding),
+            'd': round(d_, rounding),
+            'date': timestamp
+        } for timestamp, k_, d_ in zip(
+            np.asarray(timestamps).tolist(),
+            np.asarray(k_values).tolist(),
+            np.asarray(d_values).tolist())
+    ]
+    return result
+
+
+def columns(timestamps, k_values, d_values, rounding=2):
+    """Serialize columns of stochastic values to JSON.
+
+    Arrays are serialized directly by orjson if it is installed. NaN values
+    are serialized as null.
+
+    Args:
+        timestamps: Array of timestamps
+        k_values: Array of stochastic K values
+        d_values: Array of stochastic D values
+        rounding: Number of decimal places of values
+
+    Returns:
+        result: JSON bytes of a {'date', 'k', 'd'} dict of lists
+
+    """
+    # Initialize key variables
+    values = {
+        'date': np.ascontiguousarray(timestamps, dtype=np.int64),
+        'k': np.round(np.asarray(k_values, dtype=np.float64), rounding),
+        'd': np.round(np.asarray(d_values, dtype=np.float64), rounding)
+    }
+
+    # Serialize
+    if orjson is not None:
+        result = orjson.dumps(values, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        result = json.dumps(
+            {key: _list(value) for key, value in values.items()},
+            separators=(',', ':')).encode()
+    return result
+
+
+def _list(values):
+    """Convert an array to a list with None instead of NaN values.
+
+    Args:
+        values: Array
+
+    Returns:
+        result: List
+
+    """
+    # Return
+    if values.dtype.kind == 'f':
+        nans = np.isnan(values)
+        if bool(nans.any()) is True:
+            values = values.astype(object)
+            values[nans] = None
+    result = values.tolist()
+    return result
@@ -98,7 +98,7 @@ def _data(pair, timeframe, periods=None):
     # Initialize key variables
     rows = []
     y_axis = 'Percent'
-    url = api.stoch(pair, periods=periods)
+    url = api.stoch(pair, periods=periods, columns=True)
 
     # Create subheadings
     h1_ = pair.upper()
@@ -52,6 +52,14 @@
       if (error) throw error;
       // https://bl.ocks.org/jqadrad/a58719d82741b1642a2061c071ae2375
 
+      // Convert columns of data to a list of rows
+      if (!Array.isArray(data)) {
+        var columns = data;
+        data = columns.date.map(function(date, index) {
+          return {k: columns.k[index], d: columns.d[index], date: date};
+        });
+      }
+
       // Get the labels for the line charts based on the very
       // first dictionary in the list
       standard_colors.domain(d3.keys(data[0]).filter(function(key) {
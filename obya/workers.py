@@ -0,0 +1,243 @@
+"""Application module to manage a persistent pool of worker processes."""
+
+# Standard imports
+import atexit
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import multiprocessing
+
+# PIP3 imports
+import numpy as np
+
+# Modules imported by the forkserver before creating worker processes
+PRELOAD = ['obya.evaluate', 'obya.db']
+
+# Named tuples
+Metrics = namedtuple(
+    'Metrics',
+    'processes submitted completed failed pending latency_mean latency_max')
+Shared = namedtuple('Shared', 'name shape dtype')
+
+# Pool shared by all callers in the process
+_WORKERS = None
+_LOCK = threading.Lock()
+
+
+class Workers():
+    """Class to manage a long lived pool of pre-warmed worker processes.
+
+    Workers are forked from a forkserver that has already imported the
+    PRELOAD modules, so they don't each pay for importing pandas or
+    creating the obya.db engine. Workers are never recycled, so their
+    database connections are reused across tasks.
+
+    """
+
+    def __init__(self, processes=None, preload=None):
+        """Initialize the class.
+
+        Args:
+            processes: Number of worker processes
+            preload: List of modules to import before creating workers
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.processes = processes or max(1, multiprocessing.cpu_count() - 2)
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._latency_total = 0
+        self._latency_max = 0
+
+        # Use a forkserver where available
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(
+                PRELOAD if preload is None else preload)
+        else:
+            context = multiprocessing.get_context('spawn')
+        self._pool = context.Pool(processes=self.processes)
+
+    def starmap(self, function, arguments, chunksize=None):
+        """Apply a function to each tuple of arguments.
+
+        Args:
+            function: Function to run. Must be importable by the workers
+            arguments: List of argument tuples
+            chunksize: Number of tasks sent to a worker at a time. Defaults to
+                a quarter of the tasks per worker
+
+        Returns:
+            result: List of results in the order of the arguments
+
+        """
+        # Initialize key variables
+        tasks = [(function, tuple(_)) for _ in arguments]
+        result = []
+        if chunksize is None:
+            chunksize = max(1, math.ceil(len(tasks) / (self.processes * 4)))
+
+        # Update metrics
+        with self._lock:
+            self._submitted += len(tasks)
+
+        # Process results as they arrive. Tasks that don't complete because
+        # one of them raised an exception are counted as failed
+        try:
+            for value, latency in self._pool.imap(
+                    _run, tasks, chunksize=chunksize):
+                with self._lock:
+                    self._completed += 1
+                    self._latency_total += latency
+                    self._latency_max = max(self._latency_max, latency)
+                result.append(value)
+        finally:
+            with self._lock:
+                self._failed += len(tasks) - len(result)
+        return result
+
+    def metrics(self):
+        """Get the pool metrics.
+
+        Args:
+            None
+
+        Returns:
+            result: Metrics object. Latencies are in seconds
+
+        """
+        # Return
+        with self._lock:
+            result = Metrics(
+                processes=self.processes,
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                pending=self._submitted - self._completed - self._failed,
+                latency_mean=(
+                    self._latency_total / max(1, self._completed)),
+                latency_max=self._latency_max)
+        return result
+
+    def close(self):
+        """Stop the worker processes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop
+        self._pool.terminate()
+        self._pool.join()
+
+
+def shared(processes=None):
+    """Get the pool of worker processes shared by the process.
+
+    The pool is created on first use and is stopped when the process exits.
+
+    Args:
+        processes: Number of worker processes if the pool is created
+
+    Returns:
+        result: Workers object
+
+    """
+    # Initialize key variables
+    global _WORKERS
+
+    # Create the pool once per process
+    with _LOCK:
+        if _WORKERS is None or _WORKERS.pid != os.getpid():
+            _WORKERS = Workers(processes=processes)
+            atexit.register(_WORKERS.close)
+        result = _WORKERS
+    return result
+
+
+@contextmanager
+def share(array):
+    """Copy an array to shared memory for the duration of the context.
+
+    Workers read the array with read() using the yielded Shared object,
+    which is small enough to pass as a task argument.
+
+    Args:
+        array: NumPy array
+
+    Yields:
+        result: Shared object
+
+    """
+    # Initialize key variables
+    array = np.ascontiguousarray(array)
+    memory = shared_memory.SharedMemory(
+        create=True, size=max(1, array.nbytes))
+
+    # Copy the array, then free the memory when done
+    try:
+        np.ndarray(
+            array.shape, dtype=array.dtype, buffer=memory.buf)[:] = array
+        yield Shared(
+            name=memory.name, shape=array.shape, dtype=array.dtype.str)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def read(shared, start=None, stop=None):
+    """Read rows of an array shared by share().
+
+    Args:
+        shared: Shared object
+        start: First row to read
+        stop: Row to stop reading at
+
+    Returns:
+        result: Copy of the rows of the array
+
+    """
+    # Initialize key variables
+    memory = shared_memory.SharedMemory(name=shared.name)
+
+    # Copy the rows so that the memory can be closed
+    try:
+        array = np.ndarray(shared.shape, dtype=shared.dtype, buffer=memory.buf)
+        result = array[start:stop].copy()
+        del array
+    finally:
+        memory.close()
+    return result
+
+
+def _run(task):
+    """Run a task in a worker process.
+
+    Args:
+        task: Tuple of function and tuple of arguments
+
+    Returns:
+        result: Tuple of the function result and its duration in seconds
+
+    """
+    # Initialize key variables
+    (function, arguments) = task
+
+    # Return
+    start = time.time()
+    value = function(*arguments)
+    result = (value, time.time() - start)
+    return result
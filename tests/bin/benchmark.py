@@ -0,0 +1,843 @@
+#!/usr/bin/env python3
+"""Script to benchmark obya functions against their previous versions.
+
+The previous versions are kept in this script so that the speedup of each
+change can be measured on the same data.
+
+"""
+
+from __future__ import print_function
+import os
+import sys
+import time
+import argparse
+import json
+import re
+from datetime import datetime, timezone as dt_timezone
+from itertools import groupby
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+from flask import Flask, Response, jsonify
+from sqlalchemy import and_, create_engine
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import StaticPool
+
+# Try to create a working PYTHONPATH
+DEV_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(DEV_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}bin'.format(os.sep)
+if DEV_DIR.endswith(_EXPECTED) is True:
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application libraries
+from tests.libraries import dataset
+from tests.libraries import stub
+from obya import evaluate
+from obya.db import db
+from obya.db.models import Data
+from obya.db.table import data
+from obya.db.table import pair
+from obya.ingest import api
+from obya.ingest import backfill
+from obya.web.api import data as web_data
+
+
+def main():
+    """Run the benchmarks.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Set up parser
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='mode')
+
+    # Parse "evaluate"
+    _parser = subparsers.add_parser(
+        'evaluate', help='Benchmark evaluate.ls_evaluate.')
+    _parser.add_argument(
+        '--pairs', type=int, default=28, help='Number of pairs. Default: 28')
+    _parser.add_argument(
+        '--days', type=int, default=365, help='Days of bars. Default: 365')
+    _parser.add_argument(
+        '--timeframe', type=int, default=14400,
+        help='Timeframe of bars. Default: 14400')
+
+    # Parse "sequential"
+    _parser = subparsers.add_parser(
+        'sequential', help='Benchmark evaluate.sequential.')
+    _parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Number of runs per size. Default: 5')
+
+    # Parse "insert"
+    _parser = subparsers.add_parser(
+        'insert', help='Benchmark db.table.data.insert.')
+    _parser.add_argument(
+        '--rows', type=int, default=50000,
+        help='Number of rows to insert. Default: 50000')
+    _parser.add_argument(
+        '--chunksize', type=int, default=10000,
+        help='Number of rows per INSERT statement. Default: 10000')
+    _parser.add_argument(
+        '--mysql', action='store_true',
+        help='Use the configured database instead of an in memory SQLite '
+        'database.')
+
+    # Parse "backfill"
+    _parser = subparsers.add_parser(
+        'backfill', help='Benchmark ingest.api.ingest with a stub API.')
+    _parser.add_argument(
+        '--days', type=int, default=3650,
+        help='Days of bars to backfill. Default: 3650')
+    _parser.add_argument(
+        '--latency', type=float, default=0.2,
+        help='Seconds the stub API takes to answer. Default: 0.2')
+    _parser.add_argument(
+        '--concurrency', type=int, default=4,
+        help='Maximum number of concurrent API requests. Default: 4')
+
+    # Parse "convert"
+    _parser = subparsers.add_parser(
+        'convert',
+        help='Benchmark ingest.api._loads, ingest.api._convert and '
+        'ingest.api._utc.')
+    _parser.add_argument(
+        '--rows', type=int, default=100000,
+        help='Number of price bars. Default: 100000')
+
+    # Parse "web"
+    _parser = subparsers.add_parser(
+        'web', help='Benchmark the serialization of web.api.data.stoch.')
+    _parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Number of runs per size. Default: 5')
+
+    # Parse "read"
+    _parser = subparsers.add_parser(
+        'read', help='Benchmark db.table.data.dataframe.')
+    _parser.add_argument(
+        '--mysql', action='store_true',
+        help='Use the configured database instead of an in memory SQLite '
+        'database.')
+
+    # Parse "summary"
+    _parser = subparsers.add_parser(
+        'summary', help='Benchmark evaluate.summary.')
+    _parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Number of runs per size. Default: 5')
+
+    # Run
+    args = parser.parse_args()
+    if args.mode == 'evaluate':
+        _evaluate(args.pairs, args.days, args.timeframe)
+    elif args.mode == 'backfill':
+        _backfill(args.days, args.latency, args.concurrency)
+    elif args.mode == 'insert':
+        _insert(args.rows, args.chunksize, mysql=args.mysql)
+    elif args.mode == 'sequential':
+        _sequential(args.repeat)
+    elif args.mode == 'convert':
+        _convert(args.rows)
+    elif args.mode == 'web':
+        _web(args.repeat)
+    elif args.mode == 'read':
+        _read(mysql=args.mysql)
+    elif args.mode == 'summary':
+        _summary(args.repeat)
+    else:
+        parser.print_help()
+        sys.exit(2)
+
+
+def _evaluate(pairs, days, timeframe):
+    """Benchmark evaluate.ls_evaluate.
+
+    Args:
+        pairs: Number of pairs
+        days: Days of bars per pair
+        timeframe: Timeframe of bars
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    k_period = 35
+    d_period = 5
+    periods = 29
+    rows = (days * 86400) // timeframe
+    durations = {'append': 0, 'accumulator': 0, 'previous': 0, 'current': 0}
+
+    print('Evaluating {} pairs of {} bars'.format(pairs, rows))
+    for seed in range(pairs):
+        df_ = dataset.ohlc(rows, timeframe=timeframe, seed=seed)
+
+        # Get the long term matches for each short term timestamp
+        s_term = evaluate.Evaluate(
+            df_, k_period=k_period, d_period=d_period).either()
+        incremental = evaluate.Incremental(
+            df_, periods, k_period=k_period, d_period=d_period)
+        temp_longs = [
+            incremental.evaluate(_) for _ in s_term['timestamp'].tolist()]
+
+        # Time accumulating the matches
+        start = time.time()
+        _append(temp_longs)
+        durations['append'] += time.time() - start
+
+        start = time.time()
+        columns = df_.dtypes.to_dict()
+        columns.update({'k': float, 'd': float})
+        accumulator = evaluate.Accumulator(columns, len(df_))
+        for temp_long in temp_longs:
+            accumulator.add(temp_long)
+        accumulator.dataframe()
+        durations['accumulator'] += time.time() - start
+
+        # Time the evaluation as a whole
+        start = time.time()
+        _ls_evaluate(df_, periods, k_period=k_period, d_period=d_period)
+        durations['previous'] += time.time() - start
+
+        start = time.time()
+        evaluate.ls_evaluate(
+            df_, periods, k_period=k_period, d_period=d_period)
+        durations['current'] += time.time() - start
+
+    # Report
+    _report('Accumulation', durations['append'], durations['accumulator'])
+    _report('ls_evaluate', durations['previous'], durations['current'])
+
+
+def _sequential(repeat):
+    """Benchmark evaluate.sequential.
+
+    Args:
+        repeat: Number of runs per size
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    generator = np.random.default_rng(0)
+
+    for rows in [10000, 100000, 1000000]:
+        # Create stochastic matches similar to those of Either._process
+        series = pd.Series(generator.random(rows) * 100)
+        matches = series.where(series >= 90, other=False)
+
+        # Time the versions
+        durations = {'previous': 0, 'current': 0}
+        for _ in range(repeat):
+            start = time.time()
+            _list_sequential(matches)
+            durations['previous'] += time.time() - start
+
+            start = time.time()
+            evaluate.sequential(matches)
+            durations['current'] += time.time() - start
+
+        # Report
+        _report(
+            'sequential {}'.format(rows),
+            durations['previous'] / repeat, durations['current'] / repeat)
+
+
+def _summary(repeat):
+    """Benchmark evaluate.summary.
+
+    Args:
+        repeat: Number of runs per size
+
+    Returns:
+        None
+
+    """
+    # Compile numba functions before timing
+    evaluate.summary(dataset.ohlc(100), periods=29, crawling=True)
+
+    for rows in [10000, 100000, 1000000]:
+        df_ = dataset.ohlc(rows)
+        for crawling in [False, True]:
+            # Time the versions
+            durations = {'previous': 0, 'current': 0}
+            for _ in range(repeat):
+                start = time.time()
+                _rolling_summary(df_, periods=29, crawling=crawling)
+                durations['previous'] += time.time() - start
+
+                start = time.time()
+                evaluate.summary(df_, periods=29, crawling=crawling)
+                durations['current'] += time.time() - start
+
+            # Report
+            _report(
+                'summary {} {}'.format(
+                    'crawl' if crawling is True else 'block', rows),
+                durations['previous'] / repeat,
+                durations['current'] / repeat)
+
+
+def _insert(rows, chunksize, mysql=False):
+    """Benchmark db.table.data.insert.
+
+    Args:
+        rows: Number of rows to insert
+        chunksize: Number of rows per INSERT statement
+        mysql: Use the configured database if True
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    df_ = dataset.ohlc(rows)
+    durations = {}
+
+    # Use a SQLite database with the same tables
+    if bool(mysql) is False:
+        _sqlite()
+
+    # Time the versions on new pairs
+    print('Inserting {} rows'.format(rows))
+    for version, function in [('previous', _orm_insert), ('current', None)]:
+        pair_ = dataset.random_string()
+        start = time.time()
+        if function is None:
+            data.insert(pair_, df_, chunksize=chunksize)
+        else:
+            function(pair_, df_)
+        durations[version] = time.time() - start
+        print('{:<20} {:>12.0f} rows/s'.format(
+            version, rows / max(durations[version], 1e-9)))
+
+    # Report
+    _report('insert', durations['previous'], durations['current'])
+
+
+def _backfill(days, latency, concurrency):
+    """Benchmark ingest.api.ingest against a local stub of the API.
+
+    Args:
+        days: Days of bars to backfill
+        latency: Seconds the stub waits before answering bar requests
+        concurrency: Maximum number of concurrent API requests
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    pairs = ['AUDUSD', 'EURUSD', 'NZDUSD', 'USDJPY', 'GBPUSD', 'USDCAD']
+    durations = {}
+    stop = int(time.time())
+    start = stop - days * 86400
+    _sqlite()
+
+    # Time the versions
+    server = stub.Server(markets=pairs, latency=latency)
+    server.start()
+    print('Backfilling {} days of {} pairs'.format(days, len(pairs)))
+    for version, _concurrency in [('serial', 1), ('concurrent', concurrency)]:
+        summary = backfill.Backfill(
+            api.API(
+                base_url=server.url, maxsize=_concurrency, markets=False),
+            concurrency=_concurrency).run(pairs, start, stop)
+        durations[version] = summary.seconds
+        print('{:<20} {:>12.0f} rows/s'.format(
+            version, summary.rows / max(summary.seconds, 1e-9)))
+    server.stop()
+
+    # Report
+    _report('backfill', durations['serial'], durations['concurrent'])
+
+
+def _convert(rows):
+    """Benchmark the decoding of API price bars to a DataFrame.
+
+    Args:
+        rows: Number of price bars
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    payload = json.dumps({
+        'PriceBars': [
+            {'BarDate': '/Date({})/'.format((1262304000 + _ * 3600) * 1000),
+             'Open': 1.3, 'High': 1.4, 'Low': 1.2, 'Close': 1.35}
+            for _ in range(rows)]}).encode()
+    durations = {}
+    results = {}
+
+    # Time the versions
+    print('Decoding and converting {} price bars. orjson: {}'.format(
+        rows, api.orjson is not None))
+    for version, loads, convert, utc in [
+            ('previous', _list_loads, _list_convert, _list_utc),
+            ('current', api._loads, api._convert, api._utc)]:
+        start = time.time()
+        results[version] = utc(convert(loads(payload)))
+        durations[version] = time.time() - start
+
+    # Report
+    print('Results are the same: {}'.format(
+        results['previous'].equals(results['current'])))
+    _report('convert', durations['previous'], durations['current'])
+
+
+def _list_loads(payload):
+    """Decode a JSON response body the way it was done previously.
+
+    Args:
+        payload: Bytes of the body
+
+    Returns:
+        result: Decoded data
+
+    """
+    # Return
+    result = json.loads(payload.decode())
+    return result
+
+
+def _list_convert(data_):
+    """Convert API price bars to a DataFrame the way it was done previously.
+
+    Args:
+        data_: Historical data returned from API
+
+    Returns:
+        result: DataFrame
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Parse each bar
+    for item in data_.get('PriceBars'):
+        result.append(
+            {
+                'open': item['Open'],
+                'high': item['High'],
+                'low': item['Low'],
+                'close': item['Close'],
+                'volume': 0,
+                'timestamp': int(int(
+                    re.match(
+                        r'^.*?\((\d+)\).*?$',
+                        item['BarDate']).group(1)
+                ) / 1000)
+            }
+        )
+    result = pd.DataFrame(result)
+    return result
+
+
+def _list_utc(df_, timezone='Europe/London'):
+    """Convert timestamps to UTC the way it was done previously.
+
+    Args:
+        df_: DataFrame
+        timezone: Timezone from which to convert timestamps
+
+    Returns:
+        result: DataFrame
+
+    """
+    # Convert each timestamp
+    result = df_.copy()
+    tz_ = ZoneInfo(timezone)
+    result['timestamp'] = [
+        datetime.fromtimestamp(_, tz_).replace(
+            tzinfo=dt_timezone.utc).timestamp()
+        for _ in result['timestamp'].tolist()]
+    return result
+
+
+def _web(repeat):
+    """Benchmark the serialization of web.api.data.stoch responses.
+
+    Args:
+        repeat: Number of runs per size
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    generator = np.random.default_rng(0)
+    app = Flask(__name__)
+
+    for points in [10000, 100000]:
+        timestamps = 1514764800 + np.arange(points) * 14400
+        k_values = generator.random(points) * 100
+        d_values = generator.random(points) * 100
+
+        # Time the versions
+        durations = {'previous': 0, 'current': 0}
+        for _ in range(repeat):
+            with app.app_context():
+                start = time.time()
+                previous = _list_stoch(timestamps, k_values, d_values)
+                durations['previous'] += time.time() - start
+
+                start = time.time()
+                current = Response(
+                    web_data.columns(timestamps, k_values, d_values),
+                    mimetype='application/json').get_data()
+                durations['current'] += time.time() - start
+
+        # Report
+        print('{} points: {} bytes previously, {} bytes now'.format(
+            points, len(previous), len(current)))
+        _report(
+            'web {}'.format(points),
+            durations['previous'] / repeat, durations['current'] / repeat)
+
+
+def _list_stoch(timestamps, k_values, d_values, rounding=2):
+    """Serialize stochastic values the way web.api.data.stoch previously did.
+
+    Args:
+        timestamps: Array of timestamps
+        k_values: Array of stochastic K values
+        d_values: Array of stochastic D values
+        rounding: Number of decimal places of values
+
+    Returns:
+        result: Bytes of the response
+
+    """
+    # Initialize key variables
+    results = []
+    k_values = k_values.tolist()
+    d_values = d_values.tolist()
+    timestamps = timestamps.tolist()
+
+    # Get data to plot
+    for pointer, timestamp in enumerate(timestamps):
+        results.append(
+            {
+                'k': round(k_values[pointer], rounding),
+                'd': round(d_values[pointer], rounding),
+                'date': timestamp
+            }
+        )
+    result = jsonify(results).get_data()
+    return result
+
+
+def _read(mysql=False):
+    """Benchmark db.table.data.dataframe.
+
+    Args:
+        mysql: Use the configured database if True
+
+    Returns:
+        None
+
+    """
+    # Use a SQLite database with the same tables
+    if bool(mysql) is False:
+        _sqlite()
+
+    for rows in [100000, 1000000]:
+        # Insert minute bars of a new pair
+        pair_ = dataset.random_string()
+        data.insert(pair_, dataset.ohlc(rows, timeframe=60), timeframe=60)
+
+        # Time the versions
+        durations = {}
+        for version, function in [
+                ('previous', _orm_dataframe), ('current', data.dataframe)]:
+            start = time.time()
+            function(pair_, 60)
+            durations[version] = time.time() - start
+            print('{:<20} {:>12.0f} rows/s'.format(
+                version, rows / max(durations[version], 1e-9)))
+
+        # Report
+        _report(
+            'read {}'.format(rows),
+            durations['previous'], durations['current'])
+
+
+def _orm_dataframe(pair_, timeframe):
+    """Read Data table rows the way data.dataframe previously did.
+
+    Args:
+        pair_: pair
+        timeframe: Timeframe of data
+
+    Returns:
+        df_: pd.Dataframe retrieved
+
+    """
+    # Initialize key variables
+    rows = []
+    columns = 'timestamp date open high low close volume'
+    idx_pair = pair.exists(pair_)
+
+    # Get name from database
+    with db.db_query(1006) as session:
+        rows = session.query(
+            Data.timestamp,
+            Data.open,
+            Data.high,
+            Data.low,
+            Data.close,
+            Data.volume,
+            ).filter(
+                and_(
+                    Data.timeframe == timeframe,
+                    Data.idx_pair == idx_pair,
+                    Data.timestamp >= 0
+                )
+            )
+
+    # Populate lookup list
+    df_ = pd.DataFrame(
+        [(row.timestamp,
+          time.strftime('%Y-%m-%d %H:%M %a', time.gmtime(row.timestamp)),
+          row.open,
+          row.high,
+          row.low,
+          row.close,
+          row.volume
+          ) for row in rows],
+        columns=columns.split())
+    return df_
+
+
+def _sqlite():
+    """Use an in memory SQLite database with the obya tables.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Create the tables
+    engine = create_engine(
+        'sqlite://', connect_args={'check_same_thread': False},
+        poolclass=StaticPool)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE ob_pair (idx INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'pair BLOB UNIQUE, ts_modified DATETIME, ts_created DATETIME)')
+        connection.exec_driver_sql(
+            'CREATE TABLE ob_data (idx_pair INTEGER, timeframe INTEGER, '
+            'open FLOAT, high FLOAT, low FLOAT, close FLOAT, volume FLOAT, '
+            'timestamp BIGINT, ts_modified DATETIME, ts_created DATETIME, '
+            'PRIMARY KEY (idx_pair, timestamp, timeframe))')
+    db.POOL = scoped_session(sessionmaker(bind=engine))
+
+
+def _orm_insert(pair_, df_):
+    """Insert data the way data.insert previously did.
+
+    Args:
+        pair_: pair
+        df_: pd.Dataframe to insert
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    rows = []
+    lookups = []
+    timeframe = int(
+        (df_['timestamp'][1:] - df_['timestamp'].shift()[1:]).median()
+    )
+    start = int(df_['timestamp'].min())
+    stop = int(df_['timestamp'].max())
+
+    # Get the index for the pair
+    pair.insert(pair_)
+    idx_pair = pair.exists(pair_)
+
+    # Get existing timestamps
+    with db.db_query(1004) as session:
+        items = session.query(Data.timestamp).filter(
+            and_(
+                Data.timeframe == timeframe,
+                Data.idx_pair == idx_pair,
+                Data.timestamp >= start,
+                Data.timestamp <= stop
+            )
+        )
+    for item in items:
+        lookups.append(int(item.timestamp))
+
+    # Insert one ORM object per row
+    for _, row in df_.iterrows():
+        if int(row['timestamp']) in lookups:
+            continue
+        rows.append(
+            Data(
+                timeframe=timeframe,
+                idx_pair=idx_pair,
+                timestamp=int(row['timestamp']),
+                open=float(row['open']),
+                high=float(row['high']),
+                low=float(row['low']),
+                close=float(row['close']),
+                volume=int(row['volume'])
+            )
+        )
+    with db.db_modify(1032) as session:
+        session.add_all(rows)
+
+
+def _list_sequential(series):
+    """Return a list of occurences in a series the way it was done previously.
+
+    Args:
+        series: pd.series of True / False values
+
+    Returns:
+        result: List of sequential occurences
+
+    """
+    # Initalize key variables
+    result = []
+
+    # Create list of occurences
+    occurences = [int(bool(_) is True) for _ in series.tolist()]
+    duplicate_count = [
+        sum(1 for _ in group) for _, group in groupby(occurences)]
+
+    # Create sequential count
+    for count in duplicate_count:
+        result.extend(range(1, count))
+        result.append(count)
+
+    return result
+
+
+def _rolling_summary(_df, periods=5, crawling=False):
+    """Summarize a DataFrame the way evaluate.summary previously did.
+
+    Args:
+        _df: pd.DataFrame
+        periods: Number of previous periods to include in summarization
+        crawling: Summarize every row if True
+
+    Returns:
+        result: Modified DataFrame
+
+    """
+    # Initialize key variables
+    df_ = _df.copy()
+    df_['low'] = df_['low'].rolling(periods).min()
+    df_['high'] = df_['high'].rolling(periods).max()
+    df_['volume'] = df_['volume'].rolling(periods).sum()
+    df_['open'] = df_['open'].shift(periods - 1)
+
+    # Return
+    result = df_[periods - 1:]
+    if bool(crawling) is False:
+        result = result[::-periods].iloc[::-1]
+    return result
+
+
+def _report(title, previous, current):
+    """Print benchmark result.
+
+    Args:
+        title: Title of benchmark
+        previous: Duration of previous version
+        current: Duration of current version
+
+    Returns:
+        None
+
+    """
+    # Print
+    print(
+        '{:<20} previous: {:>9.3f}s  current: {:>9.3f}s  speedup: {:>8.1f}x'
+        ''.format(title, previous, current, previous / max(current, 1e-9)))
+
+
+def _append(temp_longs):
+    """Accumulate DataFrames the way ls_evaluate previously did.
+
+    Args:
+        temp_longs: List of DataFrames
+
+    Returns:
+        l_term: DataFrame
+
+    """
+    # Initialize key variables
+    lt_index = []
+    l_term = pd.DataFrame()
+
+    for temp_long in temp_longs:
+        temp_indx = temp_long.index.tolist()
+        for index in temp_indx:
+            if index not in lt_index:
+                # DataFrame.append was removed in pandas 2.0
+                l_term = pd.concat(
+                    [l_term, pd.DataFrame(temp_long.loc[index]).T])
+        lt_index.extend(temp_indx)
+    return l_term
+
+
+def _ls_evaluate(_df, periods, k_period=35, d_period=5):
+    """Evaluate data the way ls_evaluate previously did.
+
+    Args:
+        _df: Short term DataFrame to analyse
+        periods: Number of periods per long term timeframe
+        k_period: Periods for calculating Stochastic slow indicator
+        d_period: Moving Average periods for smoothing Stochastic to create
+            the fast indicator
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    df_ = _df.copy()
+    temp_longs = []
+
+    # Evaluate DataFrame
+    s_term = evaluate.Evaluate(
+        df_, k_period=k_period, d_period=d_period).either()
+
+    # Summarize the data up to each timestamp
+    for timestamp in s_term['timestamp'].tolist():
+        temp_data = df_[df_['timestamp'] <= timestamp]
+        temp_summ = evaluate.summary(temp_data, periods=periods)
+        temp_longs.append(
+            evaluate.Evaluate(
+                temp_summ, k_period=k_period, d_period=d_period).difference(
+                    limit=4))
+
+    # Return
+    l_term = _append(temp_longs)
+    return (s_term, l_term)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 """Module to create datasets for unittesting."""
 
 import pandas as pd
+import numpy as np
 import random
 import string
 
@@ -45,6 +46,38 @@ def dataset():
     return result
 
 
+def ohlc(rows, timeframe=14400, start=1514764800, seed=0):
+    """Create random walk OHLC dataset for testing.
+
+    Args:
+        rows: Number of rows
+        timeframe: Timeframe of each row in seconds
+        start: Timestamp of the first row
+        seed: Random number generator seed
+
+    Returns:
+        result: Testing DataFrame
+
+    """
+    # Initialize key variables
+    generator = np.random.default_rng(seed)
+
+    # Create prices
+    close = 100 + np.cumsum(generator.normal(0, 0.25, rows))
+    open_ = np.concatenate(([100], close[:-1]))
+    spread = np.abs(generator.normal(0, 0.15, (2, rows)))
+    data = {
+        'open': open_.round(3),
+        'high': (np.maximum(open_, close) + spread[0]).round(3),
+        'low': (np.minimum(open_, close) - spread[1]).round(3),
+        'close': close.round(3),
+        'volume': generator.integers(1000, 30000, rows),
+        'timestamp': start + np.arange(rows) * timeframe
+    }
+    result = pd.DataFrame(data=data)
+    return result
+
+
 def random_string(length=20):
     """Create random string for testing.
 
@@ -0,0 +1,199 @@
+"""Module with a local stub of the trading API for unittesting."""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class Server():
+    """Class to serve a stub of the trading API in a thread.
+
+    Bars are generated for every timeframe between the requested
+    timestamps. Market IDs are the position of the pair in the list of
+    markets plus one.
+
+    """
+
+    def __init__(self, markets=None, latency=0, failures=0, error=500,
+                 published=None):
+        """Initialize the class.
+
+        Args:
+            markets: List of pairs the API knows about
+            latency: Seconds to wait before answering bar history requests
+            failures: Number of bar history requests that fail before they
+                succeed
+            error: HTTP status of failed bar history requests
+            published: Timestamp of the latest bar returned. All bars are
+                returned if None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.markets = markets or ['AUDUSD', 'EURUSD', 'NZDUSD']
+        self.latency = latency
+        self.failures = failures
+        self.error = error
+        self.published = published
+        self.requests = Counter()
+        self.sessions = ['session-1']
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _handler(self))
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        """Get the base URL of the API.
+
+        Args:
+            None
+
+        Returns:
+            result: URL
+
+        """
+        # Return
+        result = 'http://127.0.0.1:{}/TradingAPI'.format(
+            self._server.server_address[1])
+        return result
+
+    def start(self):
+        """Start serving.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Start
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, method, path, headers):
+        """Create a response to a request.
+
+        Args:
+            method: HTTP method
+            path: Path of the request including the query
+            headers: Request headers
+
+        Returns:
+            result: Tuple of HTTP status and body
+
+        """
+        # Initialize key variables
+        parsed = urlparse(path)
+        query = {_: values[0] for _, values in parse_qs(parsed.query).items()}
+        uri = parsed.path.replace('/TradingAPI/', '')
+        endpoint = re.sub(r'\d+', '{}', uri)
+        with self._lock:
+            self.requests[endpoint] += 1
+            count = self.requests[endpoint]
+
+        # Login
+        if method == 'POST' and uri == 'session':
+            return (200, {'Session': self.sessions[-1]})
+
+        # Everything else needs the latest session
+        if headers.get('Session') != self.sessions[-1]:
+            return (401, {'ErrorMessage': 'Session is not valid'})
+
+        # Search for markets
+        if uri == 'market/search':
+            result = []
+            for pointer, market in enumerate(self.markets):
+                name = '{}/{}'.format(market[:3], market[3:])
+                if name == query.get('Query'):
+                    result.append({'Name': name, 'MarketId': pointer + 1})
+            return (200, {'Markets': result})
+
+        # Get bars
+        if endpoint == 'market/{}/barhistorybetween':
+            time.sleep(self.latency)
+            if count <= self.failures:
+                return (self.error, {})
+            if int(uri.split('/')[1]) > len(self.markets):
+                return (404, {'ErrorMessage': 'Market not found'})
+            span = int(query['span']) * {
+                'MINUTE': 60,
+                'HOUR': 3600,
+                'DAY': 86400,
+                'WEEK': 604800}[query['interval']]
+            start = -(-int(query['fromTimestampUTC']) // span) * span
+            stop = int(query['toTimestampUTC'])
+            if self.published is not None:
+                stop = min(stop, self.published + 1)
+            bars = [
+                {
+                    'BarDate': '/Date({})/'.format(_ * 1000),
+                    'Open': 1.0 + _ % 7 / 100,
+                    'High': 1.1 + _ % 7 / 100,
+                    'Low': 0.9 + _ % 7 / 100,
+                    'Close': 1.05 + _ % 7 / 100
+                } for _ in range(start, stop, span)]
+            return (200, {'PriceBars': bars})
+        return (404, {})
+
+
+def _handler(server):
+    """Create a request handler class for a Server.
+
+    Args:
+        server: Server object
+
+    Returns:
+        result: BaseHTTPRequestHandler class
+
+    """
+    class Handler(BaseHTTPRequestHandler):
+        """Class to handle requests."""
+
+        # Keep connections alive
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            """Handle GET requests."""
+            self._respond('GET')
+
+        def do_POST(self):
+            """Handle POST requests."""
+            length = int(self.headers.get('Content-Length', 0))
+            self.rfile.read(length)
+            self._respond('POST')
+
+        def log_message(self, *args):
+            """Don't log requests."""
+
+        def _respond(self, method):
+            """Send the response."""
+            (status, body) = server.respond(method, self.path, self.headers)
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
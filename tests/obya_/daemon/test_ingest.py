@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the daemon ingest module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_{0}daemon'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from tests.libraries import stub
+from obya.daemon import ingest
+from obya.daemon.ingest import AgentIngest
+from obya.db.table import data
+from obya import Config
+
+
+class TestAgentIngest(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_poll(self):
+        """Testing method / function poll."""
+        # Initialize key variables
+        pairs = Config().pairs
+        server = stub.Server(markets=pairs)
+        server.start()
+        agent = AgentIngest(
+            'obya_ingestd_test', timeframe=86400, days=30,
+            base_url=server.url)
+
+        # All pairs receive new bars the first time
+        result = agent.poll()
+        self.assertEqual(result, pairs)
+        latest = data.latest(pairs, 86400)
+        self.assertEqual(sorted(latest.keys()), sorted(pairs))
+
+        # Nothing is new the next time. The API session is reused
+        result = agent.poll()
+        server.stop()
+        self.assertEqual(result, [])
+        self.assertEqual(data.latest(pairs, 86400), latest)
+        self.assertEqual(server.requests['session'], 1)
+
+    def test_query(self):
+        """Testing method / function query."""
+        # Initialize key variables
+        agent = AgentIngest('obya_ingestd_test', report_days=10)
+        calls = []
+
+        def _fail():
+            raise RuntimeError('poll')
+
+        def _reports(timeframe, days=None, pairs_=None):
+            calls.append((timeframe, days, pairs_))
+            raise RuntimeError('reports')
+
+        # Test ingestion and evaluation errors don't stop the agent
+        reports_ = ingest.reports.reports
+        ingest.reports.reports = _reports
+        try:
+            agent.poll = _fail
+            agent.query()
+            self.assertEqual(calls, [])
+            agent._polled = False
+            agent.poll = lambda: ['eurusd']
+            agent.query()
+        finally:
+            ingest.reports.reports = reports_
+
+        # Test the report window is separate from the backfill
+        self.assertEqual(calls, [(14400, 10, ['eurusd'])])
+
+    def test_wait(self):
+        """Testing method / function wait."""
+        # Initialize key variables
+        agent = AgentIngest('obya_ingestd_test', timeframe=3600, delay=30)
+
+        # Polls happen a delay after the close of each bar
+        self.assertEqual(agent.wait(now=36000), 30)
+        self.assertEqual(agent.wait(now=36029), 1)
+        self.assertEqual(agent.wait(now=36030), 3600)
+        self.assertEqual(agent.wait(now=37000), 2630)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
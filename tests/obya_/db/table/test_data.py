@@ -6,6 +6,12 @@ import unittest
 import sys
 from datetime import timezone
 import datetime
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
 
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -30,6 +36,8 @@ from tests.libraries.configuration import UnittestConfig
 from tests.libraries import dataset
 from obya.db.table import pair
 from obya.db.table import data
+from obya.db.store import Store
+from obya.db.models import Data as _Data
 
 
 class TestFunctions(unittest.TestCase):
@@ -75,6 +83,39 @@ class TestFunctions(unittest.TestCase):
                 [df_[column].astype(float).round(3).tolist()[-1]]
             )
 
+    def test_bulk(self):
+        """Testing function bulk."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        df_ = dataset.dataset()
+        timeframe = 14400
+        values = df_[data.COLUMNS].values
+        pair.insert(pair_)
+        idx_pair = pair.exists(pair_)
+
+        # Insert overlapping chunks with duplicate timestamps
+        data.bulk(idx_pair, timeframe, values[:10], chunksize=3)
+        data.bulk(
+            idx_pair, timeframe, np.concatenate([values, values[5:8]]),
+            chunksize=7)
+        result = data.dataframe(pair_, timeframe)
+
+        # Test one column at a time
+        for column in df_.columns.values:
+            self.assertEqual(
+                result[column].astype(float).round(3).tolist(),
+                df_[column].astype(float).round(3).tolist()
+            )
+
+        # Existing rows aren't updated
+        changed = values.copy()
+        changed[:, 1:] += 1
+        data.bulk(idx_pair, timeframe, changed)
+        result = data.dataframe(pair_, timeframe)
+        self.assertEqual(
+            result['open'].round(3).tolist(),
+            df_['open'].astype(float).round(3).tolist())
+
     def test_dataframe(self):
         """Testing function dataframe."""
         # Initialize key variables
@@ -115,6 +156,207 @@ class TestFunctions(unittest.TestCase):
                 [df_[column].astype(float).round(3).tolist()[-1]]
             )
 
+    def test_dataframes(self):
+        """Testing function dataframes."""
+        # Initialize key variables
+        pairs_ = [dataset.random_string(), dataset.random_string()]
+        df_ = dataset.dataset()
+        timeframe = int(
+            (df_['timestamp'][1:] - df_['timestamp'].shift()[1:]).median()
+        )
+
+        # Insert data of the first pair only
+        data.insert(pairs_[0], df_)
+        result = data.dataframes(pairs_, timeframe)
+
+        # Test one column at a time
+        self.assertEqual(sorted(result.keys()), sorted(pairs_))
+        self.assertTrue(result[pairs_[1]].empty)
+        for column in df_.columns.values:
+            self.assertEqual(
+                result[pairs_[0]][column].astype(float).round(3).tolist(),
+                df_[column].astype(float).round(3).tolist()
+            )
+
+    def test_values(self):
+        """Testing function values."""
+        # Initialize key variables
+        pairs_ = [dataset.random_string(), dataset.random_string()]
+        df_ = dataset.dataset()
+        timeframe = int(
+            (df_['timestamp'][1:] - df_['timestamp'].shift()[1:]).median()
+        )
+
+        # Insert part of the data for the second pair
+        data.insert(pairs_[0], df_)
+        data.insert(pairs_[1], df_.tail(10))
+        result = data.values(pairs_ + [dataset.random_string()], timeframe)
+
+        # Test
+        self.assertEqual(sorted(result.keys()), sorted(pairs_))
+        self.assertTrue(np.allclose(
+            result[pairs_[0]], df_[data.COLUMNS].values, rtol=1e-6))
+        self.assertTrue(np.allclose(
+            result[pairs_[1]],
+            df_[data.COLUMNS].tail(10).values, rtol=1e-6))
+
+    def test_latest(self):
+        """Testing function latest."""
+        # Initialize key variables
+        pairs_ = [dataset.random_string(), dataset.random_string()]
+        df_ = dataset.dataset()
+        timeframe = 14400
+
+        # Insert data of the first pair only
+        data.insert(pairs_[0], df_)
+        data.insert(pairs_[0], df_.head(3), timeframe=60)
+
+        # Test
+        result = data.latest(pairs_ + [dataset.random_string()], timeframe)
+        self.assertEqual(result, {pairs_[0]: int(df_['timestamp'].max())})
+        result = data.latest(pairs_, 60)
+        self.assertEqual(
+            result, {pairs_[0]: int(df_['timestamp'].head(3).max())})
+
+    def test_synchronize(self):
+        """Testing function synchronize."""
+        # Initialize key variables
+        pairs_ = [dataset.random_string() for _ in range(2)]
+        df_ = dataset.ohlc(50)
+        timeframe = 14400
+        for item in pairs_:
+            data.insert(item, df_, timeframe=timeframe)
+        indexes = pair.indexes(pairs_)
+
+        # Test nothing happens if the store is disabled
+        data.synchronize(pairs_, timeframe)
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = Store(directory, refresh=3600)
+            data._STORE = store
+            try:
+                # Test the arrays of all pairs are stored
+                data.synchronize(pairs_ + [dataset.random_string()], timeframe)
+                for item in pairs_:
+                    idx_pair = indexes[item.lower()]
+                    self.assertTrue(store.fresh(idx_pair, timeframe))
+                    self.assertEqual(
+                        store.load(idx_pair, timeframe).tolist(),
+                        df_[data.COLUMNS].values.tolist())
+            finally:
+                data._STORE = None
+
+    def test_frame(self):
+        """Testing function frame."""
+        # Initialize key variables
+        df_ = dataset.dataset()
+
+        # Test
+        result = data.frame(df_[data.COLUMNS].values)
+        self.assertEqual(
+            result.columns.tolist(),
+            'timestamp open high low close volume'.split())
+        self.assertEqual(result['timestamp'].dtype, np.int64)
+        for column in data.COLUMNS:
+            self.assertEqual(
+                result[column].astype(float).tolist(),
+                df_[column].astype(float).tolist())
+
+        # Test empty
+        result = data.frame(np.empty((0, len(data.COLUMNS))))
+        self.assertTrue(result.empty)
+        self.assertEqual(len(result.columns), 6)
+
+    def test__fetch(self):
+        """Testing function _fetch."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        df_ = dataset.ohlc(250)
+        data.insert(pair_, df_)
+        idx_pair = pair.exists(pair_)
+        statement = select(
+            _Data.timestamp, _Data.close).where(
+                _Data.idx_pair == idx_pair).order_by(_Data.timestamp)
+
+        # Test reading in chunks
+        for chunksize in [1, 100, 1000]:
+            result = data._fetch(statement, 1006, 2, chunksize=chunksize)
+            self.assertEqual(result.shape, (250, 2))
+            self.assertEqual(result.dtype, np.float64)
+            self.assertEqual(
+                result.tolist(), df_[['timestamp', 'close']].values.tolist())
+
+        # Test empty results
+        result = data._fetch(
+            statement.where(_Data.timestamp < 0), 1006, 2)
+        self.assertEqual(result.shape, (0, 2))
+
+    def test__stored(self):
+        """Testing function _stored."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        df_ = dataset.ohlc(250)
+        timeframe = 14400
+        data.insert(pair_, df_[:200], timeframe=timeframe)
+        idx_pair = pair.exists(pair_)
+        expected = df_[data.COLUMNS].values.tolist()
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = Store(directory, refresh=3600)
+            data._STORE = store
+            try:
+                # Test the store is filled on the first read
+                result = data.dataframe(pair_, timeframe)
+                self.assertEqual(
+                    result[data.COLUMNS].values.tolist(), expected[:200])
+                self.assertEqual(
+                    store.load(idx_pair, timeframe).tolist(), expected[:200])
+
+                # Test only new rows are appended
+                data.insert(pair_, df_[190:], timeframe=timeframe)
+                self.assertFalse(store.fresh(idx_pair, timeframe))
+                result = data.dataframe(pair_, timeframe)
+                self.assertEqual(
+                    result[data.COLUMNS].values.tolist(), expected)
+                self.assertTrue(store.fresh(idx_pair, timeframe))
+
+                # Test reading recent rows
+                start = int(df_['timestamp'].values[-10])
+                result = data._stored(store, idx_pair, timeframe, start)
+                self.assertEqual(result.tolist(), expected[-10:])
+
+                # Test fresh stores aren't read from the database
+                with data.db.db_modify(1033) as session:
+                    session.query(_Data).filter(
+                        _Data.idx_pair == idx_pair).delete()
+                result = data._stored(store, idx_pair, timeframe, 0)
+                self.assertEqual(result.tolist(), expected)
+            finally:
+                data._STORE = None
+
+    def test__statement(self):
+        """Testing function _statement."""
+        # Test
+        for dialect, prefix in [
+                (mysql.dialect(), 'INSERT IGNORE INTO ob_data'),
+                (sqlite.dialect(), 'INSERT OR IGNORE INTO ob_data')]:
+            result = str(data._statement(dialect.name).compile(
+                dialect=dialect))
+            self.assertTrue(result.startswith(prefix))
+        result = str(data._statement('other').compile(
+            dialect=sqlite.dialect()))
+        self.assertTrue(result.startswith('INSERT INTO ob_data'))
+
+    def test_dates(self):
+        """Testing function dates."""
+        # Test hours across years and weekdays
+        timestamps = list(range(0, 2000000000, 3600 * 7 + 60 * 13))
+        expected = [
+            time.strftime('%Y-%m-%d %H:%M %a', time.gmtime(_))
+            for _ in timestamps]
+        result = data.dates(timestamps)
+        self.assertEqual(result.tolist(), expected)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
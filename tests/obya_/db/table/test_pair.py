@@ -54,6 +54,20 @@ class TestFunctions(unittest.TestCase):
         pair.insert(pair_)
         self.assertTrue(pair.exists(pair_))
 
+    def test_indexes(self):
+        """Testing function indexes."""
+        # Initialize key variables
+        pairs_ = [dataset.random_string(), dataset.random_string()]
+        missing = dataset.random_string()
+        for item in pairs_:
+            pair.insert(item)
+
+        # Test
+        result = pair.indexes(pairs_ + [missing])
+        self.assertEqual(
+            result, {_.lower(): pair.exists(_) for _ in pairs_})
+        self.assertEqual(pair.indexes([]), {})
+
     def test_insert(self):
         """Testing function insert."""
         # Initialize key variables
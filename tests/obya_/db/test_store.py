@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Test the local store module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_{0}db'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from obya.db.store import Store
+
+
+def _values(timestamps):
+    """Create an array of rows with the given timestamps."""
+    # Return
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    result = np.column_stack(
+        [timestamps] + [timestamps + _ for _ in range(1, 6)])
+    return result
+
+
+class TestStore(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def setUp(self):
+        """Create a store directory."""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Delete the store directory."""
+        self.directory.cleanup()
+
+    def test_load(self):
+        """Testing method / function load."""
+        # Initialize key variables
+        store = Store(self.directory.name)
+
+        # Test
+        self.assertIsNone(store.load(1, 14400))
+        store.append(1, 14400, _values([10, 20]))
+        result = store.load(1, 14400)
+        self.assertIsInstance(result, np.memmap)
+        self.assertFalse(result.flags.writeable)
+        self.assertEqual(result.tolist(), _values([10, 20]).tolist())
+        self.assertIsNone(store.load(1, 3600))
+        self.assertIsNone(store.load(2, 14400))
+
+        # Test files are only mapped again when replaced
+        self.assertIs(store.load(1, 14400), result)
+        store.append(1, 14400, _values([30]))
+        self.assertIsNot(store.load(1, 14400), result)
+        self.assertEqual(result.tolist(), _values([10, 20]).tolist())
+
+    def test_append(self):
+        """Testing method / function append."""
+        # Initialize key variables
+        store = Store(self.directory.name)
+
+        # Test empty arrays are stored
+        result = store.append(1, 14400, np.empty((0, 6)))
+        self.assertEqual(result.shape, (0, 6))
+
+        # Test only newer rows are appended
+        store.append(1, 14400, _values([10, 20, 30]))
+        result = store.append(1, 14400, _values([20, 30, 40, 50]))
+        self.assertEqual(
+            result.tolist(), _values([10, 20, 30, 40, 50]).tolist())
+
+        # Test arrays are shared with other instances
+        self.assertEqual(
+            Store(self.directory.name).load(1, 14400).tolist(),
+            result.tolist())
+
+        # Test no temporary files are left
+        self.assertEqual(os.listdir(self.directory.name), ['1_14400.npy'])
+
+    def test_fresh(self):
+        """Testing method / function fresh."""
+        # Initialize key variables
+        store = Store(self.directory.name)
+
+        # Test
+        self.assertFalse(store.fresh(1, 14400))
+        store.append(1, 14400, _values([10]))
+        self.assertTrue(store.fresh(1, 14400))
+        self.assertFalse(Store(self.directory.name, refresh=0).fresh(
+            1, 14400))
+
+    def test_lock(self):
+        """Testing method / function lock."""
+        # Initialize key variables
+        store = Store(self.directory.name)
+        locked = []
+
+        def _lock():
+            with Store(self.directory.name).lock(1, 14400):
+                locked.append(time.time())
+
+        # Test other lockers wait until the lock is released
+        with store.lock(1, 14400):
+            thread = threading.Thread(target=_lock)
+            thread.start()
+            time.sleep(0.2)
+            self.assertEqual(locked, [])
+            released = time.time()
+        thread.join()
+        self.assertEqual(len(locked), 1)
+        self.assertGreaterEqual(locked[0], released)
+
+        # Test other arrays aren't locked
+        with store.lock(1, 14400):
+            with store.lock(1, 3600):
+                pass
+
+    def test_invalidate(self):
+        """Testing method / function invalidate."""
+        # Initialize key variables
+        store = Store(self.directory.name)
+        store.append(1, 14400, _values([10, 20, 30]))
+
+        # Test newer and already stored rows make the array stale
+        store.invalidate(1, 14400, [20, 30, 40])
+        self.assertFalse(store.fresh(1, 14400))
+        self.assertEqual(
+            store.load(1, 14400).tolist(), _values([10, 20, 30]).tolist())
+
+        # Test older rows that aren't stored delete the array
+        store.invalidate(1, 14400, [5, 40])
+        self.assertIsNone(store.load(1, 14400))
+        store.append(1, 14400, _values([10, 20, 30]))
+        store.invalidate(1, 14400, [15])
+        self.assertIsNone(store.load(1, 14400))
+
+        # Test arrays that aren't stored
+        store.invalidate(2, 14400, [15])
+        self.assertIsNone(store.load(2, 14400))
+
+        # Test arrays being refreshed are invalidated after the refresh
+        store.append(1, 14400, _values([10, 20, 30]))
+        thread = threading.Thread(
+            target=store.invalidate, args=(1, 14400, [40]))
+        with store.lock(1, 14400):
+            thread.start()
+            time.sleep(0.2)
+            self.assertTrue(store.fresh(1, 14400))
+            store.append(1, 14400, _values([30]))
+        thread.join()
+        self.assertFalse(store.fresh(1, 14400))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
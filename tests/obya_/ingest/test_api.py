@@ -2,10 +2,18 @@
 """Test the files module."""
 
 # Standard imports
+import json
 import unittest
 import os
 import sys
+import tempfile
+import time
 from collections import namedtuple
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+# PIP3 imports
+import pandas as pd
 
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -25,7 +33,209 @@ else:
 
 # Application imports
 from tests.libraries.configuration import UnittestConfig
+from tests.libraries import stub
 from obya.ingest import api
+from obya.db.table import data
+from obya import Config
+
+
+class TestAPI(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def setUp(self):
+        """Start a stub of the API."""
+        self.server = stub.Server()
+        self.server.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, 'markets.json')
+        self.stop = int(time.time()) // 3600 * 3600
+
+    def tearDown(self):
+        """Stop the stub of the API."""
+        self.server.stop()
+        self.directory.cleanup()
+
+    def test_historical(self):
+        """Testing method / function historical."""
+        # Initialize key variables
+        _api = api.API(base_url=self.server.url, markets=self.filepath)
+
+        # Test
+        for _ in range(3):
+            result = _api.historical(
+                'EURUSD', 3600, start=self.stop - 36000, stop=self.stop)
+            self.assertEqual(len(result), 10)
+        self.assertIsNone(_api.historical('ABCDEF', 3600, start=0))
+        self.assertIsNone(_api.historical('EURUSD', 7, start=0))
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Initialize key variables
+        _api = api.API(base_url=self.server.url, markets=False)
+        uri = 'market/search?Query=EUR%2FUSD'
+
+        # Test
+        self.assertEqual(
+            _api.get(uri), {'Markets': [{'Name': 'EUR/USD', 'MarketId': 2}]})
+        self.assertIsNone(_api.get('unknown'))
+
+        # Login again transparently when the session expires
+        self.server.sessions.append('session-2')
+        self.assertEqual(
+            _api.get(uri), {'Markets': [{'Name': 'EUR/USD', 'MarketId': 2}]})
+        self.assertEqual(_api.session_key, 'session-2')
+        self.assertEqual(self.server.requests['session'], 2)
+
+        # Failed connections return None
+        self.server.stop()
+        _api = api.API(base_url=self.server.url, markets=False, retries=0)
+        self.assertIsNone(_api.session_key)
+        self.assertIsNone(_api.get(uri))
+        self.server = stub.Server()
+        self.server.start()
+
+    def test_metrics(self):
+        """Testing method / function metrics."""
+        # Initialize key variables
+        self.server.stop()
+        self.server = stub.Server(failures=2, error=503)
+        self.server.start()
+        _api = api.API(base_url=self.server.url, markets=False)
+
+        # Temporarily unavailable requests are retried
+        result = _api.historical(
+            'EURUSD', 3600, start=self.stop - 36000, stop=self.stop)
+        self.assertEqual(len(result), 10)
+        metrics = _api.metrics()
+        self.assertEqual(metrics.requests, 3)
+        self.assertEqual(metrics.failures, 0)
+        self.assertEqual(metrics.retries, 2)
+        self.assertEqual(metrics.logins, 1)
+        self.assertGreater(metrics.latency_mean, 0)
+        self.assertGreaterEqual(metrics.latency_max, metrics.latency_mean)
+
+        # Failures are counted
+        _api.get('unknown')
+        self.assertEqual(_api.metrics().failures, 1)
+
+    def test__market_id(self):
+        """Testing method / function _market_id."""
+        # Initialize key variables
+        _api = api.API(base_url=self.server.url, markets=self.filepath)
+
+        # Market IDs are only searched for once
+        for _ in range(3):
+            self.assertEqual(_api._market_id('EURUSD'), 2)
+        self.assertIsNone(_api._market_id('ABCDEF'))
+        self.assertIsNone(_api._market_id('ABCDEF'))
+        self.assertEqual(self.server.requests['market/search'], 3)
+
+        # Market IDs are cached in the file for the next session
+        _api = api.API(base_url=self.server.url, markets=self.filepath)
+        self.assertEqual(_api._market_id('EURUSD'), 2)
+        self.assertEqual(self.server.requests['market/search'], 3)
+
+        # The market ID is kept after temporary failures
+        self.server.failures = 1
+        self.assertIsNone(_api.historical('EURUSD', 3600, start=0))
+        result = _api.historical(
+            'EURUSD', 3600, start=self.stop - 36000, stop=self.stop)
+        self.assertEqual(len(result), 10)
+        self.assertEqual(self.server.requests['market/search'], 3)
+        self.assertEqual(
+            api.Markets(self.filepath, self.server.url).get('EURUSD'), 2)
+
+        # The market ID is searched for again after it is not found
+        _api.markets.add('EURUSD', 99)
+        self.assertIsNone(_api.historical('EURUSD', 3600, start=0))
+        self.assertIsNone(_api.markets.get('EURUSD'))
+        result = _api.historical(
+            'EURUSD', 3600, start=self.stop - 36000, stop=self.stop)
+        self.assertEqual(len(result), 10)
+        self.assertEqual(self.server.requests['market/search'], 4)
+
+
+class TestIngest(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_ingest(self):
+        """Testing function ingest."""
+        # Initialize key variables
+        pairs = Config().pairs
+        server = stub.Server(markets=pairs)
+        server.start()
+        secondsago = 86400 * 30
+
+        # Backfill all pairs
+        result = api.ingest(secondsago, base_url=server.url)
+        self.assertEqual(result.failed, 0)
+        self.assertGreaterEqual(result.rows, len(pairs) * 179)
+        latest = data.latest(pairs, 14400)
+        self.assertEqual(sorted(latest.keys()), sorted(pairs))
+
+        # Only the bars after the latest bar are fetched
+        result = api.ingest(
+            secondsago, base_url=server.url, incremental=True)
+        server.stop()
+        self.assertEqual(result.failed, 0)
+        self.assertEqual(result.windows, len(pairs))
+        self.assertLessEqual(result.rows, len(pairs) * 3)
+        self.assertEqual(data.latest(pairs, 14400), latest)
+
+        # Pairs that are up to date don't fail
+        server = stub.Server(markets=pairs, published=0)
+        server.start()
+        result = api.ingest(
+            secondsago, base_url=server.url, incremental=True)
+        server.stop()
+        self.assertEqual(result.failed, 0)
+        self.assertEqual(result.windows, len(pairs))
+        self.assertEqual(result.rows, 0)
+        self.assertEqual(
+            server.requests['market/{}/barhistorybetween'], len(pairs))
+        self.assertEqual(data.latest(pairs, 14400), latest)
+
+
+class TestMarkets(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_get(self):
+        """Testing method / function get."""
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'markets.json')
+            markets = api.Markets(filepath, 'https://a')
+            self.assertIsNone(markets.get('EURUSD'))
+            markets.add('eurusd', 400616)
+            self.assertEqual(markets.get('EURUSD'), 400616)
+
+            # Market IDs are saved per API
+            self.assertEqual(
+                api.Markets(filepath, 'https://a').get('EURUSD'), 400616)
+            self.assertIsNone(
+                api.Markets(filepath, 'https://b').get('EURUSD'))
+
+            # Unreadable files are ignored
+            with open(filepath, 'w') as f_handle:
+                f_handle.write('{')
+            self.assertIsNone(
+                api.Markets(filepath, 'https://a').get('EURUSD'))
+
+        # Market IDs are only kept in memory without a file
+        markets = api.Markets(False, 'https://a')
+        markets.add('EURUSD', 400616)
+        self.assertEqual(markets.get('EURUSD'), 400616)
+
+    def test_remove(self):
+        """Testing method / function remove."""
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'markets.json')
+            markets = api.Markets(filepath, 'https://a')
+            markets.add('EURUSD', 400616)
+            markets.remove('EURUSD')
+            markets.remove('AUDUSD')
+            self.assertIsNone(markets.get('EURUSD'))
+            self.assertIsNone(
+                api.Markets(filepath, 'https://a').get('EURUSD'))
 
 
 class TestFunctions(unittest.TestCase):
@@ -179,6 +389,64 @@ class TestFunctions(unittest.TestCase):
         result = sorted(result, key=lambda k: k['timestamp'])
         self.assertEqual(result, expected)
 
+        # Test empty results
+        for item in [{'PriceBars': []}, {}]:
+            result = api._convert(item)
+            self.assertTrue(result.empty)
+            self.assertEqual(sorted(result.columns), sorted(_result.columns))
+
+    def test__timestamps(self):
+        """Testing function _timestamps."""
+        # Test
+        dates = ['/Date(1602450000000)/', '/Date(999993600000)/']
+        result = api._timestamps(dates)
+        self.assertEqual(result.tolist(), [1602450000, 999993600])
+
+        # Dates that can't be searched at once
+        dates = ['/Date(1602450000000)/(1)', '/Date(999993600000)/']
+        result = api._timestamps(dates)
+        self.assertEqual(result.tolist(), [1602450000, 999993600])
+
+    def test__loads(self):
+        """Testing function _loads."""
+        # Test
+        data = {'PriceBars': [{'BarDate': '/Date(1602450000000)/',
+                               'Open': 1.30259, 'Volume': 0}]}
+        result = api._loads(json.dumps(data).encode())
+        self.assertEqual(result, data)
+
+    def test__utc(self):
+        """Testing function _utc."""
+        # Hourly timestamps across the London DST transitions of 2020 and
+        # four hourly timestamps over a decade
+        timestamps = list(range(1585350000, 1585450000, 3600)) + list(
+            range(1603500000, 1603700000, 3600)) + list(
+                range(1262304000, 1577836800, 14400))
+        df_ = pd.DataFrame(
+            {'timestamp': timestamps, 'close': range(len(timestamps))})
+
+        # Test against converting each timestamp separately
+        for timezone in [None, 'Europe/London', 'America/New_York']:
+            zone = ZoneInfo(timezone or 'Europe/London')
+            expected = [
+                datetime.fromtimestamp(_, zone).replace(
+                    tzinfo=dt_timezone.utc).timestamp() for _ in timestamps]
+            result = api._utc(df_, timezone=timezone)
+            self.assertEqual(result['timestamp'].tolist(), expected)
+            self.assertEqual(result['close'].tolist(), df_['close'].tolist())
+
+        # Test the DST transitions of London
+        result = api._utc(
+            pd.DataFrame({'timestamp': [1585443600, 1585447200, 1603584000,
+                                        1603587600, 1603591200]}))
+        self.assertEqual(
+            result['timestamp'].tolist(),
+            [1585447200, 1585450800, 1603587600, 1603587600, 1603591200])
+
+        # Test empty frames
+        result = api._utc(api._convert({'PriceBars': []}))
+        self.assertTrue(result.empty)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Test the backfill module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from tests.libraries import stub
+from obya.ingest import api
+from obya.ingest import backfill
+from obya.db.table import data
+
+
+class TestBackfill(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def setUp(self):
+        """Start a stub of the API."""
+        self.server = stub.Server()
+        self.server.start()
+        self.api = api.API(base_url=self.server.url, markets=False)
+
+    def tearDown(self):
+        """Stop the stub of the API."""
+        self.server.stop()
+
+    def test_windows(self):
+        """Testing method / function windows."""
+        # Initialize key variables
+        _backfill = backfill.Backfill(self.api, timeframe=60, batch=10)
+
+        # Windows are aligned to multiples of their duration
+        result = _backfill.windows(['AUDUSD', 'EURUSD'], 1250, 2500)
+        self.assertEqual(
+            [(_.start, _.stop, _.key) for _ in result[:3]],
+            [(1250, 1800, 1200), (1800, 2400, 1800), (2400, 2500, 2400)])
+        self.assertEqual(
+            [_.pair for _ in result], ['AUDUSD'] * 3 + ['EURUSD'] * 3)
+
+        # Pairs can start at different times
+        result = _backfill.windows(
+            ['AUDUSD', 'EURUSD'], 1250, 2500, starts={'EURUSD': 2450})
+        self.assertEqual(
+            [(_.pair, _.start, _.stop, _.key) for _ in result[2:]],
+            [('AUDUSD', 2400, 2500, 2400), ('EURUSD', 2450, 2500, 2400)])
+
+    def test_run(self):
+        """Testing method / function run."""
+        # Initialize key variables
+        pairs = ['AUDUSD', 'EURUSD', 'NZDUSD']
+        stop = int(time.time()) // 3600 * 3600
+        start = stop - 3600 * 100
+        windows = []
+        _backfill = backfill.Backfill(
+            self.api, timeframe=3600, batch=30, concurrency=3)
+
+        # Test
+        result = _backfill.run(
+            pairs, start, stop,
+            callback=lambda window, rows: windows.append(window))
+        self.assertEqual(result.windows, len(windows))
+        self.assertEqual(result.fetched, result.windows)
+        self.assertEqual((result.skipped, result.failed), (0, 0))
+        self.assertEqual(result.rows, 100 * len(pairs))
+        self.assertEqual(
+            self.server.requests['market/{}/barhistorybetween'],
+            result.windows)
+        for pair in pairs:
+            self.assertEqual(len(data.dataframe(pair, 3600)), 100)
+
+    def test__fetch(self):
+        """Testing method / function _fetch."""
+        # Initialize key variables
+        stop = int(time.time()) // 3600 * 3600
+        window = backfill.Window(
+            pair='AUDUSD', start=stop - 36000, stop=stop, key=0)
+
+        # Failed fetches are retried
+        self.server.failures = 2
+        _backfill = backfill.Backfill(
+            self.api, timeframe=3600, retries=2, backoff=0)
+        result = _backfill._fetch(window)
+        self.assertEqual(len(result), 10)
+
+        # Failures after the last retry return None
+        self.server.failures = 10
+        _backfill = backfill.Backfill(
+            self.api, timeframe=3600, retries=1, backoff=0)
+        self.assertIsNone(_backfill._fetch(window))
+
+        # Unknown pairs return None
+        window = window._replace(pair='ABCDEF')
+        self.assertIsNone(_backfill._fetch(window))
+
+
+class TestState(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_done(self):
+        """Testing method / function done."""
+        # Initialize key variables
+        window = backfill.Window(pair='AUDUSD', start=10, stop=20, key=0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'state.json')
+            state = backfill.State(filepath, 60)
+            self.assertFalse(state.done(window))
+            state.add(window)
+            self.assertTrue(state.done(window))
+
+            # The progress is read by the next backfill
+            state = backfill.State(filepath, 60)
+            self.assertTrue(state.done(window))
+            self.assertTrue(state.done(window._replace(start=15)))
+            self.assertFalse(state.done(window._replace(stop=25)))
+            self.assertFalse(state.done(window._replace(pair='EURUSD')))
+
+            # The progress of other timeframes is ignored
+            state = backfill.State(filepath, 3600)
+            self.assertFalse(state.done(window))
+
+            # Unreadable files are ignored
+            with open(filepath, 'w') as f_handle:
+                f_handle.write('{')
+            state = backfill.State(filepath, 60)
+            self.assertFalse(state.done(window))
+
+    def test_clear(self):
+        """Testing method / function clear."""
+        # Initialize key variables
+        window = backfill.Window(pair='AUDUSD', start=10, stop=20, key=0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'state.json')
+            state = backfill.State(filepath, 60)
+            state.add(window)
+            self.assertTrue(os.path.isfile(filepath))
+            state.clear()
+            self.assertFalse(os.path.isfile(filepath))
+            self.assertFalse(state.done(window))
+
+        # Progress isn't saved without a file
+        state = backfill.State(None, 60)
+        state.add(window)
+        self.assertTrue(state.done(window))
+        state.clear()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -5,6 +5,9 @@
 import unittest
 import os
 import sys
+import time
+
+import pandas as pd
 
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -26,6 +29,7 @@ else:
 from tests.libraries.configuration import UnittestConfig
 from tests.libraries import dataset
 from obya.ingest import files
+from obya.db.table import data
 
 
 class TestFunctions(unittest.TestCase):
@@ -53,6 +57,88 @@ class TestFunctions(unittest.TestCase):
                 expected[column].tolist()
             )
 
+    def test_chunks(self):
+        """Testing chunks."""
+        # Initialize key variables
+        filepath = '{0}{1}tests{1}data{1}test_ingest.csv'.format(
+            ROOT_DIR, os.sep)
+        expected = files.ingest(filepath)
+
+        # Test
+        result = list(files.chunks(filepath, chunksize=3))
+        self.assertEqual([len(_) for _ in result], [3, 3, 3, 1])
+        self.assertTrue(
+            pd.concat(result, ignore_index=True).equals(expected))
+
+    def test_stream(self):
+        """Testing stream."""
+        # Initialize key variables
+        columns = 'open high low close volume timestamp'
+        pair_ = dataset.random_string()
+        filepath = '{0}{1}tests{1}data{1}test_ingest.csv'.format(
+            ROOT_DIR, os.sep)
+        progress = []
+        expected = dataset.dataset()
+
+        # Test
+        result = files.stream(
+            filepath, pair_, chunksize=3, callback=progress.append,
+            insert_chunksize=2)
+        self.assertEqual(result, 10)
+        self.assertEqual([_.rows for _ in progress], [3, 6, 9, 10])
+        self.assertEqual(progress[-1].position, progress[-1].size)
+        self.assertEqual(progress[-1].size, os.path.getsize(filepath))
+
+        # The timeframe of the first chunk is used for the last one
+        result = data.dataframe(pair_, 14400)
+        for column in columns.split():
+            self.assertEqual(
+                result[column].astype(float).round(3).tolist(),
+                expected[column].astype(float).round(3).tolist()
+            )
+
+        # Single row chunks need the timeframe
+        with self.assertRaises(ValueError):
+            files.stream(filepath, dataset.random_string(), chunksize=1)
+        pair_ = dataset.random_string()
+        result = files.stream(filepath, pair_, chunksize=1, timeframe=3600)
+        self.assertEqual(result, 10)
+        self.assertEqual(len(data.dataframe(pair_, 3600)), 10)
+
+    def test__timestamps(self):
+        """Testing _timestamps."""
+        # Initialize key variables
+        days = pd.Series(['2017.02.09', '2020.02.29', '1999.12.31'])
+        times = pd.Series(['12:00', '23:59', '00:01'])
+        expected = [1486641600, 1583020740, 946598460]
+
+        # Test the fixed width values
+        result = files._timestamps(days, times)
+        self.assertEqual(result.tolist(), expected)
+
+        # Test values parsed by pandas
+        result = files._timestamps(
+            pd.Series(['2017.2.09']), pd.Series(['12:00']))
+        self.assertEqual(result.tolist(), [expected[0]])
+
+        # Test invalid values
+        for day, time_ in [
+                ('2017.02.30', '12:00'),
+                ('2017.13.09', '12:00'),
+                ('2017.02.09', '24:00'),
+                ('2017-02-09', '12:00')]:
+            with self.assertRaises(ValueError):
+                files._timestamps(pd.Series([day]), pd.Series([time_]))
+
+        # Test against time.strftime across many years
+        timestamps = list(range(0, 2000000000, 86400 * 3 + 3600 * 5 + 60))
+        days = pd.Series(
+            [time.strftime('%Y.%m.%d', time.gmtime(_)) for _ in timestamps])
+        times = pd.Series(
+            [time.strftime('%H:%M', time.gmtime(_)) for _ in timestamps])
+        result = files._timestamps(days, times)
+        self.assertEqual(result.tolist(), timestamps)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
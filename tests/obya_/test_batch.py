@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Test the batch module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+import pandas as pd
+import numpy as np
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from obya import batch
+from obya import evaluate
+from obya.ingest import files
+
+
+class TestBatch(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    dataframes = {}
+    for pair in ['AUDJPY', 'AUDUSD', 'EURJPY', 'NZDUSD']:
+        dataframes[pair] = files.ingest(
+            '{0}{1}tests{1}data{1}{2}240.csv'.format(ROOT_DIR, os.sep, pair))
+        dataframes[pair]['date'] = [
+            str(_) for _ in dataframes[pair]['timestamp'].tolist()]
+
+    def test___init__(self):
+        """Testing function __init__."""
+        # Initialize key variables
+        dataframes = self.dataframes.copy()
+        dataframes['EURUSD'] = self.dataframes['AUDJPY'].iloc[::-1]
+        dataframes['GBPUSD'] = pd.DataFrame()
+        dataframes['USDJPY'] = None
+
+        # Unsorted and empty DataFrames are not aligned
+        result = batch.Batch(dataframes)
+        self.assertEqual(result.pairs, sorted(self.dataframes.keys()))
+
+    def test_evaluate(self):
+        """Testing function evaluate."""
+        # Initialize key variables
+        dataframes = self.dataframes.copy()
+        dataframes['EURUSD'] = self.dataframes['AUDJPY'].sample(
+            n=2000, random_state=1).sort_index()
+
+        for periods, k_period, d_period in [(29, 35, 5), (4, 5, 3)]:
+            # Test
+            result = batch.Batch(dataframes).evaluate(
+                periods, k_period=k_period, d_period=d_period)
+            self.assertEqual(sorted(result.keys()), sorted(dataframes.keys()))
+
+            # Results must be identical to evaluating each pair separately
+            for pair, _df in dataframes.items():
+                expected = evaluate.evaluate(
+                    _df, periods, k_period=k_period, d_period=d_period)
+                self.assertFalse(result[pair].empty)
+                pd.testing.assert_frame_equal(
+                    result[pair], expected, check_exact=True)
+
+
+class TestFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test__aligned(self):
+        """Testing function _aligned."""
+        # Initialize key variables
+        data = pd.DataFrame({'timestamp': [1, 2, 4, 8]}, index=[3, 4, 5, 6])
+
+        # Test
+        self.assertTrue(batch._aligned(data))
+        self.assertFalse(batch._aligned(data.iloc[::-1]))
+        self.assertFalse(batch._aligned(data.iloc[[0, 1, 3]]))
+        self.assertFalse(
+            batch._aligned(pd.DataFrame({'timestamp': [1, 2, 2, 3]})))
+
+    def test__sequential(self):
+        """Testing function _sequential."""
+        # Initialize key variables
+        values = np.array([
+            [False, True, True, True, False, False],
+            [True, True, False, True, True, True]
+        ])
+        starts = np.array([0, 2])
+        expected = [
+            [1, 1, 2, 3, 1, 2],
+            [1, 2, 1, 1, 2, 3]
+        ]
+
+        # Test
+        result = batch._sequential(values, starts)
+        self.assertEqual(result.tolist(), expected)
+        self.assertEqual(
+            result[0].tolist(),
+            evaluate.sequential(pd.Series(values[0])).tolist())
+
+    def test__minimum(self):
+        """Testing function _minimum."""
+        # Initialize key variables
+        fast = np.array([[True, True, False, False]])
+        slow = np.array([[True, False, True, False]])
+        fast_runs = np.array([[3, 4, 5, 6]])
+        slow_runs = np.array([[2, 7, 8, 9]])
+
+        # Test
+        result = batch._minimum(fast, fast_runs, slow, slow_runs)
+        self.assertEqual(result[0].tolist()[:3], [2, 4, 8])
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
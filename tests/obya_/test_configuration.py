@@ -95,11 +95,49 @@ class TestConfig(unittest.TestCase):
         # Test
         self.assertEqual(self.config.db_pool_size, 10)
 
+    def test_db_insert_chunksize(self):
+        """Testing function db_insert_chunksize."""
+        # Test
+        self.assertEqual(self.config.db_insert_chunksize, 10000)
+
     def test_db_max_overflow(self):
         """Testing function db_max_overflow."""
         # Test
         self.assertEqual(self.config.db_max_overflow, 10)
 
+    def test_resample_base(self):
+        """Testing function resample_base."""
+        # Test
+        self.assertIsNone(self.config.resample_base)
+
+    def test_resample_origin(self):
+        """Testing function resample_origin."""
+        # Test
+        self.assertEqual(self.config.resample_origin, 345600)
+
+    def test_store(self):
+        """Testing function store."""
+        # Test
+        self.assertFalse(self.config.store)
+
+    def test_store_directory(self):
+        """Testing function store_directory."""
+        # Test
+        self.assertEqual(
+            self.config.store_directory,
+            os.path.join(self.config.daemon_directory, 'store'))
+        self.assertTrue(os.path.isdir(self.config.store_directory))
+
+    def test_store_refresh(self):
+        """Testing function store_refresh."""
+        # Test
+        self.assertEqual(self.config.store_refresh, 60)
+
+    def test_web_cache_ttl(self):
+        """Testing function web_cache_ttl."""
+        # Test
+        self.assertEqual(self.config.web_cache_ttl, 300)
+
     def test_email_from(self):
         """Testing function email_from."""
         # Test
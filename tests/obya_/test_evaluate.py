@@ -31,6 +31,22 @@ from obya import evaluate
 from obya.ingest import files
 
 
+def _summary(_df, periods=5, crawling=False):
+    """Summarize a DataFrame with pandas rolling windows."""
+    # Initialize key variables
+    df_ = _df.copy()
+    df_['low'] = df_['low'].rolling(periods).min()
+    df_['high'] = df_['high'].rolling(periods).max()
+    df_['volume'] = df_['volume'].rolling(periods).sum()
+    df_['open'] = df_['open'].shift(periods - 1)
+
+    # Return
+    result = df_[periods - 1:]
+    if bool(crawling) is False:
+        result = result[::-periods].iloc[::-1]
+    return result
+
+
 class TestEither(unittest.TestCase):
     """Checks all functions and methods."""
 
@@ -336,6 +352,134 @@ class TestEvaluate(unittest.TestCase):
             )
 
 
+class TestIncremental(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    data = files.ingest(
+        '{0}{1}tests{1}data{1}test_ingest_2_years.csv'.format(
+            ROOT_DIR, os.sep))
+
+    def test___init__(self):
+        """Testing function __init__."""
+        # Sorted data can be evaluated incrementally
+        result = evaluate.Incremental(self.data, 4, k_period=5, d_period=3)
+        self.assertTrue(result.valid)
+
+        # Unsorted data cannot
+        result = evaluate.Incremental(
+            self.data.iloc[::-1], 4, k_period=5, d_period=3)
+        self.assertFalse(result.valid)
+
+    def test_evaluate(self):
+        """Testing function evaluate."""
+        # Initialize key variables
+        k_period = 5
+        d_period = 3
+        periods = 4
+        found = []
+        incremental = evaluate.Incremental(
+            self.data, periods, k_period=k_period, d_period=d_period)
+
+        # Compare against summarizing the data up to each timestamp
+        for timestamp in self.data['timestamp'].tolist()[-200::7]:
+            temp_data = self.data[self.data['timestamp'] <= timestamp]
+            expected = evaluate.Evaluate(
+                evaluate.summary(temp_data, periods=periods),
+                k_period=k_period, d_period=d_period).difference(limit=4)
+            expected = expected.loc[~expected.index.isin(found)]
+
+            result = incremental.evaluate(timestamp)
+            pd.testing.assert_frame_equal(result, expected, check_exact=True)
+            found.extend(result.index.tolist())
+
+        # Nothing new is returned for timestamps already evaluated
+        result = incremental.evaluate(timestamp)
+        self.assertTrue(result.empty)
+
+
+class TestAccumulator(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test___init__(self):
+        """Testing function __init__."""
+        pass
+
+    def test_add(self):
+        """Testing function add."""
+        # Initialize key variables
+        data = dataset.dataset()
+        accumulator = evaluate.Accumulator(data.dtypes.to_dict(), len(data))
+
+        # Add overlapping rows
+        accumulator.add(data.iloc[5:8])
+        accumulator.add(data.iloc[2:7])
+        accumulator.add(data.iloc[2:3])
+
+        # Test
+        result = accumulator.dataframe()
+        self.assertEqual(result.index.tolist(), [5, 6, 7, 2, 3, 4])
+        self.assertEqual(
+            result['close'].tolist(),
+            data.loc[[5, 6, 7, 2, 3, 4], 'close'].tolist())
+
+    def test_dataframe(self):
+        """Testing function dataframe."""
+        # Initialize key variables
+        data = dataset.dataset()
+        data['date'] = [str(_) for _ in data['timestamp'].tolist()]
+        accumulator = evaluate.Accumulator(data.dtypes.to_dict(), len(data))
+
+        # No rows
+        result = accumulator.dataframe()
+        self.assertTrue(result.empty)
+        self.assertEqual(result.columns.tolist(), data.columns.tolist())
+
+        # Numeric columns are converted to floats
+        accumulator.add(data)
+        result = accumulator.dataframe()
+        for column in data.columns.tolist():
+            if column == 'date':
+                self.assertEqual(result[column].dtype, object)
+            else:
+                self.assertEqual(result[column].dtype, np.float64)
+            self.assertEqual(result[column].tolist(), data[column].tolist())
+
+    def test_extension_dtypes(self):
+        """Testing pandas extension dtypes."""
+        # Initialize key variables
+        data = dataset.dataset()
+        data['when'] = pd.to_datetime(data['timestamp'], unit='s', utc=True)
+        data['kind'] = pd.Categorical(['a', 'b'] * (len(data) // 2) + [
+            'a'] * (len(data) % 2))
+        data['count'] = pd.array(
+            [None] + list(range(1, len(data))), dtype='Int64')
+        data['flag'] = pd.array(
+            [True, None] + [False] * (len(data) - 2), dtype='boolean')
+        accumulator = evaluate.Accumulator(data.dtypes.to_dict(), len(data))
+
+        # Test
+        accumulator.add(data.iloc[3:])
+        accumulator.add(data)
+        result = accumulator.dataframe()
+        self.assertEqual(result.index.tolist(), data.index[3:].tolist() + [
+            0, 1, 2])
+        for column in ['when', 'kind']:
+            self.assertEqual(
+                result[column].tolist(),
+                data[column].iloc[3:].tolist() + data[column].iloc[
+                    :3].tolist())
+        self.assertEqual(result['count'].dtype, np.float64)
+        self.assertTrue(np.isnan(result['count'].values[-3]))
+        self.assertEqual(result['count'].values[-2], 1)
+        self.assertEqual(result['flag'].dtype, np.float64)
+        self.assertEqual(result['flag'].values[-3], 1)
+        self.assertTrue(np.isnan(result['flag'].values[-2]))
+
+
 class TestFunctions(unittest.TestCase):
     """Checks all functions and methods."""
 
@@ -396,6 +540,46 @@ class TestFunctions(unittest.TestCase):
             key=itemgetter('timestamp'))
         self.assertEqual(result, expected)
 
+    def test_ls_evaluate(self):
+        """Testing function ls_evaluate."""
+        # Initialize key variables
+        k_period = 5
+        d_period = 3
+        periods = 4
+        filepath = '{0}{1}tests{1}data{1}test_ingest_2_years.csv'.format(
+            ROOT_DIR, os.sep)
+        data = files.ingest(filepath)
+        lt_index = []
+        rows = []
+
+        # Get the expected result by summarizing the data up to each
+        # short term timestamp
+        s_expected = evaluate.Evaluate(
+            data, k_period=k_period, d_period=d_period).either()
+        for timestamp in s_expected['timestamp'].tolist():
+            temp_data = data[data['timestamp'] <= timestamp]
+            temp_long = evaluate.Evaluate(
+                evaluate.summary(temp_data, periods=periods),
+                k_period=k_period, d_period=d_period).difference(limit=4)
+            for index in temp_long.index.tolist():
+                if index not in lt_index:
+                    rows.append(temp_long.loc[[index]])
+                    lt_index.append(index)
+        l_expected = pd.concat(rows)
+
+        # Test
+        (s_term, l_term) = evaluate.ls_evaluate(
+            data, periods, k_period=k_period, d_period=d_period)
+        pd.testing.assert_frame_equal(s_term, s_expected, check_exact=True)
+        pd.testing.assert_frame_equal(
+            l_term, l_expected.astype(np.float64), check_exact=True)
+
+        # Test unsorted data, which is evaluated without the Incremental class
+        (_, l_term) = evaluate.ls_evaluate(
+            data.tail(300).sample(frac=1, random_state=1), periods,
+            k_period=k_period, d_period=d_period)
+        self.assertFalse(l_term.empty)
+
     def test_frequency(self):
         """Testing function frequency."""
         # Initialize key variables
@@ -446,6 +630,19 @@ class TestFunctions(unittest.TestCase):
                 no_zero_data[column]
             )
 
+        # Test unsorted indexes with duplicate short indexes
+        long = pd.DataFrame(
+            data={'long': list(range(8))}, index=[9, 3, 30, 4, 15, 1, 0, 22])
+        short = pd.DataFrame(
+            data={'short': list(range(8))}, index=[5, 2, 3, 3, 20, 1, 9, 8])
+        counts = {0: 0, 1: 1, 3: 4, 4: 4, 9: 7, 15: 2, 22: 1, 30: 0}
+        expected = [counts[_] for _ in sorted(counts)]
+
+        result = evaluate.frequency(
+            long, short, periods=periods, no_zeros=False)
+        self.assertEqual(result['counts'].tolist(), expected)
+        self.assertEqual(result['long'].tolist(), long['long'].tolist())
+
     def test_stoch(self):
         """Testing function stoch."""
         # Initialize key variables
@@ -532,6 +729,33 @@ class TestFunctions(unittest.TestCase):
             key=itemgetter('timestamp'))
         self.assertEqual(result, expected)
 
+    def test_summary_parity(self):
+        """Testing function summary against pandas rolling windows."""
+        # Initialize key variables
+        df_ = dataset.ohlc(503)
+        df_.index = np.arange(len(df_)) * 3 + 7
+        df_.loc[df_.index[100], 'high'] = np.nan
+        df_.loc[df_.index[250], 'low'] = np.nan
+
+        # Test both modes with uneven blocks and too few rows
+        for crawling in [False, True]:
+            for periods in [1, 5, 29, 503, 600]:
+                for rows in [0, 4, 503]:
+                    subset = df_.iloc[:rows]
+                    result = evaluate.summary(
+                        subset, periods=periods, crawling=crawling)
+                    expected = _summary(
+                        subset, periods=periods, crawling=crawling)
+                    self.assertEqual(
+                        result.index.tolist(), expected.index.tolist())
+                    self.assertEqual(
+                        result.columns.tolist(), expected.columns.tolist())
+                    for column in expected.columns:
+                        self.assertTrue(np.allclose(
+                            result[column].values.astype(float),
+                            expected[column].values.astype(float),
+                            equal_nan=True))
+
     def test_recent(self):
         """Testing function recent."""
         pass
@@ -553,7 +777,17 @@ class TestFunctions(unittest.TestCase):
             1, 2, 3, 4, 5]
 
         result = evaluate.sequential(pd.Series(values))
-        self.assertEqual(result, expected)
+        self.assertEqual(result.tolist(), expected)
+
+        # Test values that evaluate to True / False
+        values = [False, 95.1, 97, 0.0, False, np.nan, 91, 5]
+        expected = [1, 1, 2, 1, 2, 1, 2, 3]
+        result = evaluate.sequential(pd.Series(values))
+        self.assertEqual(result.tolist(), expected)
+
+        # Test empty series
+        result = evaluate.sequential(pd.Series([], dtype=bool))
+        self.assertEqual(result.tolist(), [])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Test the files module."""
+
+# Standard imports
+import unittest
+import os
+import stat
+import sys
+import tempfile
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from obya import files
+
+
+class TestFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_atomic(self):
+        """Testing function atomic."""
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'test.txt')
+
+            # Test writing
+            with files.atomic(filepath) as f_handle:
+                f_handle.write(b'one')
+            with files.atomic(filepath, mode='w') as f_handle:
+                f_handle.write('two')
+                with open(filepath, 'r') as reader:
+                    self.assertEqual(reader.read(), 'one')
+            with open(filepath, 'r') as reader:
+                self.assertEqual(reader.read(), 'two')
+
+            # Test failed writes leave the file unchanged
+            with self.assertRaises(RuntimeError):
+                with files.atomic(filepath, mode='w') as f_handle:
+                    f_handle.write('three')
+                    raise RuntimeError('write')
+            with open(filepath, 'r') as reader:
+                self.assertEqual(reader.read(), 'two')
+            self.assertEqual(os.listdir(directory), ['test.txt'])
+
+            # Test new files get the default permissions and others keep
+            # theirs
+            filepath = os.path.join(directory, 'new.txt')
+            with files.atomic(filepath) as f_handle:
+                f_handle.write(b'one')
+            self.assertEqual(
+                stat.S_IMODE(os.stat(filepath).st_mode),
+                0o666 & ~files._UMASK)
+            os.chmod(filepath, 0o640)
+            with files.atomic(filepath) as f_handle:
+                f_handle.write(b'two')
+            self.assertEqual(stat.S_IMODE(os.stat(filepath).st_mode), 0o640)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Test the oscillator module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+import pandas as pd
+import numpy as np
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from tests.libraries import dataset
+from obya import oscillator
+from obya.ingest import files
+
+# Optional PIP3 imports
+try:
+    import ta
+except ImportError:
+    ta = None
+
+
+class TestFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    data = files.ingest(
+        '{0}{1}tests{1}data{1}test_ingest_2_years.csv'.format(
+            ROOT_DIR, os.sep))
+
+    @unittest.skipIf(ta is None, 'ta is not installed')
+    def test_stochastic(self):
+        """Testing function stochastic."""
+        # Initialize key variables
+        periods = [(35, 5), (5, 3), (35, 3), (14, 3)]
+
+        # Test
+        result = oscillator.stochastic(
+            self.data['high'], self.data['low'], self.data['close'],
+            periods=periods)
+        self.assertEqual(sorted(result.keys()), sorted(periods))
+
+        # Compare against the ta library
+        for (k_period, d_period), stochastic in result.items():
+            expected = ta.momentum.StochasticOscillator(
+                high=self.data['high'],
+                low=self.data['low'],
+                close=self.data['close'],
+                n=k_period,
+                d_n=d_period
+            )
+            np.testing.assert_allclose(
+                stochastic.k, expected.stoch().values, rtol=1e-12)
+            np.testing.assert_allclose(
+                stochastic.d, expected.stoch_signal().values, rtol=1e-12)
+
+    def test_rolling(self):
+        """Testing function rolling."""
+        # Initialize key variables
+        values = self.data['close'].values.copy()
+        values[[100, 101, 500]] = np.nan
+
+        for window in [1, 5, 35, len(values), len(values) + 1]:
+            for maximum in [True, False]:
+                # Compare against pandas
+                series = pd.Series(values).rolling(window)
+                expected = series.max() if maximum else series.min()
+                result = oscillator.rolling(values, window, maximum=maximum)
+                np.testing.assert_array_equal(result, expected.values)
+
+                # The sliding window and the deque are identical
+                np.testing.assert_array_equal(
+                    oscillator._window(values, window, maximum),
+                    oscillator._deque(values, window, maximum))
+
+    def test_mean(self):
+        """Testing function mean."""
+        # Initialize key variables
+        values = dataset.dataset()['close'].values.astype(np.float64)
+
+        # Test
+        for window in [1, 3, 5, len(values), len(values) + 1]:
+            result = oscillator.mean(values, window)
+            expected = pd.Series(values).rolling(window).mean().values
+            np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+            # The compiled and interpreted running sums are identical
+            np.testing.assert_array_equal(
+                result, oscillator._running(values, window, True))
+
+    def test_total(self):
+        """Testing function total."""
+        # Initialize key variables
+        values = self.data['volume'].values.astype(np.float64)
+        values[[100, 101, 500]] = np.nan
+        rows = np.vstack([values, values[::-1]])
+
+        # Test
+        for window in [1, 5, 35, len(values), len(values) + 1]:
+            result = oscillator.total(values, window)
+            expected = pd.Series(values).rolling(window).sum().values
+            np.testing.assert_allclose(result, expected, rtol=1e-12)
+            np.testing.assert_array_equal(
+                result, oscillator._running(values, window, False))
+
+            # Each row is summed separately
+            result = oscillator.total(rows, window)
+            np.testing.assert_array_equal(
+                result[1], oscillator.total(values[::-1], window))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
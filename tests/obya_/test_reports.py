@@ -28,6 +28,8 @@ else:
 from tests.libraries.configuration import UnittestConfig
 from tests.libraries import dataset
 from obya import reports
+from obya import workers
+from obya.db.table import data
 from obya.ingest import files
 
 
@@ -127,6 +129,21 @@ date
             self.pair, self.timeframe, days=days, dataframe=self.data)
         self.assertEqual(result, expected)
 
+    def test__shared_report(self):
+        """Testing function _shared_report."""
+        # Initialize key variables
+        days = int(time.time() / 86400)
+        values = self.data[data.COLUMNS].values
+        expected = reports._report(
+            self.pair, self.timeframe, days=days, dataframe=self.data)
+
+        # Test with the rows of the pair after those of another pair
+        with workers.share(np.concatenate([values[:100], values])) as shared:
+            result = reports._shared_report(
+                self.pair, self.timeframe, days, 100, 100 + len(values),
+                shared)
+        self.assertEqual(result, expected)
+
     def test_formatter(self):
         """Testing function formatter."""
         pass
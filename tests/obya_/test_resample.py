@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Test the resample module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+# PIP3 imports
+import numpy as np
+import pandas as pd
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from tests.libraries import dataset
+from obya.db.table import data
+from obya import resample
+
+
+def _expected(df_, timeframe, origin):
+    """Aggregate bars with pandas."""
+    # Initialize key variables
+    frame = df_.set_index(pd.to_datetime(df_['timestamp'], unit='s'))
+
+    # Return
+    result = frame.resample(
+        '{}s'.format(timeframe),
+        origin=pd.Timestamp(origin, unit='s')).agg({
+            'open': 'first',
+            'high': 'max',
+            'low': 'min',
+            'close': 'last',
+            'volume': 'sum'}).dropna()
+    result.insert(0, 'timestamp', result.index.asi8 // 10 ** 9)
+    return result[data.COLUMNS].values.astype(float)
+
+
+class TestFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_aggregate(self):
+        """Testing function aggregate."""
+        # Initialize key variables
+        df_ = dataset.ohlc(2000, timeframe=3600)
+
+        # Remove weekends and other gaps
+        weekdays = (df_['timestamp'] // 86400 + 3) % 7
+        df_ = df_[(weekdays < 5) & (df_.index % 97 != 0)].reset_index(
+            drop=True)
+
+        # Test against pandas
+        for timeframe, origin in [
+                (14400, 0), (14400, -7200), (86400, 345600),
+                (86400, 338400), (604800, 345600), (604800, 338400)]:
+            result = resample.aggregate(
+                df_[data.COLUMNS].values, timeframe, origin=origin)
+            expected = _expected(df_, timeframe, origin)
+            self.assertEqual(result.shape, expected.shape)
+            self.assertTrue(np.allclose(result, expected))
+
+        # Test unsorted bars
+        values = df_[data.COLUMNS].values
+        shuffled = values[np.random.default_rng(0).permutation(len(values))]
+        self.assertTrue(np.array_equal(
+            resample.aggregate(shuffled, 86400),
+            resample.aggregate(values, 86400)))
+
+        # Test empty bars
+        result = resample.aggregate(np.empty((0, 6)), 86400)
+        self.assertEqual(result.shape, (0, 6))
+
+    def test_resampled(self):
+        """Testing function resampled."""
+        # Test
+        self.assertTrue(resample.resampled(86400, 14400))
+        self.assertTrue(resample.resampled(604800, 3600))
+        self.assertFalse(resample.resampled(14400, 14400))
+        self.assertFalse(resample.resampled(3600, 14400))
+        self.assertFalse(resample.resampled(86400, 50000))
+        self.assertFalse(resample.resampled(86400, None))
+
+    def test_dataframe(self):
+        """Testing function dataframe."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        df_ = dataset.ohlc(500, timeframe=3600, start=1514764800)
+        data.insert(pair_, df_, timeframe=3600)
+        expected = resample.aggregate(
+            df_[data.COLUMNS].values, 14400, origin=0)
+
+        # Test derived timeframes
+        result = resample.dataframe(pair_, 14400, base=3600, origin=0)
+        self.assertEqual(result[data.COLUMNS].values.tolist(),
+                         expected.tolist())
+        self.assertEqual(result['timestamp'].dtype, np.int64)
+
+        # Test results are writable and cached results aren't changed
+        result['close'] = 0
+        result = resample.dataframe(pair_, 14400, base=3600, origin=0)
+        self.assertEqual(result[data.COLUMNS].values.tolist(),
+                         expected.tolist())
+
+        # Test incomplete bars at the start are excluded
+        now = pd.Timestamp.now(tz='UTC').timestamp()
+        secondsago = int(now - df_['timestamp'].values[-30])
+        result = resample.dataframe(
+            pair_, 14400, secondsago=secondsago, base=3600, origin=0)
+        self.assertEqual(result[data.COLUMNS].values.tolist(),
+                         expected[-7:].tolist())
+
+        # Test stored timeframes
+        result = resample.dataframe(pair_, 3600, base=3600)
+        self.assertEqual(result[data.COLUMNS].values.tolist(),
+                         df_[data.COLUMNS].values.tolist())
+
+    def test_snapshot(self):
+        """Testing function snapshot."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        df_ = dataset.ohlc(10, timeframe=3600, start=1514764800)
+        data.insert(pair_, df_, timeframe=3600)
+        expected = int(df_['timestamp'].values[-1])
+
+        # The latest timestamp is that of the base bars
+        for timeframe in [3600, 14400]:
+            result = resample.snapshot(pair_, timeframe, base=3600, origin=0)
+            self.assertEqual(result.latest, expected)
+            self.assertEqual(
+                result.dataframe.values.tolist(),
+                resample.dataframe(
+                    pair_, timeframe, base=3600, origin=0).values.tolist())
+
+        # Test pairs without data
+        result = resample.snapshot(dataset.random_string(), 14400, base=3600)
+        self.assertTrue(result.dataframe.empty)
+        self.assertIsNone(result.latest)
+
+    def test__resample(self):
+        """Testing function _resample."""
+        # Initialize key variables
+        key = (dataset.random_string(), 14400, 3600, 0)
+        values = dataset.ohlc(48, timeframe=3600, start=0)[
+            data.COLUMNS].values
+        expected = resample.aggregate(values, 14400, origin=0)
+
+        # Test
+        result = resample._resample(key, values, 14400, 0, 0)
+        self.assertEqual(result.tolist(), expected.tolist())
+        self.assertFalse(result.flags.writeable)
+
+        # Cached bars starting before start are excluded
+        for start in [3600, 14400, 14401, 0]:
+            result = resample._resample(key, values, 14400, 0, start)
+            self.assertEqual(
+                result.tolist(),
+                expected[expected[:, 0] >= start].tolist())
+
+    def test_values(self):
+        """Testing function values."""
+        # Initialize key variables
+        pairs_ = [dataset.random_string() for _ in range(2)]
+        for seed, item in enumerate(pairs_):
+            data.insert(
+                item, dataset.ohlc(100, timeframe=3600, seed=seed),
+                timeframe=3600)
+
+        # Test
+        result = resample.values(pairs_, 86400, base=3600, origin=0)
+        self.assertEqual(sorted(result), sorted(pairs_))
+        for item in pairs_:
+            self.assertEqual(
+                result[item].tolist(),
+                resample.dataframe(
+                    item, 86400, base=3600, origin=0
+                    )[data.COLUMNS].values.tolist())
+        result = resample.dataframes(pairs_, 86400, base=3600, origin=0)
+        self.assertEqual(len(result[pairs_[0]]), 5)
+
+    def test_latest(self):
+        """Testing function latest."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        df_ = dataset.ohlc(10, timeframe=3600)
+        data.insert(pair_, df_, timeframe=3600)
+
+        # Test
+        expected = {pair_: int(df_['timestamp'].values[-1])}
+        self.assertEqual(resample.latest([pair_], 86400, base=3600), expected)
+        self.assertEqual(resample.latest([pair_], 3600, base=3600), expected)
+        self.assertEqual(resample.latest([pair_], 86400, base=None), {})
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Test the workers module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import pandas as pd
+import numpy as np
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from obya import workers
+
+
+class TestWorkers(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the pool once for all tests."""
+        cls.pool = workers.Workers(processes=2, preload=[])
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the pool."""
+        cls.pool.close()
+
+    def test_starmap(self):
+        """Testing method / function starmap."""
+        # Results are in the order of the arguments
+        arguments = [(_, 2) for _ in range(20)]
+        expected = [pow(*_) for _ in arguments]
+        for chunksize in [None, 1, 7, 100]:
+            result = self.pool.starmap(pow, arguments, chunksize=chunksize)
+            self.assertEqual(result, expected)
+
+        # No arguments
+        self.assertEqual(self.pool.starmap(pow, []), [])
+
+    def test_metrics(self):
+        """Testing method / function metrics."""
+        # Test
+        before = self.pool.metrics()
+        self.pool.starmap(pow, [(_, 2) for _ in range(10)])
+        result = self.pool.metrics()
+        self.assertEqual(result.processes, 2)
+        self.assertEqual(result.submitted - before.submitted, 10)
+        self.assertEqual(result.completed - before.completed, 10)
+        self.assertEqual(result.pending, 0)
+
+        # Test tasks that raise exceptions aren't left pending
+        with self.assertRaises(ZeroDivisionError):
+            self.pool.starmap(divmod, [(1, 1), (1, 0), (2, 1)])
+        result = self.pool.metrics()
+        self.assertEqual(result.pending, 0)
+        self.assertEqual(
+            result.completed + result.failed, result.submitted)
+        self.assertGreaterEqual(result.failed - before.failed, 1)
+        self.assertGreaterEqual(result.latency_max, result.latency_mean)
+        self.assertGreaterEqual(result.latency_mean, 0)
+
+
+class TestFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_shared(self):
+        """Testing method / function shared."""
+        # The pool is only created once per process
+        result = workers.shared(processes=1)
+        self.assertEqual(id(result), id(workers.shared()))
+        self.assertEqual(result.starmap(pow, [(3, 2)]), [9])
+
+    def test_share(self):
+        """Testing method / function share."""
+        # Test
+        array = np.arange(12, dtype=np.float64).reshape(4, 3)
+        with workers.share(array) as shared:
+            self.assertEqual(shared.shape, (4, 3))
+            self.assertEqual(np.dtype(shared.dtype), np.float64)
+            self.assertTrue(np.array_equal(workers.read(shared), array))
+        self.assertRaises(
+            FileNotFoundError, shared_memory.SharedMemory, name=shared.name)
+
+        # Test empty arrays
+        with workers.share(np.empty((0, 3))) as shared:
+            self.assertEqual(workers.read(shared).shape, (0, 3))
+
+    def test_read(self):
+        """Testing method / function read."""
+        # Test
+        array = np.arange(12, dtype=np.int64).reshape(6, 2)
+        with workers.share(array) as shared:
+            result = workers.read(shared, start=2, stop=4)
+            self.assertTrue(np.array_equal(result, array[2:4]))
+
+            # Workers read the same data
+            self.assertEqual(
+                [_.tolist() for _ in workers.shared().starmap(
+                    workers.read, [(shared, 0, 1), (shared, 5, None)])],
+                [[[0, 1]], [[10, 11]]])
+
+        # The copy is still valid
+        self.assertEqual(result.tolist(), [[4, 5], [6, 7]])
+
+    def test__run(self):
+        """Testing method / function _run."""
+        # Test
+        (value, duration) = workers._run((pow, (2, 10)))
+        self.assertEqual(value, 1024)
+        self.assertGreaterEqual(duration, 0)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
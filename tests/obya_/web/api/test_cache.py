@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test the web API cache module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_{0}web{0}api'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from obya.web.api.cache import Cache
+
+
+class TestCache(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def setUp(self):
+        """Create a cache directory."""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Delete the cache directory."""
+        self.directory.cleanup()
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Initialize key variables
+        cache = Cache(self.directory.name)
+        key = ('eurusd', 14400, None, True)
+
+        # Test
+        self.assertIsNone(cache.get(key, 100))
+        cache.set(key, 100, b'{"k": [1]}')
+        self.assertEqual(cache.get(key, 100), b'{"k": [1]}')
+        self.assertIsNone(cache.get(('eurusd', 14400, 29, True), 100))
+
+        # Responses are stale once there is new data
+        self.assertIsNone(cache.get(key, 200))
+
+        # Responses are shared with other processes
+        self.assertEqual(
+            Cache(self.directory.name).get(key, 100), b'{"k": [1]}')
+
+        # Responses expire
+        cache = Cache(self.directory.name, ttl=0.1)
+        time.sleep(0.2)
+        self.assertIsNone(cache.get(key, 100))
+
+    def test_set(self):
+        """Testing method / function set."""
+        # Initialize key variables
+        cache = Cache(self.directory.name, size=2)
+
+        # Test
+        cache.set(('a',), 1, b'a')
+        time.sleep(0.05)
+        cache.set(('b',), 1, b'b')
+        time.sleep(0.05)
+
+        # The least recently used response is deleted
+        self.assertEqual(cache.get(('a',), 1), b'a')
+        time.sleep(0.05)
+        cache.set(('c',), 1, b'c')
+        self.assertIsNone(cache.get(('b',), 1))
+        self.assertEqual(cache.get(('a',), 1), b'a')
+        self.assertEqual(cache.get(('c',), 1), b'c')
+
+    def test_stats(self):
+        """Testing method / function stats."""
+        # Initialize key variables
+        cache = Cache(self.directory.name)
+
+        # Test
+        cache.get(('a',), 1)
+        cache.set(('a',), 1, b'a')
+        cache.get(('a',), 1)
+        cache.get(('a',), 1)
+        result = cache.stats()
+        self.assertEqual(result.pid, os.getpid())
+        self.assertEqual(result.hits, 2)
+        self.assertEqual(result.misses, 1)
+        self.assertEqual(result.entries, 1)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Test the web API data module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import json
+import tempfile
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}obya{0}tests{0}obya_{0}web{0}api'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# PIP3 imports
+import numpy as np
+from flask import Flask
+
+# Application imports
+from tests.libraries.configuration import UnittestConfig
+from tests.libraries import dataset
+from obya.web.api import data as api_data
+from obya.db.table import data, pair
+from obya.db.store import Store
+from obya import evaluate
+
+
+class TestFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_stoch(self):
+        """Testing function stoch."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        rows = 1000
+        timeframe = 14400
+        start = (int(time.time()) // timeframe - rows) * timeframe
+        data.insert(pair_, dataset.ohlc(rows, start=start))
+        app = Flask(__name__)
+        app.register_blueprint(api_data.OBYA_API, url_prefix='/api')
+        client = app.test_client()
+
+        for periods in ['', '?periods=5']:
+            # Get rows
+            url = '/api/stoch/{}{}'.format(pair_, periods)
+            result = client.get(url).get_json()
+            self.assertTrue(bool(result))
+            self.assertEqual(sorted(result[0].keys()), ['d', 'date', 'k'])
+
+            # The same data is available as columns
+            separator = '&' if bool(periods) is True else '?'
+            columns = client.get(
+                '{}{}format=columns'.format(url, separator)).get_json()
+            self.assertEqual(columns['date'], [_['date'] for _ in result])
+            self.assertEqual(len(columns['k']), len(result))
+            np.testing.assert_allclose(
+                columns['k'], [_['k'] for _ in result], atol=0.011)
+            np.testing.assert_allclose(
+                columns['d'], [_['d'] for _ in result], atol=0.011)
+
+        # Responses are cached until there is a new bar
+        stats = api_data._cache().stats()
+        client.get(url)
+        self.assertEqual(api_data._cache().stats().hits, stats.hits + 1)
+        data.insert(
+            pair_, dataset.ohlc(1, start=start + rows * timeframe),
+            timeframe=timeframe)
+        client.get(url)
+        self.assertEqual(api_data._cache().stats().hits, stats.hits + 1)
+        self.assertEqual(
+            api_data._cache().stats().misses, stats.misses + 1)
+
+        # Responses created from stale stored data aren't reused once the
+        # store has the new bar
+        with tempfile.TemporaryDirectory() as directory:
+            data._STORE = Store(directory, refresh=3600)
+            try:
+                data.synchronize([pair_], timeframe)
+                data.insert(
+                    pair_,
+                    dataset.ohlc(1, start=start + (rows + 1) * timeframe),
+                    timeframe=timeframe)
+                filepath = data._STORE._filepath(
+                    pair.exists(pair_), timeframe)
+                os.utime(filepath)
+                stale = client.get(url).get_json()
+                stats = api_data._cache().stats()
+                self.assertEqual(client.get(url).get_json(), stale)
+                self.assertEqual(
+                    api_data._cache().stats().misses, stats.misses + 1)
+                os.utime(filepath, (0, 0))
+                result = client.get(url).get_json()
+                self.assertNotEqual(result, stale)
+                self.assertEqual(client.get(url).get_json(), result)
+                self.assertEqual(
+                    api_data._cache().stats().hits, stats.hits + 1)
+            finally:
+                data._STORE = None
+
+        # Test unknown pairs
+        self.assertEqual(client.get('/api/stoch/unknown').get_json(), [])
+        self.assertEqual(
+            client.get('/api/stoch/unknown?format=columns').get_json(),
+            {'date': [], 'k': [], 'd': []})
+
+    def test_cache_stats(self):
+        """Testing function cache_stats."""
+        # Initialize key variables
+        app = Flask(__name__)
+        app.register_blueprint(api_data.OBYA_API, url_prefix='/api')
+
+        # Test
+        result = app.test_client().get('/api/cache').get_json()
+        self.assertEqual(result['pid'], os.getpid())
+        self.assertEqual(
+            sorted(result.keys()), ['entries', 'hits', 'misses', 'pid'])
+
+    def test_lookback(self):
+        """Testing function lookback."""
+        # Initialize key variables
+        pair_ = dataset.random_string()
+        timeframe = 14400
+        rows = 3 * 365 * 6
+        start = (int(time.time()) // timeframe - rows) * timeframe
+        df_ = dataset.ohlc(rows, start=start)
+
+        # Markets are closed on weekends
+        weekdays = (df_['timestamp'] // 86400 + 3) % 7
+        data.insert(pair_, df_.loc[weekdays < 5], timeframe=timeframe)
+        everything = data.dataframe(pair_, timeframe)
+
+        for periods in [None, 5, 29]:
+            # Get the expected values from all the data
+            if bool(periods) is True:
+                expected = evaluate.summary(everything, periods=periods)
+            else:
+                expected = everything
+            expected = evaluate.recent(evaluate.stoch(expected))
+
+            # Test
+            secondsago = api_data.lookback(timeframe, periods=periods)
+            self.assertLess(secondsago, (int(time.time()) - start))
+            (payload, version) = api_data._payload(
+                pair_, timeframe, periods, True)
+            result = json.loads(payload)
+            self.assertEqual(version, everything['timestamp'].values[-1])
+            self.assertTrue(bool(result['date']))
+            self.assertEqual(result['date'], expected['timestamp'].tolist())
+            self.assertEqual(
+                result['k'], expected['k'].round(2).tolist())
+            self.assertEqual(
+                result['d'], expected['d'].round(2).tolist())
+
+    def test_rows(self):
+        """Testing function rows."""
+        # Test
+        result = api_data.rows(
+            np.array([1, 2]), np.array([10.123, 20.5]), np.array([5.555, 0]))
+        self.assertEqual(
+            result,
+            [{'k': 10.12, 'd': 5.55, 'date': 1},
+             {'k': 20.5, 'd': 0, 'date': 2}])
+
+    def test_columns(self):
+        """Testing function columns."""
+        # Test
+        result = api_data.columns(
+            np.array([1, 2, 3]),
+            np.array([10.123, 20.5, np.nan]),
+            np.array([np.nan, 5.559, 0]))
+        self.assertEqual(
+            json.loads(result),
+            {'date': [1, 2, 3], 'k': [10.12, 20.5, None],
+             'd': [None, 5.56, 0]})
+
+    def test__list(self):
+        """Testing function _list."""
+        # Test
+        self.assertEqual(
+            api_data._list(np.array([1.5, np.nan])), [1.5, None])
+        self.assertEqual(api_data._list(np.array([1, 2])), [1, 2])
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()